@@ -14,12 +14,30 @@ a = Analysis(
     datas=src_tree,
     hiddenimports=[
         'src',
+        'src.backup',
+        'src.cache',
+        'src.cli',
         'src.controllers',
         'src.database',
+        'src.importacao',
+        'src.instrumentacao',
+        'src.migracoes',
+        'src.medicao_inicio',
+        'src.models',
+        'src.projecao',
+        'src.relatorio_excel',
+        'src.servidor',
+        'src.tarefas',
         'src.views',
+        'src.views.busca',
         'src.views.dashboard',
+        'src.views.fluxo_caixa',
         'src.views.forms',
+        'src.views.grafico',
+        'src.views.lista_virtual',
+        'src.views.painel_depuracao',
         'src.views.settings',
+        'src.views.visao_anual',
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,5 @@
+# Benchmarks do FinanceiroController sobre livros-caixa sintéticos.
+#
+#   python -m benchmarks                              # 10k, 100k e 1M despesas
+#   python -m benchmarks --tamanhos 10000 --saida base.json
+#   python -m benchmarks.comparar base.json novo.json
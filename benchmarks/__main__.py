@@ -0,0 +1,5 @@
+import sys
+
+from benchmarks.executar import main
+
+sys.exit(main())
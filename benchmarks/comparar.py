@@ -0,0 +1,55 @@
+import argparse
+import json
+import sys
+
+# Variação da mediana (%) a partir da qual uma operação é considerada regressão
+LIMITE_PADRAO = 10.0
+
+
+def comparar(base: dict, novo: dict, limite: float = LIMITE_PADRAO) -> list:
+    """Compara as medianas de dois arquivos de resultados. Retorna tuplas
+    (tamanho, operacao, mediana_base_ms, mediana_nova_ms, variacao_pct, regressao)
+    para as operações presentes nos dois."""
+    linhas = []
+    for tamanho, dados_novos in novo["tamanhos"].items():
+        dados_base = base["tamanhos"].get(tamanho)
+        if dados_base is None:
+            continue
+        for operacao, estatisticas in dados_novos["operacoes"].items():
+            anterior = dados_base["operacoes"].get(operacao)
+            if anterior is None:
+                continue
+            mediana_base, mediana_nova = anterior["mediana_ms"], estatisticas["mediana_ms"]
+            variacao = (mediana_nova - mediana_base) / mediana_base * 100 if mediana_base else 0.0
+            linhas.append((int(tamanho), operacao, mediana_base, mediana_nova, variacao, variacao > limite))
+    return linhas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.comparar", description="Compara dois arquivos de resultados de benchmark."
+    )
+    parser.add_argument("base", help="resultados de referência (JSON)")
+    parser.add_argument("novo", help="resultados a comparar (JSON)")
+    parser.add_argument("--limite", type=float, default=LIMITE_PADRAO,
+                        help="variação da mediana, em %%, considerada regressão")
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    with open(args.novo, encoding="utf-8") as arquivo:
+        novo = json.load(arquivo)
+
+    print(f"Base: {base['versao']} ({base['data']})  x  Novo: {novo['versao']} ({novo['data']})")
+    linhas = comparar(base, novo, args.limite)
+    for tamanho, operacao, mediana_base, mediana_nova, variacao, regressao in linhas:
+        marca = "  <-- REGRESSÃO" if regressao else ""
+        print(f"{tamanho:>9,}  {operacao:<30} {mediana_base:10.2f} ms -> {mediana_nova:10.2f} ms"
+              f"  {variacao:+7.1f}%{marca}")
+
+    # Código de saída 1 quando há regressão, para uso em scripts
+    return 1 if any(linha[-1] for linha in linhas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
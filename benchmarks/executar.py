@@ -0,0 +1,156 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.gerador import ANO_FINAL, MES_FINAL, gerar_livro
+from src.controllers import FinanceiroController
+from src.database import Database
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+REPETICOES_PADRAO = 15
+AQUECIMENTO = 2
+
+
+def estatisticas(amostras: list) -> dict:
+    """Resumo das amostras (segundos) em milissegundos. A mediana é a medida usada
+    nas comparações: é pouco sensível a pausas isoladas do sistema."""
+    ordenadas = sorted(amostras)
+    return {
+        "repeticoes": len(amostras),
+        "min_ms": ordenadas[0] * 1000,
+        "mediana_ms": statistics.median(ordenadas) * 1000,
+        "media_ms": statistics.fmean(ordenadas) * 1000,
+        "p95_ms": ordenadas[min(len(ordenadas) - 1, round(0.95 * (len(ordenadas) - 1)))] * 1000,
+        "desvio_ms": (statistics.stdev(ordenadas) if len(ordenadas) > 1 else 0.0) * 1000,
+        "max_ms": ordenadas[-1] * 1000,
+    }
+
+
+def medir(funcao, repeticoes: int = REPETICOES_PADRAO, preparar=None) -> dict:
+    """Executa funcao() 'repeticoes' vezes (após AQUECIMENTO execuções descartadas) e
+    retorna as estatísticas. preparar() roda antes de cada execução, fora da medição."""
+    amostras = []
+    for indice in range(AQUECIMENTO + repeticoes):
+        if preparar is not None:
+            preparar()
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        duracao = time.perf_counter() - inicio
+        if indice >= AQUECIMENTO:
+            amostras.append(duracao)
+    return estatisticas(amostras)
+
+
+def _silencioso(funcao):
+    """Executa funcao() descartando o que ela imprimir (ex.: 'Relatório salvo em ...')."""
+    def executar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return funcao()
+    return executar
+
+
+def _operacoes(controller: FinanceiroController, pasta: str) -> dict:
+    """Caminhos quentes medidos. As leituras rodam com o cache do controller limpo,
+    para medir a consulta e não o acerto de cache."""
+    # Um mês seis meses antes do fim do livro e o último mês (o que a aplicação abre por padrão)
+    ano_meio, mes_meio = divmod(ANO_FINAL * 12 + MES_FINAL - 1 - 6, 12)
+    mes_meio += 1
+    contador = iter(range(10**9))
+
+    return {
+        "buscar_despesas_mes": (lambda: controller.buscar_despesas_mes(mes_meio, ano_meio), controller.limpar_cache),
+        "calcular_totais_mes": (lambda: controller.calcular_totais_mes(MES_FINAL, ANO_FINAL), controller.limpar_cache),
+        "snapshot_mes": (lambda: controller.snapshot_mes(MES_FINAL, ANO_FINAL), controller.limpar_cache),
+        "buscar_categorias": (controller.buscar_categorias, controller.limpar_cache),
+        "adicionar_despesa_recorrente": (
+            lambda: controller.adicionar_despesa(
+                f"10/{MES_FINAL:02d}/{ANO_FINAL}", "Variável", "📦 Outros", f"Parcela {next(contador)}", 99.9,
+                recorrencia_meses=12
+            ),
+            None,
+        ),
+        "exportar_relatorio": (
+            _silencioso(lambda: controller.exportar_relatorio(mes_meio, ano_meio, os.path.join(pasta, "relatorio.xlsx"))),
+            None,
+        ),
+    }
+
+
+def executar_tamanho(linhas: int, repeticoes: int, operacoes: list = None) -> dict:
+    """Gera um livro com 'linhas' despesas num banco temporário e mede as operações."""
+    banco_original = Database.DB_NAME
+    with tempfile.TemporaryDirectory(prefix="financas_bench_") as pasta:
+        Database.usar_arquivo(os.path.join(pasta, "financeiro.db"))
+        try:
+            inicio = time.perf_counter()
+            contagem = gerar_livro(linhas)
+            geracao = time.perf_counter() - inicio
+
+            controller = FinanceiroController()
+            resultados = {}
+            for nome, (funcao, preparar) in _operacoes(controller, pasta).items():
+                if operacoes and nome not in operacoes:
+                    continue
+                resultados[nome] = medir(funcao, repeticoes, preparar)
+                print(f"  {nome:<30} mediana {resultados[nome]['mediana_ms']:10.2f} ms"
+                      f"  (p95 {resultados[nome]['p95_ms']:.2f} ms)")
+        finally:
+            Database.usar_arquivo(banco_original)
+    return {"linhas": contagem, "geracao_s": geracao, "operacoes": resultados}
+
+
+def _versao() -> str:
+    """Commit atual do repositório (quando disponível), para identificar a execução."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmarks do FinanceiroController com dados sintéticos."
+    )
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="quantidades de despesas dos livros gerados")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO, help="execuções medidas por operação")
+    parser.add_argument("--operacoes", nargs="+", help="medir apenas estas operações")
+    parser.add_argument("--saida", default="resultados_benchmark.json", help="arquivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    resultado = {
+        "versao": _versao(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "repeticoes": args.repeticoes,
+        "tamanhos": {},
+    }
+    for linhas in args.tamanhos:
+        print(f"Livro com {linhas:,} despesas:")
+        resultado["tamanhos"][str(linhas)] = executar_tamanho(linhas, args.repeticoes, args.operacoes)
+
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultados salvos em: {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import random
+from datetime import date
+from itertools import islice
+
+from src.controllers import SQL_INSERIR_DESPESA, SQL_INSERIR_RECORRENCIA
+from src.database import Database, centavos
+
+# Último mês do livro gerado: fixo, para que execuções diferentes gerem os mesmos dados
+ANO_FINAL = 2025
+MES_FINAL = 12
+
+# Categorias além das padrão, criadas como se fossem do usuário
+CATEGORIAS_PERSONALIZADAS = [
+    ("Saúde", "💊"), ("Educação", "📚"), ("Pets", "🐶"), ("Assinaturas", "📺"), ("Viagem", "✈️"),
+]
+
+# (categoria, peso no sorteio, faixa de valores, descrições)
+PERFIL_VARIAVEIS = [
+    ("🍔 Alimentação", 40, (8, 250), ["Mercado", "Padaria", "Restaurante", "iFood", "Feira"]),
+    ("🚗 Transporte", 20, (5, 300), ["Uber", "Combustível", "Estacionamento", "Pedágio"]),
+    ("🎮 Lazer", 12, (15, 400), ["Cinema", "Show", "Bar", "Jogo"]),
+    ("🏠 Casa", 8, (20, 600), ["Manutenção", "Utensílios", "Limpeza"]),
+    ("💊 Saúde", 8, (10, 500), ["Farmácia", "Consulta", "Exame"]),
+    ("🐶 Pets", 5, (20, 300), ["Ração", "Veterinário", "Banho e tosa"]),
+    ("✈️ Viagem", 2, (100, 3000), ["Passagem", "Hotel"]),
+    ("📦 Outros", 5, (5, 800), ["Presente", "Diversos", "Loja"]),
+]
+PERFIL_FIXAS = [
+    ("🏠 Casa", (800, 3500), ["Aluguel", "Condomínio", "Energia", "Água", "Internet"]),
+    ("📚 Educação", (150, 1500), ["Faculdade", "Curso de inglês"]),
+    ("📺 Assinaturas", (15, 60), ["Streaming", "Música", "Nuvem"]),
+    ("💊 Saúde", (200, 900), ["Plano de saúde", "Academia"]),
+]
+
+# Fração das linhas de 'despesas' que são fixas (o restante é variável)
+FRACAO_FIXAS = 0.15
+
+TAMANHO_BLOCO = 50000
+
+
+def _periodos(meses: int) -> list:
+    """Os 'meses' (ano, mes) que terminam em ANO_FINAL/MES_FINAL, do mais antigo ao mais novo."""
+    fim = ANO_FINAL * 12 + MES_FINAL - 1
+    return [divmod(periodo, 12) for periodo in range(fim - meses + 1, fim + 1)]
+
+
+def _linhas_despesas(aleatorio: random.Random, linhas: int, meses: int):
+    """Gera as tuplas de SQL_INSERIR_DESPESA, distribuídas igualmente pelos meses."""
+    categorias, pesos = zip(*[(perfil, perfil[1]) for perfil in PERFIL_VARIAVEIS])
+    periodos = _periodos(meses)
+    for indice in range(linhas):
+        ano, mes = periodos[indice * meses // linhas]
+        mes += 1
+        dia = aleatorio.randint(1, 28)
+        if aleatorio.random() < FRACAO_FIXAS:
+            categoria, faixa, descricoes = aleatorio.choice(PERFIL_FIXAS)
+            tipo = "Fixa"
+        else:
+            categoria, _, faixa, descricoes = aleatorio.choices(categorias, pesos)[0]
+            tipo = "Variável"
+        yield (
+            date(ano, mes, dia).isoformat(), tipo, categoria, aleatorio.choice(descricoes),
+            centavos(aleatorio.uniform(*faixa)), 0
+        )
+
+
+def _linhas_recorrencias(aleatorio: random.Random, quantidade: int, meses: int):
+    """Regras de recorrência: fixas de 12 meses, parcelamentos e algumas sem fim."""
+    periodos = _periodos(meses)
+    for _ in range(quantidade):
+        ano, mes = aleatorio.choice(periodos)
+        categoria, faixa, descricoes = aleatorio.choice(PERFIL_FIXAS)
+        duracao = aleatorio.choice([12, 12, 3, 6, 10, None])
+        tipo = "Fixa" if duracao in (12, None) else "Variável"
+        yield (tipo, categoria, aleatorio.choice(descricoes), centavos(aleatorio.uniform(*faixa)),
+               aleatorio.randint(1, 28), ano * 12 + mes, duracao)
+
+
+def gerar_livro(linhas: int, meses: int = 36, semente: int = 42) -> dict:
+    """Preenche o banco atual (Database.DB_NAME) com um livro-caixa sintético:
+    'linhas' despesas avulsas (fixas e variáveis) em 'meses' meses, regras de
+    recorrência, receitas extras, salários e categorias personalizadas.
+    Com a mesma semente, gera sempre os mesmos dados. Retorna a contagem por tabela."""
+    aleatorio = random.Random(semente)
+    quantidade_recorrencias = max(10, linhas // 2000)
+    contagem = {"despesas": 0, "recorrencias": 0, "receitas_extras": 0, "categorias": 0}
+
+    with Database().carga_em_lote() as conn:
+        conn.execute(
+            "UPDATE configuracoes SET salario_1_centavos = ?, salario_2_centavos = ? WHERE id = 1", (650000, 420000)
+        )
+        contagem["categorias"] = conn.executemany(
+            "INSERT OR IGNORE INTO categorias (nome, icone) VALUES (?, ?)", CATEGORIAS_PERSONALIZADAS
+        ).rowcount
+
+        despesas = _linhas_despesas(aleatorio, linhas, meses)
+        while True:
+            bloco = list(islice(despesas, TAMANHO_BLOCO))
+            if not bloco:
+                break
+            contagem["despesas"] += conn.executemany(SQL_INSERIR_DESPESA, bloco).rowcount
+
+        contagem["recorrencias"] = conn.executemany(
+            SQL_INSERIR_RECORRENCIA, list(_linhas_recorrencias(aleatorio, quantidade_recorrencias, meses))
+        ).rowcount
+
+        receitas = [
+            (mes + 1, ano, f"Extra {numero}", centavos(aleatorio.uniform(100, 2500)))
+            for ano, mes in _periodos(meses)
+            for numero in range(aleatorio.randint(0, 3))
+        ]
+        contagem["receitas_extras"] = conn.executemany(
+            "INSERT INTO receitas_extras (mes, ano, descricao, valor_centavos) VALUES (?, ?, ?, ?)", receitas
+        ).rowcount
+    return contagem
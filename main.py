@@ -1,9 +1,16 @@
+# Primeiro import: a medição de inicialização (--medir-inicio) precisa ver os demais
+from src import medicao_inicio
+medicao_inicio.instalar()
+
 import customtkinter as ctk
+import time
 from datetime import datetime
 from tkinter import messagebox, filedialog, ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from src import instrumentacao
 from src.controllers import FinanceiroController
+from src.tarefas import ExecutorTk
+from src.views.grafico import GraficoRosca
+from src.views.lista_virtual import ListaVirtual
 
 # Configuração Visual Global
 ctk.set_appearance_mode("Light")
@@ -21,6 +28,9 @@ COR_TEXT_DARK = "#1F2937"      # Texto escuro
 COR_TEXT_GRAY = "#6B7280"      # Texto cinza
 COR_BORDER = "#E5E7EB"         # Borda suave
 
+# Meses cobertos pelo orçamento definido em Gerenciar Categorias, a partir do mês exibido
+MESES_ORCAMENTO = 12
+
 class App(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -28,6 +38,8 @@ class App(ctk.CTk):
         self.geometry("1400x800")
         self.configure(fg_color=COR_BG_LIGHT)
         self.controller = FinanceiroController()
+        # Consultas e exportações rodam fora da thread do Tk
+        self.executor = ExecutorTk(self, ao_mudar_ocupado=self._mostrar_ocupado)
         
         # Estado
         hoje = datetime.now()
@@ -36,9 +48,32 @@ class App(ctk.CTk):
 
         # Layout Principal
         self._setup_ui()
+        medicao_inicio.marcar("interface montada")
+
+        # Os dados só são carregados depois que a janela aparece
+        self._janela_exibida = False
+        self._dados_exibidos = False
+        self.bind("<Map>", self._ao_exibir_janela, add="+")
+
+        # F12: painel de depuração (tempos por método, SQL e fases da tela)
+        self._painel_depuracao = None
+        self.bind("<F12>", lambda _: self.abrir_painel_depuracao())
+
+    def _ao_exibir_janela(self, event):
+        # <Map> da janela principal também chega pelos widgets filhos
+        if event.widget is not self or self._janela_exibida:
+            return
+        self._janela_exibida = True
+        medicao_inicio.marcar("janela exibida")
         self.carregar_categorias()
         self.refresh_app()
 
+    def abrir_painel_depuracao(self):
+        from src.views.painel_depuracao import PainelDepuracao
+        if self._painel_depuracao is None or not self._painel_depuracao.winfo_exists():
+            self._painel_depuracao = PainelDepuracao(self)
+        self._painel_depuracao.focus()
+
     def _setup_ui(self):
         # Grid Mestre
         self.grid_rowconfigure(0, weight=0)
@@ -87,6 +122,13 @@ class App(ctk.CTk):
         ctk.CTkLabel(text_frame, text="Controle Financeiro Pessoal", 
                      font=("Segoe UI", 13), text_color=COR_TEXT_GRAY).pack(anchor="w")
         
+        # Busca no histórico inteiro (Enter abre os resultados)
+        self.ent_busca = ctk.CTkEntry(left_frame, placeholder_text="🔍 Buscar no histórico (ex.: farmácia)",
+                                      width=320, height=34, border_color=COR_BORDER)
+        self.ent_busca.pack(anchor="w", pady=(12, 0))
+        self.ent_busca.bind("<Return>", lambda _: self.abrir_busca())
+        self._janela_busca = None
+        
         # Lado Direito - KPIs e Navegação
         right_frame = ctk.CTkFrame(header_content, fg_color="transparent")
         right_frame.pack(side="right", fill="y", padx=(20, 0))
@@ -112,6 +154,10 @@ class App(ctk.CTk):
         self.cmb_ano.set(str(self.ano_atual))
         self.cmb_ano.pack(side="left", padx=3)
         
+        # Indicador de carregamento (visível enquanto há tarefas em segundo plano)
+        self.prg_ocupado = ctk.CTkProgressBar(nav_frame, width=70, height=6, mode="indeterminate",
+                                              progress_color=COR_PRIMARY)
+        
         # KPIs Cards
         kpis_frame = ctk.CTkFrame(right_frame, fg_color="transparent")
         kpis_frame.pack(side="top")
@@ -234,7 +280,7 @@ class App(ctk.CTk):
         ctk.CTkLabel(container, text="🔄 Recorrência", font=("Segoe UI", 11, "bold"), 
                      text_color=COR_TEXT_GRAY).pack(anchor="w", pady=(0, 5))
         self.cmb_tipo = ctk.CTkComboBox(container, 
-                                        values=["Fixa", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"],
+                                        values=["Fixa", "Fixa (sem fim)", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12"],
                                         height=38, button_color=COR_PRIMARY, border_color=COR_BORDER,
                                         dropdown_fg_color=COR_BG_WHITE)
         self.cmb_tipo.set("1")
@@ -284,10 +330,13 @@ class App(ctk.CTk):
         frm.grid_columnconfigure(1, weight=1)
         frm.grid_rowconfigure(0, weight=1)
 
-        self.frm_fixas = self._criar_lista_container(frm, "📌 Despesas Fixas", 0, 0)
-        self.frm_variaveis = self._criar_lista_container(frm, "💸 Despesas Variáveis", 0, 1)
+        # As listas recebem a primeira página do snapshot e carregam o resto ao rolar:
+        # mês e token de continuação da próxima página de cada tipo
+        self._paginacao_listas = {}
+        self.frm_fixas = self._criar_lista_container(frm, "📌 Despesas Fixas", 0, 0, "Fixa")
+        self.frm_variaveis = self._criar_lista_container(frm, "💸 Despesas Variáveis", 0, 1, "Variável")
 
-    def _criar_lista_container(self, parent, titulo, row, col):
+    def _criar_lista_container(self, parent, titulo, row, col, tipo):
         frame = ctk.CTkFrame(parent, fg_color=COR_BG_WHITE, corner_radius=15, border_width=0)
         frame.grid(row=row, column=col, sticky="nsew", padx=6)
         
@@ -299,10 +348,35 @@ class App(ctk.CTk):
         ctk.CTkLabel(header, text=titulo, font=("Segoe UI", 15, "bold"), 
                      text_color=COR_PRIMARY).pack(expand=True)
         
-        # Área scrollável
-        scroll = ctk.CTkScrollableFrame(frame, fg_color="transparent", border_width=0)
-        scroll.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-        return scroll
+        # Área scrollável virtualizada
+        lista = ListaVirtual(frame, altura_linha=80,
+                             criar_linha=self._criar_linha_lista,
+                             preencher_linha=self._preencher_linha_lista,
+                             cor_fundo=COR_BG_WHITE, texto_vazio="Nenhuma despesa neste mês",
+                             carregar_mais=lambda: self._carregar_mais(tipo, lista))
+        lista.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        return lista
+
+    def _carregar_mais(self, tipo, lista):
+        """Busca a próxima página da lista 'tipo' (chamado pela ListaVirtual perto do fim)."""
+        mes, ano, token = self._paginacao_listas[tipo]
+
+        def acrescentar(pagina):
+            # A tela pode ter sido atualizada enquanto a página era lida: descarta a página velha
+            if self._paginacao_listas.get(tipo) != (mes, ano, token):
+                return
+            self._paginacao_listas[tipo] = (mes, ano, pagina.continuacao)
+            lista.acrescentar_itens(pagina.despesas, ha_mais=pagina.continuacao is not None)
+
+        def falhar(e):
+            if self._paginacao_listas.get(tipo) == (mes, ano, token):
+                lista.acrescentar_itens((), ha_mais=False)
+            messagebox.showerror("Erro", f"Falha ao carregar mais despesas: {e}")
+
+        self.executor.submeter(
+            f"lista.{tipo}", self.controller.paginar_despesas, token, mes=mes, ano=ano, tipo=tipo,
+            ao_concluir=acrescentar, ao_falhar=falhar
+        )
 
     def _setup_col_direita(self):
         frm = ctk.CTkFrame(self.main_area, fg_color=COR_BG_WHITE, corner_radius=15, border_width=0)
@@ -320,12 +394,49 @@ class App(ctk.CTk):
         self.frame_grafico = ctk.CTkFrame(frm, fg_color="transparent")
         self.frame_grafico.pack(fill="both", expand=True, padx=15, pady=10)
         
+        # Criados uma única vez: a cada mês só alternamos entre eles e atualizamos os dados
+        self.grafico = GraficoRosca(
+            self.frame_grafico, cor_fundo='white', cor_texto='black',
+            cores=['#5B7FFF', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6'],
+            cor_borda='white', tamanho_fonte=10
+        )
+        
+        # Mensagem quando não há dados
+        self.frame_grafico_vazio = ctk.CTkFrame(self.frame_grafico, fg_color=COR_BG_LIGHT, corner_radius=12)
+        ctk.CTkLabel(self.frame_grafico_vazio, text="📊", font=("Segoe UI", 48)).pack(pady=(30, 10))
+        ctk.CTkLabel(self.frame_grafico_vazio, text="Sem despesas neste mês", 
+                    font=("Segoe UI", 14, "bold"), text_color=COR_TEXT_GRAY).pack()
+        ctk.CTkLabel(self.frame_grafico_vazio, text="Adicione despesas para ver a análise", 
+                    font=("Segoe UI", 11), text_color=COR_TEXT_GRAY).pack(pady=(5, 30))
+        
+        # Alertas de orçamento do mês (só aparece quando alguma categoria passa de 80%)
+        self.frm_alertas = ctk.CTkFrame(frm, fg_color=COR_BG_LIGHT, corner_radius=12)
+        self._niveis_orcamento = {}
+        
         # Botão gerenciar categorias
         ctk.CTkButton(frm, text="🏷️ Gerenciar Categorias", height=42, 
                       fg_color=COR_PRIMARY, hover_color="#4A6FEE",
                       corner_radius=12, font=("Segoe UI", 13, "bold"),
                       command=self.abrir_gerenciar_categorias).pack(fill="x", padx=15, pady=(0, 10))
         
+        # Botão importar extrato bancário
+        ctk.CTkButton(frm, text="📄 Importar Extrato (CSV/OFX)", height=42, 
+                      fg_color=COR_PRIMARY, hover_color="#4A6FEE",
+                      corner_radius=12, font=("Segoe UI", 13, "bold"),
+                      command=self.importar_extrato).pack(fill="x", padx=15, pady=(0, 10))
+        
+        # Botão visão anual
+        ctk.CTkButton(frm, text="📅 Visão Anual", height=42, 
+                      fg_color=COR_PRIMARY, hover_color="#4A6FEE",
+                      corner_radius=12, font=("Segoe UI", 13, "bold"),
+                      command=self.abrir_visao_anual).pack(fill="x", padx=15, pady=(0, 10))
+        
+        # Botão projeção de fluxo de caixa
+        ctk.CTkButton(frm, text="📈 Projeção", height=42, 
+                      fg_color=COR_PRIMARY, hover_color="#4A6FEE",
+                      corner_radius=12, font=("Segoe UI", 13, "bold"),
+                      command=self.abrir_projecao).pack(fill="x", padx=15, pady=(0, 10))
+        
         # Botão exportar
         ctk.CTkButton(frm, text="📥 Exportar para Excel", height=42, 
                       fg_color=COR_SUCCESS, hover_color="#059669",
@@ -381,7 +492,8 @@ class App(ctk.CTk):
             tipo_selecionado = self.cmb_tipo.get()
             
             # Determinar tipo e recorrência
-            if tipo_selecionado == "Fixa":
+            sem_fim = tipo_selecionado == "Fixa (sem fim)"
+            if tipo_selecionado == "Fixa" or sem_fim:
                 tipo = "Fixa"
                 recorrencia = 12  # Fixas se repetem por 12 meses
             else:
@@ -394,51 +506,91 @@ class App(ctk.CTk):
                 self.cmb_cat.get(),
                 self.ent_desc.get(),
                 valor,
-                recorrencia
+                recorrencia,
+                sem_fim=sem_fim
             )
             # Limpar
             self.ent_val.delete(0, "end")
             self.ent_desc.delete(0, "end")
             self.refresh_app()
-            messagebox.showinfo("Sucesso", f"Despesa adicionada para {recorrencia} mês(es)!")
+            if sem_fim:
+                messagebox.showinfo("Sucesso", "Despesa fixa adicionada sem data de término!")
+            else:
+                messagebox.showinfo("Sucesso", f"Despesa adicionada para {recorrencia} mês(es)!")
         except Exception as e:
             messagebox.showerror("Erro", str(e))
 
+    def _mostrar_ocupado(self, ocupado):
+        if ocupado and not self.prg_ocupado.winfo_ismapped():
+            self.prg_ocupado.pack(side="left", padx=(10, 0))
+            self.prg_ocupado.start()
+        elif not ocupado and self.prg_ocupado.winfo_ismapped():
+            self.prg_ocupado.stop()
+            self.prg_ocupado.pack_forget()
+
     def refresh_app(self):
+        # Uma única leitura consistente do mês alimenta toda a tela. A leitura roda na
+        # thread de trabalho; se o usuário trocar de mês antes dela terminar, o resultado
+        # antigo é descartado pelo executor.
+        inicio = time.perf_counter()
+        self.executor.submeter(
+            "refresh", self.controller.snapshot_mes, self.mes_atual, self.ano_atual,
+            ao_concluir=lambda snapshot: self._aplicar_snapshot(snapshot, inicio),
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Falha ao carregar dados: {e}")
+        )
+
+    def _aplicar_snapshot(self, snapshot, inicio=None):
+        # Cada etapa é medida quando a instrumentação está ligada (--perfil / F12)
         # 1. Carregar Salários
-        s1, s2 = self.controller.get_configuracoes()
-        self.ent_sal_julia.delete(0, "end")
-        self.ent_sal_julia.insert(0, str(s1))
-        self.ent_sal_davydson.delete(0, "end")
-        self.ent_sal_davydson.insert(0, str(s2))
+        with instrumentacao.fase("refresh.salarios"):
+            s1, s2 = snapshot.salarios
+            self.ent_sal_julia.delete(0, "end")
+            self.ent_sal_julia.insert(0, str(s1))
+            self.ent_sal_davydson.delete(0, "end")
+            self.ent_sal_davydson.insert(0, str(s2))
 
         # 2. Atualizar KPIs (Receita, Despesas, Saldo)
-        receita, despesas, saldo = self.controller.calcular_totais_mes(self.mes_atual, self.ano_atual)
-        
-        self.card_receita.lbl_valor.configure(text=f"R$ {receita:,.2f}")
-        self.card_despesas.lbl_valor.configure(text=f"R$ {despesas:,.2f}")
-        
-        cor_saldo = "#4CAF50" if saldo >= 0 else "#FF5252"
-        self.card_saldo.lbl_valor.configure(text=f"R$ {saldo:,.2f}", text_color=cor_saldo)
-
-        # 3. Carregar Listas
-        df = self.controller.buscar_despesas_mes(self.mes_atual, self.ano_atual)
-        
-        # Limpar Listas Visuais
-        for widget in self.frm_fixas.winfo_children(): widget.destroy()
-        for widget in self.frm_variaveis.winfo_children(): widget.destroy()
-
-        if not df.empty:
-            for _, row in df.iterrows():
-                target = self.frm_fixas if row['tipo'] == "Fixa" else self.frm_variaveis
-                self._criar_item_lista(target, row)
+        with instrumentacao.fase("refresh.kpis"):
+            self.card_receita.lbl_valor.configure(text=f"R$ {snapshot.receita_total:,.2f}")
+            self.card_despesas.lbl_valor.configure(text=f"R$ {snapshot.despesas_total:,.2f}")
+
+            cor_saldo = "#4CAF50" if snapshot.saldo >= 0 else "#FF5252"
+            self.card_saldo.lbl_valor.configure(text=f"R$ {snapshot.saldo:,.2f}", text_color=cor_saldo)
+
+        # 3. Carregar Listas (primeira página; só as linhas visíveis viram widgets)
+        with instrumentacao.fase("refresh.listas"):
+            for tipo, lista, despesas, continuacao in (
+                ("Fixa", self.frm_fixas, snapshot.despesas_fixas, snapshot.continuacao_fixas),
+                ("Variável", self.frm_variaveis, snapshot.despesas_variaveis, snapshot.continuacao_variaveis),
+            ):
+                self._paginacao_listas[tipo] = (snapshot.mes, snapshot.ano, continuacao)
+                lista.definir_itens(despesas, ha_mais=continuacao is not None)
 
         # 4. Gráfico
-        self._plotar_grafico(df)
+        with instrumentacao.fase("refresh.grafico"):
+            self._plotar_grafico(snapshot.por_categoria)
+
+        # 5. Alertas de orçamento
+        with instrumentacao.fase("refresh.orcamentos"):
+            self._exibir_alertas_orcamento(snapshot)
+
+        # Do clique (ou troca de mês) até a tela atualizada, incluindo a espera na fila
+        # do executor e a consulta; o desenho pendente do Tk é medido em seguida
+        if inicio is not None:
+            instrumentacao.registrar_fase("refresh.total", time.perf_counter() - inicio)
+            aplicado = time.perf_counter()
+            self.after_idle(
+                lambda: instrumentacao.registrar_fase("refresh.desenho", time.perf_counter() - aplicado)
+            )
 
-    def _criar_item_lista(self, parent, row):
+        if not self._dados_exibidos:
+            self._dados_exibidos = True
+            medicao_inicio.marcar("dados do mês exibidos")
+            medicao_inicio.imprimir_relatorio()
+
+    def _criar_linha_lista(self, parent):
+        """Cria o widget de uma linha da lista (reaproveitado pela ListaVirtual)."""
         f = ctk.CTkFrame(parent, fg_color=COR_BG_LIGHT, corner_radius=10, height=70)
-        f.pack(fill="x", pady=5, padx=5)
         f.pack_propagate(False)
         
         # Container interno
@@ -450,14 +602,13 @@ class App(ctk.CTk):
         left.pack(side="left", fill="both", expand=True)
         
         # Categoria e descrição
-        categoria_limpa = row['categoria'].replace("🍔 ", "").replace("🚗 ", "").replace("🏠 ", "").replace("🎮 ", "").replace("📦 ", "")
-        titulo = f"📁 {categoria_limpa}"
-        ctk.CTkLabel(left, text=titulo, font=("Segoe UI", 11, "bold"), 
-                     text_color=COR_TEXT_DARK, anchor="w").pack(anchor="w")
+        f.lbl_titulo = ctk.CTkLabel(left, text="", font=("Segoe UI", 11, "bold"), 
+                                    text_color=COR_TEXT_DARK, anchor="w")
+        f.lbl_titulo.pack(anchor="w")
         
-        subtexto = f"📅 {row['data']}  •  {row['descricao'][:30]}"
-        ctk.CTkLabel(left, text=subtexto, font=("Segoe UI", 10), 
-                     text_color=COR_TEXT_GRAY, anchor="w").pack(anchor="w")
+        f.lbl_subtexto = ctk.CTkLabel(left, text="", font=("Segoe UI", 10), 
+                                      text_color=COR_TEXT_GRAY, anchor="w")
+        f.lbl_subtexto.pack(anchor="w")
         
         # Lado direito - Valor e botão
         right = ctk.CTkFrame(content, fg_color="transparent")
@@ -466,84 +617,167 @@ class App(ctk.CTk):
         valor_frame = ctk.CTkFrame(right, fg_color="transparent")
         valor_frame.pack(side="left", padx=(0, 8))
         
-        ctk.CTkLabel(valor_frame, text=f"R$ {row['valor']:.2f}", 
-                     font=("Segoe UI", 14, "bold"), text_color=COR_DANGER).pack()
+        f.lbl_valor = ctk.CTkLabel(valor_frame, text="", 
+                                   font=("Segoe UI", 14, "bold"), text_color=COR_DANGER)
+        f.lbl_valor.pack()
         
         # Botão deletar moderno
-        btn = ctk.CTkButton(right, text="🗑️", width=35, height=35, 
-                           fg_color=COR_DANGER, hover_color="#DC2626",
-                           corner_radius=8, font=("Segoe UI", 14),
-                           command=lambda: self.deletar(row['id']))
-        btn.pack()
-
-    def deletar(self, id_):
-        if messagebox.askyesno("Confirmar Exclusão", "Deseja remover esta despesa?"):
-            self.controller.excluir_despesa(id_)
-            self.refresh_app()
+        f.btn_deletar = ctk.CTkButton(right, text="🗑️", width=35, height=35, 
+                                      fg_color=COR_DANGER, hover_color="#DC2626",
+                                      corner_radius=8, font=("Segoe UI", 14))
+        f.btn_deletar.pack()
+        return f
+
+    def _preencher_linha_lista(self, f, row):
+        """Exibe a despesa 'row' numa linha criada por _criar_linha_lista."""
+        categoria_limpa = row.categoria.replace("🍔 ", "").replace("🚗 ", "").replace("🏠 ", "").replace("🎮 ", "").replace("📦 ", "")
+        f.lbl_titulo.configure(text=f"📁 {categoria_limpa}")
+        f.lbl_subtexto.configure(text=f"📅 {row.data}  •  {(row.descricao or '')[:30]}")
+        f.lbl_valor.configure(text=f"R$ {row.valor:.2f}")
+        f.btn_deletar.configure(command=lambda: self.deletar(row))
+
+    def deletar(self, row):
+        if row.recorrencia_id is None:
+            if messagebox.askyesno("Confirmar Exclusão", "Deseja remover esta despesa?"):
+                self.controller.excluir_despesa(row.id)
+                self.refresh_app()
+            return
 
-    def _plotar_grafico(self, df):
-        for widget in self.frame_grafico.winfo_children(): 
-            widget.destroy()
-        
-        if df.empty: 
-            # Mensagem quando não há dados
-            empty_frame = ctk.CTkFrame(self.frame_grafico, fg_color=COR_BG_LIGHT, corner_radius=12)
-            empty_frame.pack(fill="both", expand=True, padx=20, pady=40)
-            
-            ctk.CTkLabel(empty_frame, text="📊", font=("Segoe UI", 48)).pack(pady=(30, 10))
-            ctk.CTkLabel(empty_frame, text="Sem despesas neste mês", 
-                        font=("Segoe UI", 14, "bold"), text_color=COR_TEXT_GRAY).pack()
-            ctk.CTkLabel(empty_frame, text="Adicione despesas para ver a análise", 
-                        font=("Segoe UI", 11), text_color=COR_TEXT_GRAY).pack(pady=(5, 30))
+        # Ocorrência de uma despesa recorrente
+        resposta = messagebox.askyesnocancel(
+            "Confirmar Exclusão",
+            "Esta despesa se repete.\n\nSim: remover apenas deste mês\nNão: remover deste mês em diante"
+        )
+        if resposta is None:
+            return
+        if resposta:
+            self.controller.excluir_ocorrencia(row.recorrencia_id, self.mes_atual, self.ano_atual)
+        else:
+            self.controller.encerrar_recorrencia(row.recorrencia_id, self.mes_atual, self.ano_atual)
+        self.refresh_app()
+
+    def _plotar_grafico(self, por_categoria):
+        if not por_categoria: 
+            self.grafico.pack_forget()
+            self.frame_grafico_vazio.pack(fill="both", expand=True, padx=20, pady=40)
             return
 
-        # Criar gráfico moderno
-        fig, ax = plt.subplots(figsize=(5, 5), dpi=100)
-        fig.patch.set_facecolor('white')
-        ax.set_facecolor('white')
+        self.frame_grafico_vazio.pack_forget()
+        self.grafico.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Remover emojis das categorias para o gráfico
-        dados = df.copy()
-        dados['categoria'] = dados['categoria'].str.replace("🍔 ", "").str.replace("🚗 ", "").str.replace("🏠 ", "").str.replace("🎮 ", "").str.replace("📦 ", "")
-        dados_cat = dados.groupby('categoria')['valor'].sum()
-        
-        # Cores modernas
-        colors = ['#5B7FFF', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6']
-        
-        wedges, texts, autotexts = ax.pie(
-            dados_cat, 
-            labels=dados_cat.index, 
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors[:len(dados_cat)],
-            wedgeprops=dict(width=0.4, edgecolor='white', linewidth=2),
-            textprops=dict(color='black', fontsize=10, weight='bold')
-        )
-        
-        for autotext in autotexts:
-            autotext.set_color('black')
-            autotext.set_weight('bold')
-            autotext.set_fontsize(11)
-        
-        plt.tight_layout()
+        dados_cat = {}
+        for categoria, total in por_categoria:
+            categoria = categoria.replace("🍔 ", "").replace("🚗 ", "").replace("🏠 ", "").replace("🎮 ", "").replace("📦 ", "")
+            dados_cat[categoria] = dados_cat.get(categoria, 0.0) + total
         
-        canvas = FigureCanvasTkAgg(fig, master=self.frame_grafico)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self.grafico.atualizar(list(dados_cat.keys()), list(dados_cat.values()))
+
+    def _exibir_alertas_orcamento(self, snapshot):
+        for widget in self.frm_alertas.winfo_children():
+            widget.destroy()
+        alertas = snapshot.alertas_orcamento
+        if not alertas:
+            self.frm_alertas.pack_forget()
+        else:
+            self.frm_alertas.pack(fill="x", padx=15, pady=(0, 10), after=self.frame_grafico)
+            ctk.CTkLabel(self.frm_alertas, text="⚠️ Orçamentos", font=("Segoe UI", 12, "bold"),
+                         text_color=COR_TEXT_DARK).pack(anchor="w", padx=12, pady=(8, 2))
+            for orcamento in alertas:
+                cor = COR_DANGER if orcamento.alerta >= 100 else COR_WARNING
+                ctk.CTkLabel(
+                    self.frm_alertas, font=("Segoe UI", 11), text_color=cor, anchor="w",
+                    text=f"{orcamento.categoria}: R$ {orcamento.gasto:,.2f} de R$ {orcamento.limite:,.2f} "
+                         f"({orcamento.percentual:.0f}%)"
+                ).pack(anchor="w", padx=12, pady=(0, 2))
+            ctk.CTkFrame(self.frm_alertas, fg_color="transparent", height=6).pack()
+
+        # Avisa quando uma alteração no mês exibido faz um orçamento cruzar um limiar
+        mes = (snapshot.mes, snapshot.ano)
+        anteriores = self._niveis_orcamento.get(mes)
+        self._niveis_orcamento = {mes: {orcamento.categoria: orcamento.alerta for orcamento in snapshot.orcamentos}}
+        if anteriores is not None:
+            cruzados = [orcamento for orcamento in alertas if orcamento.alerta > anteriores.get(orcamento.categoria, 0)]
+            if cruzados:
+                texto = "\n".join(
+                    f"{orcamento.categoria}: {orcamento.percentual:.0f}% do orçamento "
+                    f"({'estourado' if orcamento.alerta >= 100 else 'acima de 80%'})"
+                    for orcamento in cruzados
+                )
+                self.after_idle(lambda: messagebox.showwarning("⚠️ Orçamento", texto))
 
     def exportar(self):
+        # Sim: ano inteiro (uma planilha por mês + resumo); Não: apenas o mês atual
+        ano_inteiro = messagebox.askyesnocancel(
+            "📥 Exportar para Excel",
+            f"Exportar o ano de {self.ano_atual} inteiro?\n\n"
+            "Sim: uma planilha por mês e um resumo anual\n"
+            f"Não: apenas {self.mes_atual:02d}/{self.ano_atual}"
+        )
+        if ano_inteiro is None:
+            return
         filename = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
         if filename:
-            try:
-                self.controller.exportar_relatorio(self.mes_atual, self.ano_atual, filename)
-                messagebox.showinfo("✅ Sucesso", "Relatório exportado com sucesso!")
-            except Exception as e:
-                messagebox.showerror("❌ Erro", f"Falha ao exportar: {e}")    
+            if ano_inteiro:
+                funcao, argumentos = self.controller.exportar_ano, (self.ano_atual, filename)
+            else:
+                funcao, argumentos = self.controller.exportar_relatorio, (self.mes_atual, self.ano_atual, filename)
+            self.executor.submeter(
+                "exportar", funcao, *argumentos,
+                ao_concluir=lambda _: messagebox.showinfo("✅ Sucesso", "Relatório exportado com sucesso!"),
+                ao_falhar=lambda e: messagebox.showerror("❌ Erro", f"Falha ao exportar: {e}")
+            )
+
+    def abrir_busca(self):
+        from src.views.busca import JanelaBusca
+        texto = self.ent_busca.get().strip()
+        if self._janela_busca is None or not self._janela_busca.winfo_exists():
+            self._janela_busca = JanelaBusca(self, self.controller, self.executor, texto, ao_abrir_mes=self.ir_para_mes)
+        else:
+            self._janela_busca.definir_texto(texto)
+        self._janela_busca.focus()
+
+    def ir_para_mes(self, mes, ano):
+        """Exibe o mês/ano na janela principal (ex.: a partir de um resultado da busca)."""
+        self.cmb_mes.set(str(mes))
+        self.cmb_ano.set(str(ano))
+        self._refresh_trigger()
+
+    def abrir_visao_anual(self):
+        from src.views.visao_anual import VisaoAnual
+        VisaoAnual(self, self.controller, self.executor, self.ano_atual).focus()
+
+    def abrir_projecao(self):
+        from src.views.fluxo_caixa import FluxoCaixa
+        hoje = datetime.now()
+        FluxoCaixa(self, self.controller, self.executor, (hoje.month, hoje.year)).focus()
+
+    def importar_extrato(self):
+        filename = filedialog.askopenfilename(
+            filetypes=[("Extratos bancários", "*.csv *.ofx *.qfx"), ("CSV", "*.csv"), ("OFX", "*.ofx *.qfx")]
+        )
+        if filename:
+            self.executor.submeter(
+                "importar", self.controller.importar_extrato, filename,
+                ao_concluir=self._extrato_importado,
+                ao_falhar=lambda e: messagebox.showerror("❌ Erro", f"Falha ao importar extrato: {e}")
+            )
+
+    def _extrato_importado(self, resultado):
+        messagebox.showinfo(
+            "✅ Extrato importado",
+            f"{resultado.importadas} despesas importadas\n"
+            f"{resultado.duplicadas} já existentes (ignoradas)\n"
+            f"{resultado.ignoradas} créditos ignorados\n\n"
+            f"{resultado.lidas} transações em {resultado.segundos:.1f}s ({resultado.por_segundo:,.0f}/s)"
+        )
+        self.refresh_app()
+
     def abrir_gerenciar_categorias(self):
         """Abre janela modal para gerenciar categorias"""
         modal = ctk.CTkToplevel(self)
         modal.title("🏷️ Gerenciar Categorias")
-        modal.geometry("600x500")
+        modal.geometry("640x560")
         modal.configure(fg_color=COR_BG_LIGHT)
         modal.transient(self)
         modal.grab_set()
@@ -629,7 +863,10 @@ class App(ctk.CTk):
         list_frame.pack(fill="both", expand=True)
         
         ctk.CTkLabel(list_frame, text="📋 Categorias Existentes", 
-                     font=("Segoe UI", 14, "bold"), text_color=COR_TEXT_DARK).pack(pady=(15, 10))
+                     font=("Segoe UI", 14, "bold"), text_color=COR_TEXT_DARK).pack(pady=(15, 0))
+        ctk.CTkLabel(list_frame, text=f"Orçamento mensal de {self.mes_atual:02d}/{self.ano_atual} "
+                                      f"em diante ({MESES_ORCAMENTO} meses); deixe vazio para remover",
+                     font=("Segoe UI", 11), text_color=COR_TEXT_GRAY).pack(pady=(0, 10))
         
         scroll_frame = ctk.CTkScrollableFrame(list_frame, fg_color="transparent", height=200)
         scroll_frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
@@ -638,20 +875,24 @@ class App(ctk.CTk):
             for widget in scroll_frame.winfo_children():
                 widget.destroy()
             
-            categorias_df = self.controller.buscar_categorias()
-            if categorias_df.empty:
+            categorias = self.controller.buscar_categorias()
+            if not categorias:
                 ctk.CTkLabel(scroll_frame, text="Nenhuma categoria cadastrada", 
                              text_color=COR_TEXT_GRAY).pack(pady=20)
                 return
             
-            for _, row in categorias_df.iterrows():
+            limites = {
+                orcamento.categoria: orcamento.limite
+                for orcamento in self.controller.buscar_orcamentos(self.mes_atual, self.ano_atual)
+            }
+            for row in categorias:
                 cat_item = ctk.CTkFrame(scroll_frame, fg_color=COR_BG_LIGHT, corner_radius=8)
                 cat_item.pack(fill="x", pady=3)
                 
-                ctk.CTkLabel(cat_item, text=f"{row['icone']} {row['nome']}", 
+                ctk.CTkLabel(cat_item, text=f"{row.icone} {row.nome}", 
                              font=("Segoe UI", 12), text_color=COR_TEXT_DARK).pack(side="left", padx=15, pady=10)
                 
-                def excluir_cat(nome=row['nome']):
+                def excluir_cat(nome=row.nome):
                     if messagebox.askyesno("Confirmar", f"Excluir categoria '{nome}'?"):
                         try:
                             self.controller.excluir_categoria(nome)
@@ -664,18 +905,47 @@ class App(ctk.CTk):
                 ctk.CTkButton(cat_item, text="🗑️", width=40, height=30, 
                               fg_color=COR_DANGER, hover_color="#DC2626",
                               command=excluir_cat).pack(side="right", padx=10)
+                
+                # Orçamento mensal: vale para o mês exibido e os 11 seguintes (vazio remove)
+                categoria = f"{row.icone} {row.nome}"
+                ent_limite = ctk.CTkEntry(cat_item, placeholder_text="Orçamento (R$)", width=120, height=30)
+                if categoria in limites:
+                    ent_limite.insert(0, f"{limites[categoria]:.2f}")
+                
+                def salvar_orcamento(categoria=categoria, ent_limite=ent_limite):
+                    texto = ent_limite.get().strip().replace(",", ".")
+                    try:
+                        if texto:
+                            self.controller.definir_orcamento(categoria, self.mes_atual, self.ano_atual,
+                                                              float(texto), meses=MESES_ORCAMENTO)
+                        else:
+                            self.controller.excluir_orcamento(categoria, self.mes_atual, self.ano_atual,
+                                                              meses=MESES_ORCAMENTO)
+                        self.refresh_app()
+                    except ValueError:
+                        messagebox.showerror("Erro", "Orçamento inválido! Use um valor positivo.", parent=modal)
+                    except Exception as e:
+                        messagebox.showerror("Erro", str(e), parent=modal)
+                
+                ctk.CTkButton(cat_item, text="💾", width=40, height=30, 
+                              fg_color=COR_PRIMARY, hover_color="#4A6FEE",
+                              command=salvar_orcamento).pack(side="right")
+                ent_limite.pack(side="right", padx=(0, 5))
         
         atualizar_lista()
 
     def carregar_categorias(self):
         """Atualiza o dropdown de categorias com as do banco de dados"""
         try:
-            categorias_df = self.controller.buscar_categorias()
-            if not categorias_df.empty:
-                categorias_lista = [f"{row['icone']} {row['nome']}" for _, row in categorias_df.iterrows()]
+            categorias = self.controller.buscar_categorias()
+            if categorias:
+                categorias_lista = [f"{categoria.icone} {categoria.nome}" for categoria in categorias]
                 self.cmb_cat.configure(values=categorias_lista)
         except Exception as e:
             print(f"Erro ao carregar categorias: {e}")
 if __name__ == "__main__":
+    medicao_inicio.marcar("módulos carregados")
     app = App()
     app.mainloop()
+    app.executor.encerrar()
+    app.controller.db.fechar()
@@ -1,6 +1,12 @@
 # Pacote src do Sistema de Gestão Financeira
-
-from . import controllers
-from . import database
+import importlib
 
 __all__ = ['controllers', 'database']
+
+
+def __getattr__(nome):
+    # Submódulos carregados no primeiro acesso (src.controllers, src.database),
+    # para que importar o pacote não arraste pandas, openpyxl etc.
+    if nome in __all__:
+        return importlib.import_module(f".{nome}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
@@ -0,0 +1,233 @@
+import csv
+import os
+import re
+from itertools import islice
+
+# Tabelas copiadas no backup, na ordem em que são recarregadas.
+# 'resumo_mensal' não entra: é derivada e recalculada ao final da importação
+# (assim como o gasto de 'orcamentos').
+TABELAS_BACKUP = [
+    "configuracoes",
+    "categorias",
+    "orcamentos",
+    "receitas_extras",
+    "recorrencias",
+    "recorrencias_excecoes",
+    "despesas",
+]
+
+FORMATOS_BACKUP = ("csv", "parquet")
+
+# Linhas lidas do SQLite (ou do arquivo) e gravadas por vez
+TAMANHO_BLOCO_BACKUP = 50000
+
+# NULL no CSV (como no COPY do PostgreSQL). Campos vazios são o texto '' nas colunas TEXT;
+# um texto que seja só barras invertidas seguidas de N ganha mais uma barra ao ser gravado
+NULO_CSV = "\\N"
+_PARECE_NULO_CSV = re.compile(r"\\+N")
+
+# Tipos declarados no SQLite -> tipos das colunas no Parquet
+_TIPOS_PARQUET = {"INTEGER": "int64", "REAL": "float64", "TEXT": "string"}
+
+
+def _pyarrow():
+    """Importa o pyarrow só quando o formato Parquet é usado (dependência opcional)."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception("O formato Parquet requer o pacote 'pyarrow' (pip install pyarrow).")
+    return pyarrow
+
+
+def _colunas(conn, tabela: str) -> list:
+    """Lista (nome, tipo declarado) das colunas da tabela."""
+    return [(coluna[1], coluna[2].upper()) for coluna in conn.execute(f"PRAGMA table_info({tabela})")]
+
+
+def _blocos(linhas, tamanho: int = TAMANHO_BLOCO_BACKUP):
+    """Consome um iterável em listas de até 'tamanho' itens."""
+    linhas = iter(linhas)
+    while True:
+        bloco = list(islice(linhas, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+def _validar_formato(formato: str):
+    if formato not in FORMATOS_BACKUP:
+        raise ValueError(f"Formato de backup desconhecido: {formato}")
+
+
+def caminho_tabela(pasta: str, tabela: str, formato: str) -> str:
+    return os.path.join(pasta, f"{tabela}.{formato}")
+
+
+def exportar(conn, pasta: str, formato: str = "csv") -> dict:
+    """Grava cada tabela de TABELAS_BACKUP em 'pasta' (um arquivo por tabela) e retorna
+    {tabela: linhas gravadas}. As linhas são lidas do cursor em blocos e escritas à medida
+    que chegam, sem carregar a tabela inteira em memória. Quem chama deve abrir uma
+    transação de leitura para que todas as tabelas venham do mesmo estado do banco."""
+    _validar_formato(formato)
+    os.makedirs(pasta, exist_ok=True)
+    escrever = _escrever_csv if formato == "csv" else _escrever_parquet
+
+    totais = {}
+    for tabela in TABELAS_BACKUP:
+        colunas = _colunas(conn, tabela)
+        cursor = conn.execute(f"SELECT {', '.join(nome for nome, _ in colunas)} FROM {tabela}")
+        blocos = iter(lambda: cursor.fetchmany(TAMANHO_BLOCO_BACKUP), [])
+        totais[tabela] = escrever(caminho_tabela(pasta, tabela, formato), colunas, blocos)
+    return totais
+
+
+def _valor_csv(valor):
+    if valor is None:
+        return NULO_CSV
+    if isinstance(valor, str) and _PARECE_NULO_CSV.fullmatch(valor):
+        return "\\" + valor
+    return valor
+
+
+def _escrever_csv(caminho: str, colunas: list, blocos) -> int:
+    total = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow([nome for nome, _ in colunas])
+        for bloco in blocos:
+            escritor.writerows([_valor_csv(valor) for valor in linha] for linha in bloco)
+            total += len(bloco)
+    return total
+
+
+def _escrever_parquet(caminho: str, colunas: list, blocos) -> int:
+    pa = _pyarrow()
+    esquema = pa.schema([(nome, _TIPOS_PARQUET.get(tipo, "string")) for nome, tipo in colunas])
+    total = 0
+    with pa.parquet.ParquetWriter(caminho, esquema) as escritor:
+        for bloco in blocos:
+            # Linhas -> colunas: cada bloco vira um row group do arquivo
+            dados = [pa.array(valores, type=campo.type) for valores, campo in zip(zip(*bloco), esquema)]
+            escritor.write_batch(pa.record_batch(dados, schema=esquema))
+            total += len(bloco)
+    return total
+
+
+def importar(conn, pasta: str, formato: str = "csv") -> dict:
+    """Substitui o conteúdo de cada tabela de TABELAS_BACKUP que tenha arquivo em 'pasta'
+    e retorna {tabela: linhas inseridas}. As linhas são inseridas em blocos com
+    executemany; quem chama deve abrir a transação (ver Database.carga_em_lote) para
+    que a carga seja tudo ou nada."""
+    _validar_formato(formato)
+    ler = _ler_csv if formato == "csv" else _ler_parquet
+
+    arquivos = {
+        tabela: caminho_tabela(pasta, tabela, formato)
+        for tabela in TABELAS_BACKUP
+        if os.path.exists(caminho_tabela(pasta, tabela, formato))
+    }
+    if not arquivos:
+        raise Exception(f"Nenhum arquivo de backup .{formato} encontrado em {pasta}")
+
+    totais = {}
+    for tabela, caminho in arquivos.items():
+        cabecalho, linhas = _abrir(conn, tabela, caminho, ler)
+
+        # Índices são recriados depois da carga: montar o índice de uma vez (ordenando)
+        # sai mais barato do que atualizá-lo a cada linha inserida
+        indices = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (tabela,)
+        ).fetchall()
+        for nome, _ in indices:
+            conn.execute(f"DROP INDEX {nome}")
+
+        sql = f"INSERT INTO {tabela} ({', '.join(cabecalho)}) VALUES ({', '.join('?' * len(cabecalho))})"
+        conn.execute(f"DELETE FROM {tabela}")
+        totais[tabela] = 0
+        for bloco in _blocos(linhas):
+            conn.executemany(sql, bloco)
+            totais[tabela] += len(bloco)
+
+        for _, sql_indice in indices:
+            conn.execute(sql_indice)
+    return totais
+
+
+def conferir(conn, pasta: str, formato: str = "csv") -> dict:
+    """Compara, linha a linha e valor a valor, cada arquivo de backup em 'pasta' com a
+    tabela correspondente do banco e retorna {tabela: (linhas só no banco, linhas só no
+    arquivo)} das tabelas que divergem ({} = backup idêntico ao banco). Os arquivos são
+    carregados em tabelas temporárias com os mesmos tipos; o banco não é alterado."""
+    _validar_formato(formato)
+    ler = _ler_csv if formato == "csv" else _ler_parquet
+
+    divergencias = {}
+    for tabela in TABELAS_BACKUP:
+        caminho = caminho_tabela(pasta, tabela, formato)
+        if not os.path.exists(caminho):
+            continue
+        cabecalho, linhas = _abrir(conn, tabela, caminho, ler)
+        colunas = ", ".join(cabecalho)
+        conn.execute("DROP TABLE IF EXISTS temp.conferencia_backup")
+        conn.execute(f"CREATE TEMP TABLE conferencia_backup AS SELECT {colunas} FROM main.{tabela} WHERE 0")
+        sql = f"INSERT INTO temp.conferencia_backup VALUES ({', '.join('?' * len(cabecalho))})"
+        for bloco in _blocos(linhas):
+            conn.executemany(sql, bloco)
+        so_banco, so_arquivo = conn.execute(f"""
+            SELECT (SELECT count(*) FROM (SELECT {colunas} FROM main.{tabela}
+                                          EXCEPT SELECT {colunas} FROM temp.conferencia_backup)),
+                   (SELECT count(*) FROM (SELECT {colunas} FROM temp.conferencia_backup
+                                          EXCEPT SELECT {colunas} FROM main.{tabela}))
+        """).fetchone()
+        conn.execute("DROP TABLE temp.conferencia_backup")
+        if so_banco or so_arquivo:
+            divergencias[tabela] = (so_banco, so_arquivo)
+    return divergencias
+
+
+def _abrir(conn, tabela: str, caminho: str, ler):
+    """Abre o arquivo de backup da tabela com ler() e valida o cabeçalho."""
+    colunas = dict(_colunas(conn, tabela))
+    cabecalho, linhas = ler(caminho, colunas)
+    if not cabecalho:
+        raise ValueError(f"Arquivo de backup sem cabeçalho: {caminho}")
+    desconhecidas = [nome for nome in cabecalho if nome not in colunas]
+    if desconhecidas:
+        raise ValueError(f"Colunas desconhecidas em {caminho}: {', '.join(desconhecidas)}")
+    return cabecalho, linhas
+
+
+def _ler_csv(caminho: str, colunas: dict):
+    """Retorna (cabeçalho, linhas) do CSV. NULO_CSV volta como NULL e, nas colunas TEXT,
+    campos vazios voltam como ''; nas demais, onde não há texto vazio, como NULL. Os valores
+    chegam como texto e são convertidos pela afinidade de tipo das colunas do SQLite."""
+    arquivo = open(caminho, newline="", encoding="utf-8")
+    leitor = csv.reader(arquivo)
+    cabecalho = next(leitor, [])
+    vazio_e_nulo = [colunas.get(nome) != "TEXT" for nome in cabecalho]
+
+    def valor(texto, vazio_nulo):
+        if texto == NULO_CSV or (texto == "" and vazio_nulo):
+            return None
+        if _PARECE_NULO_CSV.fullmatch(texto):
+            return texto[1:]
+        return texto
+
+    def linhas():
+        with arquivo:
+            for linha in leitor:
+                yield [valor(texto, vazio_nulo) for texto, vazio_nulo in zip(linha, vazio_e_nulo)]
+    return cabecalho, linhas()
+
+
+def _ler_parquet(caminho: str, colunas: dict):
+    """Retorna (cabeçalho, linhas) do Parquet, lido um bloco (record batch) por vez."""
+    pa = _pyarrow()
+    arquivo = pa.parquet.ParquetFile(caminho)
+
+    def linhas():
+        for lote in arquivo.iter_batches(batch_size=TAMANHO_BLOCO_BACKUP):
+            yield from zip(*(coluna.to_pylist() for coluna in lote.columns))
+    return arquivo.schema_arrow.names, linhas()
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class CacheVersionado:
+    """
+    Cache LRU limitado cujas entradas pertencem a uma versão dos dados.
+    Cada escrita no banco chama invalidar(), que avança a versão e descarta as
+    entradas. Um valor calculado durante uma escrita concorrente não é guardado,
+    pois pertence à versão anterior.
+    """
+
+    def __init__(self, capacidade: int = 64):
+        self.capacidade = capacidade
+        self.versao = 0
+        self.acertos = 0
+        self.falhas = 0
+        self._entradas = OrderedDict()
+        self._lock = Lock()
+
+    def obter(self, chave: tuple, calcular):
+        """Retorna o valor em cache para a chave ou o calcula (e guarda) com calcular()."""
+        with self._lock:
+            chave_versionada = (self.versao,) + chave
+            if chave_versionada in self._entradas:
+                self._entradas.move_to_end(chave_versionada)
+                self.acertos += 1
+                return self._entradas[chave_versionada]
+            self.falhas += 1
+
+        # O cálculo acontece fora do lock para não bloquear outras threads
+        valor = calcular()
+
+        with self._lock:
+            if chave_versionada[0] == self.versao:
+                self._entradas[chave_versionada] = valor
+                self._entradas.move_to_end(chave_versionada)
+                while len(self._entradas) > self.capacidade:
+                    self._entradas.popitem(last=False)
+        return valor
+
+    def invalidar(self):
+        """Avança a versão dos dados, tornando obsoletas todas as entradas atuais."""
+        with self._lock:
+            self.versao += 1
+            self._entradas.clear()
+
+    def limpar(self):
+        """Remove todas as entradas e zera as estatísticas."""
+        with self._lock:
+            self._entradas.clear()
+            self.acertos = 0
+            self.falhas = 0
+
+    def estatisticas(self) -> dict:
+        """Retorna acertos, falhas, taxa de acerto, ocupação e versão atual."""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "tamanho": len(self._entradas),
+                "capacidade": self.capacidade,
+                "versao": self.versao,
+            }
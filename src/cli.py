@@ -0,0 +1,167 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import freeze_support
+
+from src.controllers import FinanceiroController
+from src.database import Database
+
+# Controller de cada processo do pool de relatórios (criado por _iniciar_processo)
+_controller_processo = None
+
+
+def _mes(texto: str) -> tuple:
+    """'MM/AAAA' -> (mes, ano), para os argumentos da linha de comando."""
+    try:
+        mes, ano = (int(parte) for parte in texto.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"mês inválido: {texto} (use MM/AAAA)")
+    if not 1 <= mes <= 12:
+        raise argparse.ArgumentTypeError(f"mês inválido: {texto} (use MM/AAAA)")
+    return mes, ano
+
+
+def tarefas_relatorios(periodos: list, pasta: str, anual: bool = False) -> list:
+    """Converte os períodos pedidos ('MM/AAAA' ou 'AAAA') em tarefas de exportação
+    (mes_inicio, ano_inicio, mes_fim, ano_fim, caminho), sem repetições. Um ano vira
+    12 relatórios mensais ou, com anual=True, um relatório do ano inteiro."""
+    tarefas = {}
+    for texto in periodos:
+        if "/" in texto:
+            if anual:
+                raise ValueError(f"Com --anual, informe apenas anos (AAAA): {texto}")
+            meses = [_mes(texto)]
+        elif texto.isdigit():
+            ano = int(texto)
+            if anual:
+                tarefas[(1, ano, 12, ano)] = os.path.join(pasta, f"relatorio_{ano}.xlsx")
+                continue
+            meses = [(mes, ano) for mes in range(1, 13)]
+        else:
+            raise ValueError(f"Período inválido: {texto} (use MM/AAAA ou AAAA)")
+        for mes, ano in meses:
+            tarefas[(mes, ano, mes, ano)] = os.path.join(pasta, f"relatorio_{mes:02d}-{ano}.xlsx")
+    return [chave + (caminho,) for chave, caminho in tarefas.items()]
+
+
+def _iniciar_processo(caminho_banco: str):
+    """Inicializador dos processos do pool: cada um abre o banco com sua própria
+    conexão somente leitura."""
+    global _controller_processo
+    Database.usar_arquivo(caminho_banco, somente_leitura=True)
+    _controller_processo = FinanceiroController()
+
+
+def _gerar_relatorio(tarefa: tuple) -> str:
+    *periodo, caminho = tarefa
+    with contextlib.redirect_stdout(io.StringIO()):
+        _controller_processo.exportar_periodo(*periodo, caminho)
+    return caminho
+
+
+def gerar_relatorios(caminho_banco: str, tarefas: list, processos: int = None):
+    """Gera os relatórios das tarefas (ver tarefas_relatorios) em paralelo, num pool de
+    'processos' processos (padrão: um por CPU), e produz o caminho de cada arquivo à
+    medida que fica pronto. Com processos=1, gera tudo neste processo, em série."""
+    processos = max(1, min(processos or os.cpu_count() or 1, len(tarefas)))
+    if processos == 1:
+        _iniciar_processo(caminho_banco)
+        for tarefa in tarefas:
+            yield _gerar_relatorio(tarefa)
+        return
+    with ProcessPoolExecutor(processos, initializer=_iniciar_processo, initargs=(caminho_banco,)) as pool:
+        for futuro in as_completed([pool.submit(_gerar_relatorio, tarefa) for tarefa in tarefas]):
+            yield futuro.result()
+
+
+# --- Comandos ---
+
+def _imprimir_totais(totais: list, como_json: bool):
+    if como_json:
+        print(json.dumps([
+            {**total._asdict(), "grupos": [grupo._asdict() for grupo in total.grupos]} for total in totais
+        ], indent=2, ensure_ascii=False))
+        return
+    print(f"{'Mês':<10}{'Receita':>16}{'Despesas':>16}{'Saldo':>16}")
+    for total in totais:
+        print(f"{total.mes:02d}/{total.ano:<7}{total.receita:>16,.2f}{total.despesas:>16,.2f}{total.saldo:>16,.2f}")
+        for grupo in total.grupos:
+            print(f"    {grupo.grupo:<38}{grupo.total:>16,.2f}")
+    if len(totais) > 1:
+        receita = sum(total.receita for total in totais)
+        despesas = sum(total.despesas for total in totais)
+        print(f"{'Total':<10}{receita:>16,.2f}{despesas:>16,.2f}{receita - despesas:>16,.2f}")
+
+
+def _comando_totais(args) -> int:
+    controller = FinanceiroController()
+    _imprimir_totais(controller.totais_periodo(args.mes, args.mes, "categoria"), args.json)
+    return 0
+
+
+def _comando_resumo(args) -> int:
+    controller = FinanceiroController()
+    _imprimir_totais(controller.totais_periodo(args.inicio, args.fim, args.agrupar), args.json)
+    return 0
+
+
+def _comando_relatorios(args) -> int:
+    tarefas = tarefas_relatorios(args.periodos, args.pasta, args.anual)
+    os.makedirs(args.pasta, exist_ok=True)
+    # Aberto no modo normal: aplica migrações pendentes antes dos processos somente leitura.
+    # A conexão é fechada antes do fork: conexões SQLite não devem passar para os filhos
+    Database().fechar()
+    inicio = time.perf_counter()
+    for indice, caminho in enumerate(gerar_relatorios(Database.DB_NAME, tarefas, args.processos), start=1):
+        print(f"[{indice}/{len(tarefas)}] {caminho}")
+    print(f"{len(tarefas)} relatório(s) em {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli", description="Davydson Finanças sem interface gráfica: totais e relatórios."
+    )
+    parser.add_argument("--banco", default=Database.DB_NAME, help="arquivo do banco (padrão: %(default)s)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    totais = comandos.add_parser("totais", help="receita, despesas, saldo e categorias de um mês")
+    totais.add_argument("mes", type=_mes, help="MM/AAAA")
+    totais.add_argument("--json", action="store_true", help="saída em JSON")
+    totais.set_defaults(executar=_comando_totais, somente_leitura=True)
+
+    resumo = comandos.add_parser("resumo", help="totais mês a mês de um intervalo")
+    resumo.add_argument("inicio", type=_mes, help="MM/AAAA")
+    resumo.add_argument("fim", type=_mes, help="MM/AAAA (inclusive)")
+    resumo.add_argument("--agrupar", choices=["categoria", "tipo"], help="despesas de cada mês por grupo")
+    resumo.add_argument("--json", action="store_true", help="saída em JSON")
+    resumo.set_defaults(executar=_comando_resumo, somente_leitura=True)
+
+    relatorios = comandos.add_parser("relatorios", help="relatórios Excel de vários meses ou anos, em paralelo")
+    relatorios.add_argument("periodos", nargs="+", help="meses (MM/AAAA) ou anos (AAAA, um relatório por mês)")
+    relatorios.add_argument("--pasta", default="relatorios", help="pasta de saída (padrão: %(default)s)")
+    relatorios.add_argument("--anual", action="store_true", help="um relatório por ano em vez de um por mês")
+    relatorios.add_argument("--processos", type=int, help="processos em paralelo (padrão: um por CPU)")
+    relatorios.set_defaults(executar=_comando_relatorios, somente_leitura=False)
+
+    args = parser.parse_args(argv)
+    # Sem esta verificação, um caminho digitado errado criaria um banco vazio
+    if not os.path.isfile(args.banco):
+        print(f"Erro: banco não encontrado: {args.banco}", file=sys.stderr)
+        return 1
+    Database.usar_arquivo(args.banco, somente_leitura=args.somente_leitura)
+    try:
+        return args.executar(args)
+    except Exception as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    freeze_support()
+    sys.exit(main())
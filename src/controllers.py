@@ -1,239 +1,1017 @@
+import base64
+import inspect
 import sqlite3
-import pandas as pd
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
-from src.database import Database
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+import time
+from datetime import date, datetime
+from functools import wraps
+from itertools import groupby
+from typing import TYPE_CHECKING, Iterable
+from src import backup, importacao, instrumentacao
+from src.cache import CacheVersionado
+from src.database import Database, SQL_GASTO_ORCAMENTOS, TIPO_RECEITA_EXTRA, centavos
+from src.models import (
+    Categoria, Despesa, Orcamento, PaginaDespesas, ReceitaExtra, ResultadoBusca, ResultadoImportacao, SnapshotMes,
+    TotalCategoria, TotalGrupo, TotalMes
+)
 
+# pandas e openpyxl são carregados só quando usados (ver _pandas e exportar_periodo),
+# para não pesarem na abertura da aplicação
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Formatos aceitos na entrada de datas ('%m/%y' assume o dia 1, padrão do strptime)
+FORMATOS_DATA = ["%d/%m/%Y", "%m/%y", "%Y-%m-%d", "%d-%m-%Y"]
+
+# Tamanho dos blocos gravados por adicionar_despesas_lote
+TAMANHO_LOTE = 5000
+
+# Quantidade máxima de consultas guardadas no cache do controller
+TAMANHO_CACHE = 64
+
+# Valores em centavos (database.centavos) e datas em 'YYYY-MM-DD'
+SQL_INSERIR_DESPESA = (
+    "INSERT INTO despesas (data_iso, tipo, categoria, descricao, valor_centavos, recorrencia_meses) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Despesa vinda de extrato bancário: ignorada se o hash do lançamento já existir (só esse
+# conflito; outras violações de restrição geram erro, em vez de contar como duplicada)
+SQL_IMPORTAR_DESPESA = (
+    "INSERT INTO despesas "
+    "(data_iso, tipo, categoria, descricao, valor_centavos, recorrencia_meses, hash_importacao) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (hash_importacao) DO NOTHING"
+)
+
+SQL_SALARIOS = "SELECT salario_1_centavos / 100.0, salario_2_centavos / 100.0 FROM configuracoes WHERE id = 1"
+
+SQL_INSERIR_RECORRENCIA = (
+    "INSERT INTO recorrencias (tipo, categoria, descricao, valor_centavos, dia, periodo_inicio, meses) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Ocorrências das recorrências num intervalo de períodos (ano * 12 + mes - 1),
+# geradas só para os meses pedidos, já com as exceções aplicadas.
+_CTE_OCORRENCIAS = """
+    WITH RECURSIVE periodos(p) AS (
+        SELECT :periodo_inicio
+        UNION ALL
+        SELECT p + 1 FROM periodos WHERE p < :periodo_fim
+    ),
+    ocorrencias AS (
+        SELECT r.id AS recorrencia_id, pr.p / 12 AS ano, pr.p % 12 + 1 AS mes, r.dia,
+               r.tipo, r.categoria, r.descricao, COALESCE(e.valor_centavos, r.valor_centavos) AS valor_centavos,
+               r.meses AS recorrencia_meses
+        FROM recorrencias r
+        JOIN periodos pr
+          ON pr.p >= r.periodo_inicio
+         AND (r.meses IS NULL OR pr.p < r.periodo_inicio + r.meses)
+        LEFT JOIN recorrencias_excecoes e
+          ON e.recorrencia_id = r.id AND e.periodo = pr.p
+        WHERE COALESCE(e.removida, 0) = 0
+    )
+"""
+
+# Despesas do intervalo: as linhas gravadas em 'despesas' mais as ocorrências.
+# Ocorrências não têm 'id' próprio; são identificadas por (recorrencia_id, mês).
+# Saem no formato do modelo Despesa: valor em reais e data também em DD/MM/YYYY.
+_CTE_OCORRENCIAS_DATADAS = _CTE_OCORRENCIAS + """,
+    ocorrencias_datadas AS (
+        SELECT *, min(dia, CAST(strftime('%d', printf('%04d-%02d-01', ano, mes), '+1 month', '-1 day') AS INTEGER)) AS dia_mes
+        FROM ocorrencias
+    )
+"""
+
+SQL_DESPESAS_PERIODO = _CTE_OCORRENCIAS_DATADAS + """
+    SELECT id, strftime('%d/%m/%Y', data_iso) AS data, tipo, categoria, descricao,
+           valor_centavos / 100.0 AS valor, recorrencia_meses, data_iso, NULL AS recorrencia_id
+    FROM despesas
+    WHERE data_iso >= :data_inicio AND data_iso < :data_fim
+    UNION ALL
+    SELECT NULL, printf('%02d/%02d/%04d', dia_mes, mes, ano), tipo, categoria, descricao, valor_centavos / 100.0,
+           recorrencia_meses, printf('%04d-%02d-%02d', ano, mes, dia_mes), recorrencia_id
+    FROM ocorrencias_datadas
+    ORDER BY data_iso, id, recorrencia_id
+"""
+
+# Listagem paginada por chave (paginar_despesas): as linhas saem em ordem de (data_iso, ordem),
+# onde 'ordem' é o id da despesa ou -recorrencia_id nas ocorrências, e cada página recomeça
+# logo depois da última chave lida. Sem OFFSET, o custo de uma página não cresce com o
+# tanto de histórico já percorrido. Filtros e continuação entram em _sql_pagina_despesas.
+_COLUNAS_PAGINA_DESPESA = """
+    SELECT id, strftime('%d/%m/%Y', data_iso) AS data, tipo, categoria, descricao,
+           valor_centavos / 100.0 AS valor, recorrencia_meses, data_iso, NULL AS recorrencia_id, id AS ordem
+    FROM despesas
+"""
+
+# Um mês: despesas gravadas mais as ocorrências das recorrências
+_SQL_PAGINA_MES = _CTE_OCORRENCIAS_DATADAS + f""",
+    linhas AS (
+        {_COLUNAS_PAGINA_DESPESA}
+        WHERE data_iso >= :data_inicio AND data_iso < :data_fim
+        UNION ALL
+        SELECT NULL, printf('%02d/%02d/%04d', dia_mes, mes, ano), tipo, categoria, descricao, valor_centavos / 100.0,
+               recorrencia_meses, printf('%04d-%02d-%02d', ano, mes, dia_mes), recorrencia_id, -recorrencia_id
+        FROM ocorrencias_datadas
+    )
+    SELECT * FROM linhas
+"""
+
+# Histórico inteiro: só as despesas gravadas (índices em data_iso e em categoria, data_iso)
+_SQL_PAGINA_HISTORICO = f"""
+    WITH linhas AS ({_COLUNAS_PAGINA_DESPESA})
+    SELECT * FROM linhas
+"""
+
+# Linhas por página de paginar_despesas
+TAMANHO_PAGINA = 100
+
+# Totais de um mês: salários, leitura direta de 'resumo_mensal' e as ocorrências do mês.
+# Retorna (receita, despesas) em centavos (inteiros), convertidos para reais só no final.
+SQL_TOTAIS_MES = _CTE_OCORRENCIAS + f"""
+    SELECT
+        (SELECT COALESCE(SUM(salario_1_centavos + salario_2_centavos), 0) FROM configuracoes WHERE id = 1)
+        + (SELECT COALESCE(SUM(total_centavos), 0) FROM resumo_mensal
+           WHERE ano = :ano AND mes = :mes AND tipo = '{TIPO_RECEITA_EXTRA}'),
+        (SELECT COALESCE(SUM(total_centavos), 0) FROM resumo_mensal
+         WHERE ano = :ano AND mes = :mes AND tipo != '{TIPO_RECEITA_EXTRA}')
+        + (SELECT COALESCE(SUM(valor_centavos), 0) FROM ocorrencias)
+"""
+
+# Totais de despesas do mês por categoria e tipo
+SQL_TOTAIS_CATEGORIA_MES = _CTE_OCORRENCIAS + f"""
+    SELECT categoria, tipo, SUM(total_centavos) / 100.0 AS total, SUM(quantidade) AS quantidade
+    FROM (
+        SELECT categoria, tipo, total_centavos, quantidade FROM resumo_mensal
+        WHERE ano = :ano AND mes = :mes AND tipo != '{TIPO_RECEITA_EXTRA}'
+        UNION ALL
+        SELECT categoria, tipo, valor_centavos, 1 FROM ocorrencias
+    )
+    GROUP BY categoria, tipo
+    ORDER BY total DESC
+"""
+
+# Totais de um intervalo de meses numa só consulta agrupada: 'resumo_mensal' (já agregada
+# por mês, categoria e tipo) mais as ocorrências das recorrências, em centavos. As linhas
+# de receitas extras ficam no grupo nulo; {grupo} é a coluna de agrupamento das despesas.
+_SQL_TOTAIS_PERIODO = _CTE_OCORRENCIAS + f"""
+    SELECT ano * 12 + mes - 1 AS periodo,
+           CASE WHEN tipo = '{TIPO_RECEITA_EXTRA}' THEN NULL ELSE {{grupo}} END AS grupo,
+           SUM(CASE WHEN tipo = '{TIPO_RECEITA_EXTRA}' THEN total_centavos ELSE 0 END) AS receitas_extras,
+           SUM(CASE WHEN tipo = '{TIPO_RECEITA_EXTRA}' THEN 0 ELSE total_centavos END) AS despesas
+    FROM (
+        SELECT ano, mes, categoria, tipo, total_centavos FROM resumo_mensal
+        WHERE (ano, mes) BETWEEN (:ano_inicio, :mes_inicio) AND (:ano_fim, :mes_fim)
+        UNION ALL
+        SELECT ano, mes, categoria, tipo, valor_centavos FROM ocorrencias
+    )
+    GROUP BY 1, 2
+"""
+
+# Agrupamentos aceitos por totais_periodo e a consulta de cada um
+SQL_TOTAIS_PERIODO = {
+    None: _SQL_TOTAIS_PERIODO.format(grupo="NULL"),
+    "categoria": _SQL_TOTAIS_PERIODO.format(grupo="categoria"),
+    "tipo": _SQL_TOTAIS_PERIODO.format(grupo="tipo"),
+}
+
+# Orçamentos de um mês, do mais consumido (gasto / limite) para o menos
+SQL_ORCAMENTOS_MES = """
+    SELECT categoria, mes, ano, limite_centavos / 100.0, gasto_centavos / 100.0 FROM orcamentos
+    WHERE ano = ? AND mes = ?
+    ORDER BY gasto_centavos * 1.0 / limite_centavos DESC, categoria
+"""
+
+# Entradas da projeção de fluxo de caixa (projetar_fluxo), em centavos: o que já está
+# gravado em cada mês do horizonte, as regras de recorrência que o alcançam e as exceções
+SQL_LANCAMENTOS_PROJECAO = f"""
+    SELECT ano * 12 + mes - 1 AS periodo,
+           SUM(CASE WHEN tipo = '{TIPO_RECEITA_EXTRA}' THEN total_centavos ELSE 0 END),
+           SUM(CASE WHEN tipo = '{TIPO_RECEITA_EXTRA}' THEN 0 ELSE total_centavos END)
+    FROM resumo_mensal
+    WHERE (ano, mes) BETWEEN (:ano_inicio, :mes_inicio) AND (:ano_fim, :mes_fim)
+    GROUP BY ano, mes
+"""
+
+SQL_RECORRENCIAS_PROJECAO = """
+    SELECT id, valor_centavos, periodo_inicio, COALESCE(meses, -1) FROM recorrencias
+    WHERE periodo_inicio <= :periodo_fim AND (meses IS NULL OR periodo_inicio + meses > :periodo_inicio)
+    ORDER BY id
+"""
+
+SQL_EXCECOES_PROJECAO = """
+    SELECT e.recorrencia_id, e.periodo,
+           CASE WHEN e.removida THEN 0 ELSE COALESCE(e.valor_centavos, r.valor_centavos) END
+    FROM recorrencias_excecoes e
+    JOIN recorrencias r ON r.id = e.recorrencia_id
+    WHERE e.periodo BETWEEN :periodo_inicio AND :periodo_fim
+"""
+
+# Busca textual: o índice FTS5 'busca_despesas' seleciona as linhas (rowid > 0: despesas,
+# rowid < 0: regras de recorrência), ordenadas por bm25 (descrição pesa o dobro da
+# categoria) e, em empate, das gravadas mais recentemente para as mais antigas.
+_COLUNAS_DESPESA_BUSCA = """
+        SELECT d.id, strftime('%d/%m/%Y', d.data_iso), d.tipo, d.categoria, d.descricao,
+               d.valor_centavos / 100.0, d.recorrencia_meses, d.data_iso, NULL, e.relevancia, e.chave
+        FROM encontrados e JOIN despesas d ON d.id = e.chave
+        WHERE e.chave > 0"""
+_COLUNAS_RECORRENCIA_BUSCA = """
+        SELECT NULL, printf('%02d/%02d/%04d', r.dia, r.periodo_inicio % 12 + 1, r.periodo_inicio / 12),
+               r.tipo, r.categoria, r.descricao, r.valor_centavos / 100.0, r.meses,
+               printf('%04d-%02d-%02d', r.periodo_inicio / 12, r.periodo_inicio % 12 + 1, r.dia),
+               r.id, e.relevancia, e.chave
+        FROM encontrados e JOIN recorrencias r ON r.id = -e.chave
+        WHERE e.chave < 0"""
+_ENCONTRADOS = """
+        SELECT rowid AS chave, bm25(busca_despesas, 2.0, 1.0) AS relevancia
+        FROM busca_despesas WHERE busca_despesas MATCH :consulta"""
+
+# Sem filtros: a página é ordenada e cortada dentro do índice e só as linhas dela são lidas
+SQL_BUSCA = f"""
+    WITH encontrados AS MATERIALIZED ({_ENCONTRADOS}
+        ORDER BY relevancia, chave DESC
+        LIMIT :limite OFFSET :deslocamento
+    )
+    {_COLUNAS_DESPESA_BUSCA}
+    UNION ALL
+    {_COLUNAS_RECORRENCIA_BUSCA}
+    ORDER BY 10, 11 DESC
+"""
+SQL_CONTAR_BUSCA = "SELECT count(*) FROM busca_despesas WHERE busca_despesas MATCH :consulta"
+
+# Com filtros (parâmetros nulos = sem filtro), aplicados às linhas encontradas.
+# Regras de recorrência entram se algum mês da série cai no intervalo de datas.
+_SQL_BUSCA_FILTRADA = f"""
+    WITH encontrados AS ({_ENCONTRADOS}),
+    resultados AS (
+        {_COLUNAS_DESPESA_BUSCA}
+          AND (:data_inicio IS NULL OR d.data_iso >= :data_inicio)
+          AND (:data_fim IS NULL OR d.data_iso <= :data_fim)
+          AND (:tipo IS NULL OR d.tipo = :tipo)
+          AND (:valor_min IS NULL OR d.valor_centavos >= :valor_min)
+          AND (:valor_max IS NULL OR d.valor_centavos <= :valor_max)
+        UNION ALL
+        {_COLUNAS_RECORRENCIA_BUSCA}
+          AND (:periodo_fim IS NULL OR r.periodo_inicio <= :periodo_fim)
+          AND (:periodo_inicio IS NULL OR r.meses IS NULL OR r.periodo_inicio + r.meses > :periodo_inicio)
+          AND (:tipo IS NULL OR r.tipo = :tipo)
+          AND (:valor_min IS NULL OR r.valor_centavos >= :valor_min)
+          AND (:valor_max IS NULL OR r.valor_centavos <= :valor_max)
+    )
+"""
+SQL_BUSCA_FILTRADA = _SQL_BUSCA_FILTRADA + """
+    SELECT * FROM resultados ORDER BY 10, 11 DESC LIMIT :limite OFFSET :deslocamento
+"""
+SQL_CONTAR_BUSCA_FILTRADA = _SQL_BUSCA_FILTRADA.replace(
+    "bm25(busca_despesas, 2.0, 1.0)", "NULL"
+) + "SELECT count(*) FROM resultados"
+
+# Resultados por página da busca textual
+POR_PAGINA_BUSCA = 50
+
+
+def _consulta_fts(texto: str) -> str:
+    """Converte o texto digitado numa consulta FTS5: cada palavra vira um prefixo entre
+    aspas ("farm"*), todas obrigatórias. Aspas e operadores digitados são tratados como
+    texto comum, então nenhuma entrada gera erro de sintaxe."""
+    palavras = [palavra.replace('"', '""') for palavra in texto.split()]
+    return " ".join(f'"{palavra}"*' for palavra in palavras if palavra.strip('"'))
+
+
+def _sql_pagina_despesas(mensal: bool, categoria: bool, tipo: bool, continuar: bool, decrescente: bool) -> str:
+    """Monta a consulta de uma página de paginar_despesas só com as condições em uso
+    (condições do tipo ':x IS NULL OR ...' impediriam o uso dos índices)."""
+    condicoes = []
+    if categoria:
+        condicoes.append("categoria = :categoria")
+    if tipo:
+        condicoes.append("tipo = :tipo")
+    if continuar:
+        # (data_iso, ordem) depois da chave anterior, escrito de forma que o SQLite percorra
+        # o índice de data_iso a partir dela
+        if decrescente:
+            condicoes.append("data_iso <= :apos_data AND (data_iso < :apos_data OR ordem < :apos_ordem)")
+        else:
+            condicoes.append("data_iso >= :apos_data AND (data_iso > :apos_data OR ordem > :apos_ordem)")
+    direcao = "DESC" if decrescente else "ASC"
+    return (
+        (_SQL_PAGINA_MES if mensal else _SQL_PAGINA_HISTORICO)
+        + (f"    WHERE {' AND '.join(condicoes)}\n" if condicoes else "")
+        + f"    ORDER BY data_iso {direcao}, ordem {direcao}\n    LIMIT :limite"
+    )
+
+
+def _token_continuacao(linha) -> str:
+    """Token opaco com a chave (data_iso, ordem) da última linha de uma página."""
+    return base64.urlsafe_b64encode(f"{linha[7]}|{linha[9]}".encode()).decode()
+
+
+def _ler_continuacao(token: str) -> tuple:
+    try:
+        data_iso, ordem = base64.urlsafe_b64decode(token.encode()).decode().split("|")
+        datetime.strptime(data_iso, "%Y-%m-%d")
+        return data_iso, int(ordem)
+    except (ValueError, AttributeError):
+        raise ValueError("Token de continuação inválido.")
+
+
+def _pandas():
+    """Importa o pandas na primeira consulta que devolve DataFrame."""
+    import pandas
+    return pandas
+
+
+def _periodo(mes: int, ano: int) -> int:
+    """Converte mês/ano no inteiro sequencial usado pelas recorrências."""
+    return ano * 12 + mes - 1
+
+
+def _em_cache(metodo):
+    """Guarda o resultado da consulta no cache do controller, por (método, argumentos).
+    O valor devolvido é compartilhado entre chamadas: quem o recebe não deve alterá-lo
+    (métodos que retornam DataFrame usam também _copia)."""
+    assinatura = inspect.signature(metodo)
+
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        # Normaliza argumentos posicionais e nomeados para a mesma chave
+        argumentos = assinatura.bind(self, *args, **kwargs)
+        argumentos.apply_defaults()
+        chave = (metodo.__name__,) + tuple(argumentos.arguments.values())[1:]
+        return self._cache.obter(chave, lambda: metodo(self, *args, **kwargs))
+    return envoltorio
+
+
+def _copia(metodo):
+    """Para métodos em cache que retornam DataFrame: cada chamada recebe uma cópia, que pode
+    alterar (novas colunas, sort_values(inplace=True)...) sem afetar o valor em cache."""
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        return metodo(self, *args, **kwargs).copy()
+    return envoltorio
+
+
+def _altera_dados(metodo):
+    """Marca um método de escrita: ao terminar, invalida o cache de consultas."""
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            self._cache.invalidar()
+    return envoltorio
+
+
+@instrumentacao.instrumentar
 class FinanceiroController:
     def __init__(self):
         self.db = Database()
+        self._cache = CacheVersionado(TAMANHO_CACHE)
+
+    def estatisticas_cache(self) -> dict:
+        """Retorna acertos, falhas, taxa de acerto, ocupação e versão dos dados do cache."""
+        return self._cache.estatisticas()
 
-    def adicionar_despesa(self, data: str, tipo: str, categoria: str, descricao: str, valor: float, recorrencia_meses: int = 0):
-        """Adiciona uma despesa. Aceita data em 'DD/MM/YYYY' ou 'MM/YY'. Se recorrência > 0, cria automaticamente para os próximos meses.
-        Armazena data no formato 'DD/MM/YYYY' para compatibilidade com o restante da aplicação."""
+    def limpar_cache(self):
+        """Descarta as consultas em cache e zera as estatísticas."""
+        self._cache.limpar()
+
+    def invalidar_cache(self):
+        """Torna obsoletas as consultas em cache (ex.: o banco foi alterado por outro processo)."""
+        self._cache.invalidar()
+
+    @_altera_dados
+    def adicionar_despesa(self, data: str, tipo: str, categoria: str, descricao: str, valor: float,
+                          recorrencia_meses: int = 0, sem_fim: bool = False):
+        """Adiciona uma despesa. Aceita data em 'DD/MM/YYYY' ou 'MM/YY'.
+        Despesas que se repetem (Fixa, recorrência > 1 ou sem_fim) viram uma única regra em
+        'recorrencias', expandida apenas quando um mês é consultado."""
         try:
+            sql, parametros = self._registro_despesa(data, tipo, categoria, descricao, valor, recorrencia_meses, sem_fim)
             conn = self.db.get_connection()
-            cursor = conn.cursor()
-
-            # Tentar interpretar data em vários formatos
-            parse_formats = ["%d/%m/%Y", "%m/%y", "%Y-%m-%d", "%d-%m-%Y"]
-            data_dt = None
-            for fmt in parse_formats:
-                try:
-                    data_dt = datetime.strptime(data, fmt)
-                    # Se veio apenas mês/ano (%m/%y), definir dia como 1
-                    if fmt == "%m/%y":
-                        data_dt = data_dt.replace(day=1)
-                    break
-                except Exception:
+            with conn:
+                conn.execute(sql, parametros)
+        except Exception as e:
+            print(f"Erro ao adicionar despesa: {e}")
+            raise e
+
+    @_altera_dados
+    def adicionar_despesas_lote(self, despesas: Iterable) -> int:
+        """Insere várias despesas numa única transação e retorna o número de registros gravados
+        (linhas avulsas mais regras de recorrência).
+        Cada item é um dict com as chaves de adicionar_despesa ou uma tupla na mesma ordem dos parâmetros.
+        O lote é consumido em blocos de TAMANHO_LOTE, sem materializar o iterável inteiro em memória."""
+        blocos = {SQL_INSERIR_DESPESA: [], SQL_INSERIR_RECORRENCIA: []}
+        total = 0
+
+        conn = self.db.get_connection()
+        with conn:
+            for despesa in despesas:
+                if isinstance(despesa, dict):
+                    sql, parametros = self._registro_despesa(**despesa)
+                else:
+                    sql, parametros = self._registro_despesa(*despesa)
+                bloco = blocos[sql]
+                bloco.append(parametros)
+                if len(bloco) >= TAMANHO_LOTE:
+                    total += conn.executemany(sql, bloco).rowcount
+                    bloco.clear()
+            for sql, bloco in blocos.items():
+                if bloco:
+                    total += conn.executemany(sql, bloco).rowcount
+        return total
+
+    @_altera_dados
+    def importar_extrato(self, caminho: str, categoria: str = "📦 Outros", formato: str = None,
+                         colunas: dict = None, despesas_positivas: bool = False) -> ResultadoImportacao:
+        """Importa os débitos de um extrato bancário (CSV ou OFX) como despesas variáveis.
+        O arquivo é lido sob demanda e gravado em blocos de TAMANHO_LOTE numa única transação.
+        Lançamentos já importados (mesmo hash) são ignorados pelo índice único, então
+        reimportar um extrato que se sobrepõe a outro não duplica nada. Créditos são
+        ignorados; em faturas de cartão, onde as compras vêm positivas, use despesas_positivas."""
+        inicio = time.perf_counter()
+        lidas = importadas = ignoradas = 0
+        bloco = []
+
+        conn = self.db.get_connection()
+        with conn:
+            for transacao in importacao.ler_extrato(caminho, formato, colunas):
+                lidas += 1
+                valor = transacao.valor if despesas_positivas else -transacao.valor
+                if valor <= 0:
+                    ignoradas += 1
                     continue
+                bloco.append((
+                    transacao.data.isoformat(), "Variável", categoria, transacao.descricao,
+                    centavos(valor), 0, transacao.hash_conteudo
+                ))
+                if len(bloco) >= TAMANHO_LOTE:
+                    importadas += conn.executemany(SQL_IMPORTAR_DESPESA, bloco).rowcount
+                    bloco.clear()
+            if bloco:
+                importadas += conn.executemany(SQL_IMPORTAR_DESPESA, bloco).rowcount
 
-            if data_dt is None:
-                raise ValueError("Formato de data inválido. Use DD/MM/YYYY ou MM/YY.")
+        resultado = ResultadoImportacao(
+            lidas=lidas,
+            importadas=importadas,
+            duplicadas=lidas - ignoradas - importadas,
+            ignoradas=ignoradas,
+            segundos=time.perf_counter() - inicio,
+        )
+        print(
+            f"Extrato importado: {resultado.importadas} novas, {resultado.duplicadas} duplicadas, "
+            f"{resultado.ignoradas} créditos ignorados ({resultado.por_segundo:,.0f} transações/s)"
+        )
+        return resultado
 
-            # Determinar quantas vezes repetir
-            if tipo == "Fixa":
-                repeticoes = 12  # Fixas se repetem por 1 ano
-            elif recorrencia_meses and recorrencia_meses > 0:
-                repeticoes = recorrencia_meses
-            else:
-                repeticoes = 1  # Apenas uma vez (Variável sem recorrência)
+    def _registro_despesa(self, data: str, tipo: str, categoria: str, descricao: str, valor: float,
+                          recorrencia_meses: int = 0, sem_fim: bool = False):
+        """Retorna (sql, parâmetros) do INSERT da despesa: uma linha avulsa ou uma regra de recorrência."""
+        data_dt = self._interpretar_data(data)
 
-            # Inserir a despesa original e as recorrentes (armazena como DD/MM/YYYY)
-            for i in range(repeticoes):
-                data_futura = data_dt + relativedelta(months=i)
-                data_str = data_futura.strftime("%d/%m/%Y")
+        # Determinar quantas vezes repetir (None = sem fim)
+        if sem_fim:
+            meses = None
+        elif tipo == "Fixa":
+            meses = 12  # Fixas se repetem por 1 ano
+        elif recorrencia_meses and recorrencia_meses > 0:
+            meses = recorrencia_meses
+        else:
+            meses = 1  # Apenas uma vez (Variável sem recorrência)
 
-                cursor.execute(
-                    "INSERT INTO despesas (data, tipo, categoria, descricao, valor, recorrencia_meses) VALUES (?, ?, ?, ?, ?, ?)",
-                    (data_str, tipo, categoria, descricao, valor, recorrencia_meses)
-                )
+        if meses == 1:
+            return SQL_INSERIR_DESPESA, (
+                data_dt.strftime("%Y-%m-%d"), tipo, categoria, descricao, centavos(valor), recorrencia_meses
+            )
+        return SQL_INSERIR_RECORRENCIA, (
+            tipo, categoria, descricao, centavos(valor), data_dt.day, _periodo(data_dt.month, data_dt.year), meses
+        )
 
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"Erro ao adicionar despesa: {e}")
-            raise e
+    @staticmethod
+    def _interpretar_data(data: str) -> datetime:
+        """Interpreta a data em vários formatos. 'MM/YY' vira o dia 1 do mês."""
+        for fmt in FORMATOS_DATA:
+            try:
+                return datetime.strptime(data, fmt)
+            except ValueError:
+                continue
+        raise ValueError("Formato de data inválido. Use DD/MM/YYYY ou MM/YY.")
 
-    def excluir_despesa(self, despesa_id: int):
+    @_altera_dados
+    def excluir_despesa(self, despesa_id: int) -> bool:
+        """Exclui a despesa. Retorna False se não havia despesa com esse id."""
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM despesas WHERE id = ?", (despesa_id,))
-        conn.commit()
-        conn.close()
-
-    def buscar_despesas_mes(self, mes: int, ano: int) -> pd.DataFrame:
-        """Retorna DataFrame com despesas do mês/ano selecionado."""
-        conn = self.db.get_connection()
-        # Formato da data no banco é YYYY-MM-DD ou DD/MM/YYYY. 
-        # Aqui assumimos input padronizado. Filtramos via SQL é mais eficiente.
-        # SQLite não tem tipo DATE nativo forte, faremos filtro no Pandas para flexibilidade
-        # ou construímos a query com LIKE. Pela robustez, vamos trazer tudo e filtrar no pandas (escala pequena)
-        # ou usar strftime do sqlite.
-        
-        query = "SELECT * FROM despesas"
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        with conn:
+            return conn.execute("DELETE FROM despesas WHERE id = ?", (despesa_id,)).rowcount > 0
+
+    @_altera_dados
+    def excluir_recorrencia(self, recorrencia_id: int) -> bool:
+        """Remove a série inteira (regra e exceções). Retorna False se a série não existia."""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("DELETE FROM recorrencias_excecoes WHERE recorrencia_id = ?", (recorrencia_id,))
+            return conn.execute("DELETE FROM recorrencias WHERE id = ?", (recorrencia_id,)).rowcount > 0
+
+    @_altera_dados
+    def encerrar_recorrencia(self, recorrencia_id: int, mes: int, ano: int):
+        """Encerra a série a partir de mês/ano (inclusive), preservando os meses anteriores.
+        Se o mês for o primeiro da série, ela é removida por completo; se for posterior ao
+        fim de uma série com duração definida, nada muda."""
+        conn = self.db.get_connection()
+        resultado = conn.execute(
+            "SELECT periodo_inicio, meses FROM recorrencias WHERE id = ?", (recorrencia_id,)
+        ).fetchone()
+        if resultado is None:
+            return
+        periodo_inicio, meses_atuais = resultado
+        meses = _periodo(mes, ano) - periodo_inicio
+        if meses_atuais is not None and meses >= meses_atuais:
+            return
+        if meses <= 0:
+            self.excluir_recorrencia(recorrencia_id)
+            return
+        with conn:
+            conn.execute("UPDATE recorrencias SET meses = ? WHERE id = ?", (meses, recorrencia_id))
+            conn.execute(
+                "DELETE FROM recorrencias_excecoes WHERE recorrencia_id = ? AND periodo >= ?",
+                (recorrencia_id, _periodo(mes, ano))
+            )
+
+    @_altera_dados
+    def editar_recorrencia(self, recorrencia_id: int, categoria: str = None, descricao: str = None, valor: float = None):
+        """Altera a série inteira de uma vez (apenas os campos informados)."""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute(
+                """UPDATE recorrencias
+                   SET categoria = COALESCE(?, categoria),
+                       descricao = COALESCE(?, descricao),
+                       valor_centavos = COALESCE(?, valor_centavos)
+                   WHERE id = ?""",
+                (categoria, descricao, centavos(valor) if valor is not None else None, recorrencia_id)
+            )
+
+    @_altera_dados
+    def excluir_ocorrencia(self, recorrencia_id: int, mes: int, ano: int):
+        """Remove apenas a ocorrência de mês/ano de uma série."""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute(
+                """INSERT INTO recorrencias_excecoes (recorrencia_id, periodo, removida) VALUES (?, ?, 1)
+                   ON CONFLICT (recorrencia_id, periodo) DO UPDATE SET removida = 1""",
+                (recorrencia_id, _periodo(mes, ano))
+            )
+
+    @_altera_dados
+    def alterar_ocorrencia(self, recorrencia_id: int, mes: int, ano: int, valor: float):
+        """Define um valor diferente para a ocorrência de mês/ano de uma série."""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute(
+                """INSERT INTO recorrencias_excecoes (recorrencia_id, periodo, valor_centavos) VALUES (?, ?, ?)
+                   ON CONFLICT (recorrencia_id, periodo)
+                   DO UPDATE SET valor_centavos = excluded.valor_centavos, removida = 0""",
+                (recorrencia_id, _periodo(mes, ano), centavos(valor))
+            )
+
+    @_copia
+    @_em_cache
+    def buscar_despesas_mes(self, mes: int, ano: int) -> "pd.DataFrame":
+        """Retorna DataFrame com despesas do mês/ano selecionado, ordenadas por data.
+        Ocorrências de recorrências vêm com 'id' nulo e 'recorrencia_id' preenchido."""
+        return self._buscar_despesas_periodo(_periodo(mes, ano), _periodo(mes, ano))
+
+    def _buscar_despesas_periodo(self, periodo_inicio: int, periodo_fim: int) -> "pd.DataFrame":
+        """Despesas (avulsas e recorrentes) entre dois períodos, inclusive."""
+        conn = self.db.get_connection()
+        # O filtro das linhas avulsas é um intervalo sobre 'data_iso' (YYYY-MM-DD), atendido
+        # pelo índice idx_despesas_data_iso: só as linhas do período são lidas do banco.
+        pd = _pandas()
+        df = pd.read_sql_query(
+            SQL_DESPESAS_PERIODO, conn, params=self._parametros_periodo(periodo_inicio, periodo_fim),
+            dtype={'id': 'Int64', 'recorrencia_id': 'Int64'}
+        )
 
         if df.empty:
             return df
 
-        # Conversão segura de datas
-        df['data_dt'] = pd.to_datetime(df['data'], format='%d/%m/%Y', errors='coerce')
-        df = df[
-            (df['data_dt'].dt.month == mes) & 
-            (df['data_dt'].dt.year == ano)
-        ]
-        return df.sort_values(by='data_dt')
+        df['data_dt'] = pd.to_datetime(df['data_iso'], format='%Y-%m-%d')
+        return df
 
+    @_em_cache
     def get_configuracoes(self):
         """Retorna (salario_1, salario_2)"""
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT salario_1, salario_2 FROM configuracoes WHERE id = 1")
+        cursor.execute(SQL_SALARIOS)
         resultado = cursor.fetchone()
-        conn.close()
         return resultado if resultado else (0.0, 0.0)
 
+    @_altera_dados
     def salvar_configuracoes(self, sal1: float, sal2: float):
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE configuracoes SET salario_1 = ?, salario_2 = ? WHERE id = 1", (sal1, sal2))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute(
+                "UPDATE configuracoes SET salario_1_centavos = ?, salario_2_centavos = ? WHERE id = 1",
+                (centavos(sal1), centavos(sal2))
+            )
     
+    @_altera_dados
     def adicionar_receita_extra(self, mes: int, ano: int, descricao: str, valor: float):
         """Adiciona uma receita extra para um mês/ano específico"""
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR REPLACE INTO receitas_extras (mes, ano, descricao, valor) VALUES (?, ?, ?, ?)",
-            (mes, ano, descricao, valor)
-        )
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute(
+                """INSERT INTO receitas_extras (mes, ano, descricao, valor_centavos) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (mes, ano, descricao) DO UPDATE SET valor_centavos = excluded.valor_centavos""",
+                (mes, ano, descricao, centavos(valor))
+            )
     
+    @_em_cache
     def buscar_receitas_extras_mes(self, mes: int, ano: int):
         """Busca receitas extras de um mês/ano"""
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM receitas_extras WHERE mes = ? AND ano = ?", (mes, ano))
+        cursor.execute(
+            "SELECT id, mes, ano, descricao, valor_centavos / 100.0 FROM receitas_extras WHERE mes = ? AND ano = ?",
+            (mes, ano)
+        )
         resultado = cursor.fetchall()
-        conn.close()
         return resultado
     
+    @_altera_dados
     def adicionar_categoria(self, nome: str, icone: str):
         """Adiciona uma nova categoria personalizada."""
         try:
             conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO categorias (nome, icone) VALUES (?, ?)", (nome, icone))
-            conn.commit()
-            conn.close()
+            with conn:
+                conn.execute("INSERT INTO categorias (nome, icone) VALUES (?, ?)", (nome, icone))
         except sqlite3.IntegrityError:
             raise Exception("Categoria já existe!")
         except Exception as e:
             raise e
     
+    @_em_cache
     def buscar_categorias(self):
-        """Retorna todas as categorias com seus ícones."""
+        """Retorna todas as categorias (nome, icone), em ordem de nome."""
         conn = self.db.get_connection()
-        query = "SELECT nome, icone FROM categorias ORDER BY nome"
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        return [Categoria._make(linha) for linha in conn.execute("SELECT nome, icone FROM categorias ORDER BY nome")]
     
+    @_altera_dados
     def excluir_categoria(self, nome: str):
-        """Exclui uma categoria personalizada."""
+        """Exclui uma categoria personalizada (e os orçamentos dela)."""
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM categorias WHERE nome = ?", (nome,))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute(
+                "DELETE FROM orcamentos WHERE categoria IN (SELECT icone || ' ' || nome FROM categorias WHERE nome = ?)",
+                (nome,)
+            )
+            conn.execute("DELETE FROM categorias WHERE nome = ?", (nome,))
+
+    @_altera_dados
+    def definir_orcamento(self, categoria: str, mes: int, ano: int, limite: float, meses: int = 1):
+        """Define o limite de gasto de 'categoria' (como em despesas, ex.: '🏠 Casa') em
+        mes/ano e nos meses - 1 meses seguintes. O gasto já lançado é calculado agora; daí
+        em diante, gatilhos o atualizam a cada despesa gravada ou excluída."""
+        if limite is None or limite <= 0:
+            raise ValueError("O limite do orçamento deve ser positivo.")
+        if meses < 1:
+            raise ValueError("Informe ao menos um mês.")
+        inicio = _periodo(mes, ano)
+        conn = self.db.get_connection()
+        with conn:
+            conn.executemany(
+                """INSERT INTO orcamentos (ano, mes, categoria, limite_centavos) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (ano, mes, categoria) DO UPDATE SET limite_centavos = excluded.limite_centavos""",
+                [(periodo // 12, periodo % 12 + 1, categoria, centavos(limite)) for periodo in range(inicio, inicio + meses)]
+            )
+            conn.execute(
+                SQL_GASTO_ORCAMENTOS + " WHERE categoria = ? AND ano * 12 + mes - 1 BETWEEN ? AND ?",
+                (categoria, inicio, inicio + meses - 1)
+            )
+
+    @_altera_dados
+    def excluir_orcamento(self, categoria: str, mes: int, ano: int, meses: int = 1):
+        """Remove o orçamento de 'categoria' em mes/ano e nos meses - 1 meses seguintes."""
+        inicio = _periodo(mes, ano)
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM orcamentos WHERE categoria = ? AND ano * 12 + mes - 1 BETWEEN ? AND ?",
+                (categoria, inicio, inicio + meses - 1)
+            )
+
+    @_em_cache
+    def buscar_orcamentos(self, mes: int, ano: int) -> list:
+        """Orçamentos do mês (Orcamento, com gasto e nível de alerta), do mais consumido para o menos."""
+        conn = self.db.get_connection()
+        return [Orcamento._make(linha) for linha in conn.execute(SQL_ORCAMENTOS_MES, (ano, mes))]
     
-    def excluir_receita_extra(self, receita_id: int):
+    @_altera_dados
+    def excluir_receita_extra(self, receita_id: int) -> bool:
+        """Exclui a receita extra. Retorna False se não havia receita com esse id."""
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM receitas_extras WHERE id = ?", (receita_id,))
-        conn.commit()
-        conn.close()
+        with conn:
+            return conn.execute("DELETE FROM receitas_extras WHERE id = ?", (receita_id,)).rowcount > 0
     
+    @_em_cache
     def calcular_totais_mes(self, mes: int, ano: int):
         """Retorna (receita_total, despesas_total, saldo)"""
-        salarios = self.get_configuracoes()
-        receita_total = sum(salarios)
-        
-        # Adicionar receitas extras do mês
-        receitas_extras = self.buscar_receitas_extras_mes(mes, ano)
-        total_extras = sum([r[4] for r in receitas_extras])  # r[4] é o valor
-        receita_total += total_extras
-        
-        df = self.buscar_despesas_mes(mes, ano)
-        despesas_total = df['valor'].sum() if not df.empty else 0.0
-        
-        saldo = receita_total - despesas_total
-        
-        return (receita_total, despesas_total, saldo)
+        # Receitas extras e despesas gravadas vêm prontas de 'resumo_mensal';
+        # só as ocorrências de recorrências do mês são somadas na consulta.
+        conn = self.db.get_connection()
+        receita, despesas = conn.execute(SQL_TOTAIS_MES, self._parametros_mes(mes, ano)).fetchone()
+        return (receita / 100, despesas / 100, (receita - despesas) / 100)
+
+    @_copia
+    @_em_cache
+    def buscar_totais_categoria(self, mes: int, ano: int) -> "pd.DataFrame":
+        """Retorna DataFrame (categoria, tipo, total, quantidade) com as despesas do mês agregadas."""
+        conn = self.db.get_connection()
+        return _pandas().read_sql_query(SQL_TOTAIS_CATEGORIA_MES, conn, params=self._parametros_mes(mes, ano))
+
+    @_em_cache
+    def snapshot_mes(self, mes: int, ano: int) -> SnapshotMes:
+        """Retorna a fotografia imutável do mês (salários, receitas extras, totais, totais por
+        categoria, orçamentos e a primeira página das despesas de cada tipo), lida numa única
+        transação de leitura. Os totais vêm da consulta agrupada de totais_periodo, sem ler
+        as linhas; o restante das listas é carregado com paginar_despesas a partir dos tokens
+        continuacao_fixas e continuacao_variaveis."""
+        periodo = _periodo(mes, ano)
+        with self.db.transacao_leitura() as conn:
+            salarios = conn.execute(SQL_SALARIOS).fetchone() or (0.0, 0.0)
+            receitas_extras = tuple(ReceitaExtra._make(linha) for linha in conn.execute(
+                "SELECT id, descricao, valor_centavos / 100.0 FROM receitas_extras WHERE mes = ? AND ano = ? ORDER BY id",
+                (mes, ano)
+            ))
+            total_mes, = self._totais_periodo(conn, periodo, periodo, "categoria")
+            fixas = self._paginar_despesas(conn, tipo="Fixa", mes=mes, ano=ano)
+            variaveis = self._paginar_despesas(conn, tipo="Variável", mes=mes, ano=ano)
+            orcamentos = tuple(Orcamento._make(linha) for linha in conn.execute(SQL_ORCAMENTOS_MES, (ano, mes)))
+
+        return SnapshotMes(
+            mes=mes,
+            ano=ano,
+            salarios=tuple(salarios),
+            receitas_extras=receitas_extras,
+            receita_total=total_mes.receita,
+            despesas_total=total_mes.despesas,
+            saldo=total_mes.saldo,
+            despesas_fixas=fixas.despesas,
+            despesas_variaveis=variaveis.despesas,
+            por_categoria=tuple(TotalCategoria(grupo.grupo, grupo.total) for grupo in total_mes.grupos),
+            continuacao_fixas=fixas.continuacao,
+            continuacao_variaveis=variaveis.continuacao,
+            orcamentos=orcamentos,
+        )
+
+    @_em_cache
+    def paginar_despesas(self, continuacao: str = None, tamanho: int = TAMANHO_PAGINA, mes: int = None,
+                         ano: int = None, categoria: str = None, tipo: str = None,
+                         decrescente: bool = False) -> PaginaDespesas:
+        """Lista as despesas em páginas de até 'tamanho' linhas, em ordem de data e id
+        (decrescente=True inverte). 'continuacao' é o token devolvido pela página anterior
+        (None busca a primeira); cada página parte da chave da última linha lida, então
+        inserções e exclusões entre uma página e outra não repetem nem pulam linhas.
+        Com mes e ano, lista só aquele mês, ocorrências das recorrências incluídas; sem
+        eles, percorre o histórico inteiro de despesas gravadas. Filtros opcionais:
+        categoria e tipo ('Fixa'/'Variável'), que devem ser os mesmos em todas as páginas."""
+        with self.db.transacao_leitura() as conn:
+            return self._paginar_despesas(conn, continuacao, tamanho, mes, ano, categoria, tipo, decrescente)
+
+    def _paginar_despesas(self, conn, continuacao: str = None, tamanho: int = TAMANHO_PAGINA, mes: int = None,
+                          ano: int = None, categoria: str = None, tipo: str = None,
+                          decrescente: bool = False) -> PaginaDespesas:
+        if tamanho < 1:
+            raise ValueError("O tamanho da página deve ser positivo.")
+        if (mes is None) != (ano is None):
+            raise ValueError("Informe mês e ano juntos.")
+
+        mensal = mes is not None
+        parametros = self._parametros_periodo(_periodo(mes, ano), _periodo(mes, ano)) if mensal else {}
+        parametros.update({"categoria": categoria, "tipo": tipo, "limite": tamanho + 1})
+        if continuacao is not None:
+            parametros["apos_data"], parametros["apos_ordem"] = _ler_continuacao(continuacao)
+
+        sql = _sql_pagina_despesas(mensal, categoria is not None, tipo is not None, continuacao is not None, decrescente)
+        linhas = conn.execute(sql, parametros).fetchall()
+        # Uma linha além do tamanho indica que há próxima página
+        proxima = _token_continuacao(linhas[tamanho - 1]) if len(linhas) > tamanho else None
+        return PaginaDespesas(
+            despesas=tuple(Despesa._make(linha[:9]) for linha in linhas[:tamanho]),
+            continuacao=proxima,
+        )
+
+    @_em_cache
+    def totais_periodo(self, inicio: tuple, fim: tuple, agrupar_por: str = None) -> list:
+        """Receita, despesas e saldo de cada mês entre 'inicio' e 'fim', dados como
+        (mes, ano), inclusive. Com agrupar_por='categoria' ou 'tipo', cada mês traz
+        também as despesas por grupo. Retorna uma lista de TotalMes, um por mês do
+        intervalo (meses sem lançamentos vêm zerados), lida numa só consulta agrupada."""
+        with self.db.transacao_leitura() as conn:
+            return self._totais_periodo(conn, _periodo(*inicio), _periodo(*fim), agrupar_por)
+
+    def _totais_periodo(self, conn, periodo_inicio: int, periodo_fim: int, agrupar_por: str = None) -> list:
+        if agrupar_por not in SQL_TOTAIS_PERIODO:
+            raise ValueError(f"Agrupamento inválido: {agrupar_por}. Use 'categoria' ou 'tipo'.")
+        if periodo_fim < periodo_inicio:
+            raise ValueError("O mês final deve ser igual ou posterior ao inicial.")
+
+        salarios = conn.execute(
+            "SELECT salario_1_centavos + salario_2_centavos FROM configuracoes WHERE id = 1"
+        ).fetchone()
+        salarios = salarios[0] if salarios else 0
+        parametros = self._parametros_periodo(periodo_inicio, periodo_fim)
+        parametros.update({
+            "ano_inicio": periodo_inicio // 12, "mes_inicio": periodo_inicio % 12 + 1,
+            "ano_fim": periodo_fim // 12, "mes_fim": periodo_fim % 12 + 1,
+        })
+
+        # Tudo em centavos até a montagem do resultado
+        extras, despesas, grupos = {}, {}, {}
+        for periodo, grupo, receitas_extras, total in conn.execute(SQL_TOTAIS_PERIODO[agrupar_por], parametros):
+            extras[periodo] = extras.get(periodo, 0) + receitas_extras
+            despesas[periodo] = despesas.get(periodo, 0) + total
+            if agrupar_por is not None and grupo is not None:
+                grupos.setdefault(periodo, []).append(TotalGrupo(grupo, total / 100))
+
+        totais = []
+        for periodo in range(periodo_inicio, periodo_fim + 1):
+            receita = salarios + extras.get(periodo, 0)
+            despesas_mes = despesas.get(periodo, 0)
+            totais.append(TotalMes(
+                mes=periodo % 12 + 1,
+                ano=periodo // 12,
+                receita=receita / 100,
+                despesas=despesas_mes / 100,
+                saldo=(receita - despesas_mes) / 100,
+                grupos=tuple(sorted(grupos.get(periodo, ()), key=lambda item: item.total, reverse=True)),
+            ))
+        return totais
+
+    @_copia
+    @_em_cache
+    def projetar_fluxo(self, inicio: tuple, meses: int = 12, saldo_inicial: float = 0.0) -> "pd.DataFrame":
+        """Projeta o fluxo de caixa dos 'meses' meses (até 120) a partir de 'inicio', dado
+        como (mes, ano): receita (salários atuais mais receitas extras lançadas), despesas
+        recorrentes e já lançadas, saldo do mês e saldo acumulado a partir de 'saldo_inicial'.
+        As entradas são lidas numa transação, uma consulta por tabela, e a projeção é
+        calculada de uma vez com NumPy (src.projecao). Retorna um DataFrame, um mês por linha."""
+        from src import projecao
+
+        if not 1 <= meses <= projecao.MAX_MESES_PROJECAO:
+            raise ValueError(f"A projeção deve ter de 1 a {projecao.MAX_MESES_PROJECAO} meses.")
+        periodo_inicio = _periodo(*inicio)
+        periodo_fim = periodo_inicio + meses - 1
+        parametros = {
+            "periodo_inicio": periodo_inicio, "periodo_fim": periodo_fim,
+            "ano_inicio": periodo_inicio // 12, "mes_inicio": periodo_inicio % 12 + 1,
+            "ano_fim": periodo_fim // 12, "mes_fim": periodo_fim % 12 + 1,
+        }
+        with self.db.transacao_leitura() as conn:
+            salarios = conn.execute(
+                "SELECT salario_1_centavos + salario_2_centavos FROM configuracoes WHERE id = 1"
+            ).fetchone()
+            lancamentos = conn.execute(SQL_LANCAMENTOS_PROJECAO, parametros).fetchall()
+            recorrencias = conn.execute(SQL_RECORRENCIAS_PROJECAO, parametros).fetchall()
+            excecoes = conn.execute(SQL_EXCECOES_PROJECAO, parametros).fetchall()
+
+        return projecao.projetar(
+            periodo_inicio, meses, salarios[0] if salarios else 0, lancamentos, recorrencias, excecoes,
+            saldo_inicial=centavos(saldo_inicial),
+        )
+
+    @_em_cache
+    def buscar(self, texto: str, pagina: int = 1, por_pagina: int = POR_PAGINA_BUSCA, data_inicio: str = None,
+               data_fim: str = None, tipo: str = None, valor_min: float = None, valor_max: float = None) -> ResultadoBusca:
+        """Busca no histórico inteiro pelas palavras de 'texto' na descrição ou categoria
+        (prefixos, sem diferenciar acentos e maiúsculas), ordenando por relevância.
+        Filtros opcionais: intervalo de datas (inclusive, nos formatos de adicionar_despesa),
+        tipo ('Fixa'/'Variável') e faixa de valor em reais. Retorna uma página de resultados."""
+        consulta = _consulta_fts(texto or "")
+        if not consulta:
+            return ResultadoBusca(despesas=(), total=0, pagina=1, por_pagina=por_pagina)
+        if pagina < 1 or por_pagina < 1:
+            raise ValueError("Página e tamanho da página devem ser positivos.")
+
+        inicio = self._interpretar_data(data_inicio) if data_inicio else None
+        fim = self._interpretar_data(data_fim) if data_fim else None
+        parametros = {
+            "consulta": consulta,
+            "data_inicio": inicio.strftime("%Y-%m-%d") if inicio else None,
+            "data_fim": fim.strftime("%Y-%m-%d") if fim else None,
+            "periodo_inicio": _periodo(inicio.month, inicio.year) if inicio else None,
+            "periodo_fim": _periodo(fim.month, fim.year) if fim else None,
+            "tipo": tipo,
+            "valor_min": centavos(valor_min) if valor_min is not None else None,
+            "valor_max": centavos(valor_max) if valor_max is not None else None,
+            "limite": por_pagina,
+            "deslocamento": (pagina - 1) * por_pagina,
+        }
+        filtrada = any(parametros[chave] is not None for chave in ("data_inicio", "data_fim", "tipo", "valor_min", "valor_max"))
+        with self.db.transacao_leitura() as conn:
+            if filtrada:
+                linhas = conn.execute(SQL_BUSCA_FILTRADA, parametros).fetchall()
+                total = conn.execute(SQL_CONTAR_BUSCA_FILTRADA, parametros).fetchone()[0]
+            else:
+                linhas = conn.execute(SQL_BUSCA, parametros).fetchall()
+                total = conn.execute(SQL_CONTAR_BUSCA, parametros).fetchone()[0]
+        return ResultadoBusca(
+            despesas=tuple(Despesa._make(linha[:9]) for linha in linhas),
+            total=total,
+            pagina=pagina,
+            por_pagina=por_pagina,
+        )
+
+    @_altera_dados
+    def reconstruir_resumo_mensal(self) -> list:
+        """Recalcula a tabela 'resumo_mensal' do zero e retorna as divergências encontradas."""
+        return self.db.reconstruir_resumo_mensal()
+
+    @staticmethod
+    def _parametros_periodo(periodo_inicio: int, periodo_fim: int) -> dict:
+        """Parâmetros de SQL_DESPESAS_PERIODO para um intervalo de períodos, inclusive."""
+        ano_ini, mes_ini = divmod(periodo_inicio, 12)
+        ano_fim, mes_fim = divmod(periodo_fim + 1, 12)
+        return {
+            "periodo_inicio": periodo_inicio,
+            "periodo_fim": periodo_fim,
+            "data_inicio": date(ano_ini, mes_ini + 1, 1).isoformat(),
+            "data_fim": date(ano_fim, mes_fim + 1, 1).isoformat(),
+        }
+
+    @staticmethod
+    def _parametros_mes(mes: int, ano: int) -> dict:
+        periodo = _periodo(mes, ano)
+        return {"periodo_inicio": periodo, "periodo_fim": periodo, "mes": mes, "ano": ano}
+
+    def exportar_backup(self, pasta: str, formato: str = "csv") -> dict:
+        """Exporta todas as tabelas para 'pasta' em CSV ou Parquet (um arquivo por tabela),
+        lidas numa única transação. Retorna {tabela: linhas exportadas}."""
+        with self.db.transacao_leitura() as conn:
+            return backup.exportar(conn, pasta, formato)
+
+    def conferir_backup(self, pasta: str, formato: str = "csv") -> dict:
+        """Compara valor a valor o backup em 'pasta' com o banco, numa única transação.
+        Retorna {tabela: (linhas só no banco, linhas só no arquivo)}; {} se forem iguais."""
+        with self.db.transacao_leitura() as conn:
+            return backup.conferir(conn, pasta, formato)
+
+    @_altera_dados
+    def importar_backup(self, pasta: str, formato: str = "csv") -> dict:
+        """Recarrega um backup de exportar_backup, substituindo as tabelas presentes em
+        'pasta', numa única transação. Retorna {tabela: linhas importadas}."""
+        with self.db.carga_em_lote() as conn:
+            return backup.importar(conn, pasta, formato)
 
     def exportar_relatorio(self, mes: int, ano: int, caminho_arquivo: str):
         """Gera Excel estilizado e profissional."""
-        df = self.buscar_despesas_mes(mes, ano)
-        salarios = self.get_configuracoes()
-        receita_total = sum(salarios)
-        total_despesas = df['valor'].sum() if not df.empty else 0.0
-        saldo = receita_total - total_despesas
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"{mes:02d}-{ano}"
-
-        # Cabeçalhos
-        headers = ["ID", "Data", "Tipo", "Categoria", "Descrição", "Valor (R$)"]
-        ws.append(headers)
-
-        # Estilo Cabeçalho
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-        
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center")
-
-        # Dados
-        for _, row in df.iterrows():
-            ws.append([row['id'], row['data'], row['tipo'], row['categoria'], row['descricao'], row['valor']])
-
-        # Formatação Monetária e Auto-fit
-        for row in ws.iter_rows(min_row=2, max_col=6):
-            # Coluna de valor é a 6 agora
-            row[5].number_format = 'R$ #,##0.00'
-
-        # Resumo no final
-        last_row = ws.max_row + 2
-        ws.cell(row=last_row, column=5, value="RECEITA TOTAL:").font = Font(bold=True)
-        ws.cell(row=last_row, column=6, value=receita_total).number_format = 'R$ #,##0.00'
-        
-        ws.cell(row=last_row+1, column=5, value="TOTAL DESPESAS:").font = Font(bold=True, color="FF0000")
-        ws.cell(row=last_row+1, column=6, value=total_despesas).number_format = 'R$ #,##0.00'
-
-        ws.cell(row=last_row+2, column=5, value="SALDO FINAL:").font = Font(bold=True)
-        saldo_cell = ws.cell(row=last_row+2, column=6, value=saldo)
-        saldo_cell.number_format = 'R$ #,##0.00'
-        
-        # Cor condicional no Excel
-        if saldo >= 0:
-            saldo_cell.font = Font(color="006100", bold=True) # Verde
-        else:
-            saldo_cell.font = Font(color="9C0006", bold=True) # Vermelho
+        self.exportar_periodo(mes, ano, mes, ano, caminho_arquivo)
+
+    def exportar_ano(self, ano: int, caminho_arquivo: str):
+        """Gera o Excel do ano inteiro: uma planilha por mês mais a planilha de resumo."""
+        self.exportar_periodo(1, ano, 12, ano, caminho_arquivo)
+
+    def exportar_periodo(self, mes_inicio: int, ano_inicio: int, mes_fim: int, ano_fim: int, caminho_arquivo: str):
+        """Gera o Excel de um intervalo de meses (inclusive), com uma planilha por mês e,
+        se houver mais de um mês, as planilhas 'Resumo' e 'Categorias' no início.
+
+        O arquivo é escrito em modo write-only: as linhas vão direto para o disco, numa
+        única passada sobre as despesas do intervalo (lidas numa só transação). Só as
+        linhas do mês sendo escrito ficam em memória, para o cálculo das larguras."""
+        periodo_inicio, periodo_fim = _periodo(mes_inicio, ano_inicio), _periodo(mes_fim, ano_fim)
+        if periodo_fim < periodo_inicio:
+            raise ValueError("O mês final deve ser igual ou posterior ao inicial.")
+
+        from src import relatorio_excel
+
+        wb = relatorio_excel.novo_workbook()
+        varios_meses = periodo_fim > periodo_inicio
+        ws_resumo = wb.create_sheet("Resumo") if varios_meses else None
+        ws_categorias = wb.create_sheet("Categorias") if varios_meses else None
+
+        with self.db.transacao_leitura() as conn:
+            # Totais de cada mês (e por categoria) vêm da consulta agrupada de totais_periodo
+            totais = self._totais_periodo(conn, periodo_inicio, periodo_fim, "categoria")
+            linhas = conn.execute(SQL_DESPESAS_PERIODO, self._parametros_periodo(periodo_inicio, periodo_fim))
+
+            # As linhas vêm ordenadas por data_iso: agrupar por 'YYYY-MM' separa os meses
+            meses = groupby(linhas, key=lambda linha: linha[7][:7])
+            grupo = next(meses, None)
+            for total_mes in totais:
+                despesas = []
+                if grupo is not None and grupo[0] == f"{total_mes.ano:04d}-{total_mes.mes:02d}":
+                    despesas = [linha[:6] for linha in grupo[1]]
+                    grupo = next(meses, None)
+
+                relatorio_excel.escrever_planilha_mes(
+                    wb, f"{total_mes.mes:02d}-{total_mes.ano}", despesas, total_mes.receita, total_mes.despesas
+                )
 
-        # Ajuste de largura das colunas
-        for column_cells in ws.columns:
-            length = max(len(str(cell.value)) for cell in column_cells)
-            ws.column_dimensions[column_cells[0].column_letter].width = length + 2
+        if varios_meses:
+            relatorio_excel.escrever_planilha_resumo(ws_resumo, [
+                (f"{t.mes:02d}/{t.ano}", t.receita, t.despesas, t.saldo) for t in totais
+            ])
+            relatorio_excel.escrever_planilha_categorias(ws_categorias, totais)
 
         wb.save(caminho_arquivo)
         print(f"Relatório salvo em: {caminho_arquivo}")
@@ -1,76 +1,308 @@
 import sqlite3
 import os
-from threading import Lock
+import weakref
+from contextlib import contextmanager
+from threading import Lock, local
+from urllib.request import pathname2url
+from src import instrumentacao, migracoes
+
+# Perfis de configuração aplicados a cada conexão no momento em que é aberta.
+# 'desempenho' é o padrão da aplicação; 'compatibilidade' reproduz os valores
+# padrão do SQLite e serve de referência para medições.
+PERFIS_CONEXAO = {
+    "desempenho": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -32000,       # ~32 MB de cache de páginas
+        "mmap_size": 268435456,     # 256 MB mapeados em memória
+        "temp_store": "MEMORY",
+    },
+    "compatibilidade": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+}
+
+
+# Tipo usado em 'resumo_mensal' para as linhas de receitas extras
+TIPO_RECEITA_EXTRA = "Receita Extra"
+
+# Totais por (ano, mes, categoria, tipo) recalculados a partir das tabelas de origem
+SQL_RESUMO_RECALCULADO = f"""
+    SELECT CAST(substr(data_iso, 1, 4) AS INTEGER) AS ano, CAST(substr(data_iso, 6, 2) AS INTEGER) AS mes,
+           categoria, tipo, SUM(valor_centavos) AS total_centavos, COUNT(*) AS quantidade
+    FROM despesas
+    GROUP BY 1, 2, 3, 4
+    UNION ALL
+    SELECT ano, mes, '', '{TIPO_RECEITA_EXTRA}', SUM(valor_centavos), COUNT(*)
+    FROM receitas_extras
+    GROUP BY ano, mes
+"""
+
+
+def centavos(valor: float) -> int:
+    """Valor em reais -> centavos inteiros, como os valores são gravados no banco."""
+    return round(valor * 100)
+
+
+# Gatilhos que mantêm 'resumo_mensal' em dia a cada INSERT/UPDATE/DELETE
+_SQL_SOMAR_RESUMO = """
+    INSERT INTO resumo_mensal (ano, mes, categoria, tipo, total_centavos, quantidade)
+    VALUES ({ano}, {mes}, {categoria}, {tipo}, {valor}, 1)
+    ON CONFLICT (ano, mes, categoria, tipo)
+    DO UPDATE SET total_centavos = total_centavos + excluded.total_centavos, quantidade = quantidade + 1;
+"""
+_SQL_SUBTRAIR_RESUMO = """
+    UPDATE resumo_mensal SET total_centavos = total_centavos - {valor}, quantidade = quantidade - 1
+    WHERE ano = {ano} AND mes = {mes} AND categoria = {categoria} AND tipo = {tipo};
+    DELETE FROM resumo_mensal
+    WHERE ano = {ano} AND mes = {mes} AND categoria = {categoria} AND tipo = {tipo} AND quantidade <= 0;
+"""
+
+
+def _gatilhos_resumo() -> dict:
+    """Comandos CREATE TRIGGER dos gatilhos de 'resumo_mensal', por nome do gatilho."""
+    def campos_despesa(linha):
+        return dict(
+            ano=f"CAST(substr({linha}.data_iso, 1, 4) AS INTEGER)",
+            mes=f"CAST(substr({linha}.data_iso, 6, 2) AS INTEGER)",
+            categoria=f"{linha}.categoria", tipo=f"{linha}.tipo", valor=f"{linha}.valor_centavos",
+        )
+
+    def campos_receita(linha):
+        return dict(
+            ano=f"{linha}.ano", mes=f"{linha}.mes", categoria="''",
+            tipo=f"'{TIPO_RECEITA_EXTRA}'", valor=f"{linha}.valor_centavos",
+        )
+
+    gatilhos = {}
+    for tabela, campos in (("despesas", campos_despesa), ("receitas_extras", campos_receita)):
+        gatilhos[f"trg_resumo_{tabela}_insert"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_resumo_{tabela}_insert AFTER INSERT ON {tabela}
+            BEGIN {_SQL_SOMAR_RESUMO.format(**campos("NEW"))} END"""
+        gatilhos[f"trg_resumo_{tabela}_delete"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_resumo_{tabela}_delete AFTER DELETE ON {tabela}
+            BEGIN {_SQL_SUBTRAIR_RESUMO.format(**campos("OLD"))} END"""
+        gatilhos[f"trg_resumo_{tabela}_update"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_resumo_{tabela}_update AFTER UPDATE ON {tabela}
+            BEGIN
+                {_SQL_SUBTRAIR_RESUMO.format(**campos("OLD"))}
+                {_SQL_SOMAR_RESUMO.format(**campos("NEW"))}
+            END"""
+    return gatilhos
+
+
+# Índice de busca textual (FTS5) de descrição e categoria: rowid = id das despesas e
+# -id das regras de recorrência, para que uma única tabela cubra as duas origens
+SQL_BUSCA_RECALCULADA = """
+    INSERT INTO busca_despesas (rowid, descricao, categoria)
+    SELECT id, descricao, categoria FROM despesas
+    UNION ALL
+    SELECT -id, descricao, categoria FROM recorrencias
+"""
+
+
+def _gatilhos_busca() -> dict:
+    """Comandos CREATE TRIGGER que mantêm 'busca_despesas' em dia, por nome do gatilho."""
+    gatilhos = {}
+    for tabela, chave in (("despesas", "{linha}.id"), ("recorrencias", "-{linha}.id")):
+        inserir = (f"INSERT INTO busca_despesas (rowid, descricao, categoria) "
+                   f"VALUES ({chave.format(linha='NEW')}, NEW.descricao, NEW.categoria);")
+        remover = f"DELETE FROM busca_despesas WHERE rowid = {chave.format(linha='OLD')};"
+        gatilhos[f"trg_busca_{tabela}_insert"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_busca_{tabela}_insert AFTER INSERT ON {tabela}
+            BEGIN {inserir} END"""
+        gatilhos[f"trg_busca_{tabela}_delete"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_busca_{tabela}_delete AFTER DELETE ON {tabela}
+            BEGIN {remover} END"""
+        gatilhos[f"trg_busca_{tabela}_update"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_busca_{tabela}_update AFTER UPDATE OF descricao, categoria ON {tabela}
+            BEGIN {remover} {inserir} END"""
+    return gatilhos
+
+
+# Gasto de cada orçamento recalculado do zero: despesas gravadas do mês (via 'resumo_mensal')
+# mais as ocorrências das recorrências da categoria, com as exceções aplicadas
+SQL_GASTO_ORCAMENTOS = f"""
+    UPDATE orcamentos SET gasto_centavos = (
+        SELECT COALESCE(SUM(total_centavos), 0) FROM resumo_mensal m
+        WHERE m.ano = orcamentos.ano AND m.mes = orcamentos.mes AND m.categoria = orcamentos.categoria
+          AND m.tipo != '{TIPO_RECEITA_EXTRA}'
+    ) + (
+        SELECT COALESCE(SUM(CASE WHEN e.removida THEN 0 ELSE COALESCE(e.valor_centavos, r.valor_centavos) END), 0)
+        FROM recorrencias r
+        LEFT JOIN recorrencias_excecoes e
+          ON e.recorrencia_id = r.id AND e.periodo = orcamentos.ano * 12 + orcamentos.mes - 1
+        WHERE r.categoria = orcamentos.categoria
+          AND r.periodo_inicio <= orcamentos.ano * 12 + orcamentos.mes - 1
+          AND (r.meses IS NULL OR orcamentos.ano * 12 + orcamentos.mes - 1 < r.periodo_inicio + r.meses)
+    )
+"""
+
+# Valor de uma ocorrência da regra {r} no mês da linha de 'orcamentos' sendo atualizada
+_VALOR_OCORRENCIA_ORCAMENTO = """COALESCE((
+    SELECT CASE WHEN e.removida THEN 0 ELSE COALESCE(e.valor_centavos, {r}.valor_centavos) END
+    FROM recorrencias_excecoes e
+    WHERE e.recorrencia_id = {r}.id AND e.periodo = orcamentos.ano * 12 + orcamentos.mes - 1
+), {r}.valor_centavos)"""
+
+
+def _gatilhos_orcamento() -> dict:
+    """Gatilhos que mantêm 'orcamentos.gasto_centavos' em dia de forma incremental: cada
+    mudança soma ou subtrai a diferença só nos orçamentos da categoria e dos meses
+    afetados (uma busca pela chave; nada acontece se a categoria não tem orçamento)."""
+    def despesa(linha, sinal):
+        return f"""
+            UPDATE orcamentos SET gasto_centavos = gasto_centavos {sinal} {linha}.valor_centavos
+            WHERE ano = CAST(substr({linha}.data_iso, 1, 4) AS INTEGER)
+              AND mes = CAST(substr({linha}.data_iso, 6, 2) AS INTEGER) AND categoria = {linha}.categoria;"""
+
+    def recorrencia(linha, sinal):
+        return f"""
+            UPDATE orcamentos SET gasto_centavos = gasto_centavos {sinal} {_VALOR_OCORRENCIA_ORCAMENTO.format(r=linha)}
+            WHERE categoria = {linha}.categoria AND ano * 12 + mes - 1 >= {linha}.periodo_inicio
+              AND ({linha}.meses IS NULL OR ano * 12 + mes - 1 < {linha}.periodo_inicio + {linha}.meses);"""
+
+    def excecao(linha, sinal):
+        # Troca o valor normal da ocorrência pelo da exceção ({sinal} '+') ou o contrário ('-')
+        return f"""
+            UPDATE orcamentos SET gasto_centavos = gasto_centavos {sinal} (
+                SELECT CASE WHEN {linha}.removida THEN 0 ELSE COALESCE({linha}.valor_centavos, r.valor_centavos) END
+                       - r.valor_centavos
+                FROM recorrencias r WHERE r.id = {linha}.recorrencia_id
+            )
+            WHERE (ano, mes, categoria) IN (
+                SELECT {linha}.periodo / 12, {linha}.periodo % 12 + 1, r.categoria FROM recorrencias r
+                WHERE r.id = {linha}.recorrencia_id AND {linha}.periodo >= r.periodo_inicio
+                  AND (r.meses IS NULL OR {linha}.periodo < r.periodo_inicio + r.meses)
+            );"""
+
+    # Tabela, comando e colunas que afetam o gasto
+    origens = (
+        ("despesas", despesa, "data_iso, categoria, valor_centavos"),
+        ("recorrencias", recorrencia, "categoria, valor_centavos, periodo_inicio, meses"),
+        ("recorrencias_excecoes", excecao, "recorrencia_id, periodo, valor_centavos, removida"),
+    )
+    gatilhos = {}
+    for tabela, comando, colunas in origens:
+        gatilhos[f"trg_orcamento_{tabela}_insert"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_orcamento_{tabela}_insert AFTER INSERT ON {tabela}
+            BEGIN {comando("NEW", "+")} END"""
+        gatilhos[f"trg_orcamento_{tabela}_delete"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_orcamento_{tabela}_delete AFTER DELETE ON {tabela}
+            BEGIN {comando("OLD", "-")} END"""
+        gatilhos[f"trg_orcamento_{tabela}_update"] = f"""
+            CREATE TRIGGER IF NOT EXISTS trg_orcamento_{tabela}_update AFTER UPDATE OF {colunas} ON {tabela}
+            BEGIN {comando("OLD", "-")} {comando("NEW", "+")} END"""
+    return gatilhos
+
+
+def _gatilhos() -> dict:
+    """Todos os gatilhos de tabelas derivadas ('resumo_mensal', 'busca_despesas' e o
+    gasto de 'orcamentos')."""
+    return {**_gatilhos_resumo(), **_gatilhos_busca(), **_gatilhos_orcamento()}
+
+
+def _sql_gatilhos() -> str:
+    """Monta o script de criação dos gatilhos."""
+    return ";\n".join(_gatilhos().values()) + ";"
+
+
+class Conexao(sqlite3.Connection):
+    """Conexão SQLite da aplicação (subclasse para permitir referências fracas).
+    Com a instrumentação ligada, os cursores medem o tempo de cada comando."""
+
+    def cursor(self, factory=None):
+        if factory is None and instrumentacao.ATIVO:
+            factory = instrumentacao.CursorMedido
+        return super().cursor(factory) if factory is not None else super().cursor()
+
+    def execute(self, sql, parametros=()):
+        if instrumentacao.ATIVO:
+            return self.cursor().execute(sql, parametros)
+        return super().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        if instrumentacao.ATIVO:
+            return self.cursor().executemany(sql, parametros)
+        return super().executemany(sql, parametros)
+
 
 class Database:
     """
     Implementação Singleton para conexão com o banco de dados.
-    Garante que não haja conflitos de threads ou conexões abertas desnecessárias.
+    Cada thread recebe uma conexão persistente própria, configurada com o
+    perfil ativo (PERFIS_CONEXAO) e reutilizada por todas as chamadas.
     """
     _instance = None
     _lock = Lock()
     DB_NAME = "data/financeiro.db"
+    PERFIL = "desempenho"
+    # Conexões com mode=ro: nada é migrado nem gravado (ver usar_arquivo)
+    SOMENTE_LEITURA = False
 
     def __new__(cls):
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super(Database, cls).__new__(cls)
-                cls._instance._init_db()
+                # A instância guarda o arquivo e o modo: depois de usar_arquivo, quem ainda a
+                # referencia (controllers antigos) continua no banco em que foi criada
+                cls._instance.DB_NAME = cls.DB_NAME
+                cls._instance.SOMENTE_LEITURA = cls.SOMENTE_LEITURA
+                cls._instance._local = local()
+                cls._instance._conexoes = weakref.WeakSet()
+                cls._instance._lock_conexoes = Lock()
+                if cls.SOMENTE_LEITURA:
+                    cls._instance._verificar_esquema()
+                else:
+                    cls._instance._init_db()
         return cls._instance
 
+    @classmethod
+    def usar_arquivo(cls, caminho: str, somente_leitura: bool = False):
+        """Aponta o singleton para outro arquivo de banco (ex.: bancos temporários de
+        benchmark). As conexões atuais são fechadas e a próxima chamada a Database()
+        inicializa o novo arquivo; controllers criados antes continuam no banco antigo
+        (reabrindo suas conexões nele, se forem usados).
+        Com somente_leitura=True as conexões são abertas em modo somente leitura (usado
+        pelos processos de src.cli): o banco precisa existir e já estar na versão atual."""
+        with cls._lock:
+            if cls._instance is not None:
+                cls._instance.fechar()
+                cls._instance = None
+            cls.DB_NAME = caminho
+            cls.SOMENTE_LEITURA = somente_leitura
+
+    def _verificar_esquema(self):
+        """No modo somente leitura, em vez de migrar, recusa bancos de outra versão."""
+        versao = migracoes.versao_banco(self.get_connection())
+        if versao != migracoes.versao_esquema():
+            raise Exception(
+                f"O banco {self.DB_NAME} está na versão {versao} do esquema (esperada: "
+                f"{migracoes.versao_esquema()}). Abra-o uma vez fora do modo somente leitura para migrá-lo."
+            )
+
     def _init_db(self):
-        """Inicializa as tabelas se não existirem."""
-        if not os.path.exists("data"):
-            os.makedirs("data")
+        """Cria ou atualiza o esquema (migrações em src/migracoes.py, versionadas por
+        PRAGMA user_version), os gatilhos de 'resumo_mensal' e os dados iniciais."""
+        pasta = os.path.dirname(self.DB_NAME)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
             
         conn = self.get_connection()
+        migracoes.migrar(conn)
         cursor = conn.cursor()
-        
-        # Tabela de Despesas ATUALIZADA com coluna 'tipo' e 'recorrencia_meses'
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS despesas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                data TEXT NOT NULL,
-                tipo TEXT NOT NULL,
-                categoria TEXT NOT NULL,
-                descricao TEXT,
-                valor REAL NOT NULL,
-                recorrencia_meses INTEGER DEFAULT 0
-            )
-        ''')
-
-        # Tabela de Configurações (Salários Globais)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS configuracoes (
-                id INTEGER PRIMARY KEY CHECK (id = 1),
-                salario_1 REAL DEFAULT 0.0,
-                salario_2 REAL DEFAULT 0.0
-            )
-        ''')
-        
-        # Tabela de Receitas Extras (Dinheiro Extra por Mês/Ano)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS receitas_extras (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                mes INTEGER NOT NULL,
-                ano INTEGER NOT NULL,
-                descricao TEXT,
-                valor REAL NOT NULL,
-                UNIQUE(mes, ano, descricao)
-            )
-        ''')
-        
-        # Tabela de Categorias Personalizadas
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS categorias (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL UNIQUE,
-                icone TEXT NOT NULL
-            )
-        ''')
-        
+
+        # Resumo mensal mantido por gatilhos: totais em centavos por (ano, mes, categoria, tipo)
+        # das despesas gravadas e das receitas extras (tipo TIPO_RECEITA_EXTRA).
+        # Outros gatilhos mantêm o índice de busca textual 'busca_despesas' e o gasto de 'orcamentos'.
+        cursor.executescript(_sql_gatilhos())
+
         # Garante que existe a linha de configuração inicial
-        cursor.execute('INSERT OR IGNORE INTO configuracoes (id, salario_1, salario_2) VALUES (1, 0.0, 0.0)')
+        cursor.execute('INSERT OR IGNORE INTO configuracoes (id, salario_1_centavos, salario_2_centavos) VALUES (1, 0, 0)')
         
         # Inserir categorias padrão se não existirem
         categorias_padrao = [
@@ -84,8 +316,125 @@ class Database:
             cursor.execute('INSERT OR IGNORE INTO categorias (nome, icone) VALUES (?, ?)', (nome, icone))
         
         conn.commit()
-        conn.close()
+
+    def reconstruir_resumo_mensal(self) -> list:
+        """Recalcula 'resumo_mensal' a partir das tabelas de origem e o substitui (e, com
+        ela, o gasto dos orçamentos).
+        Retorna as divergências encontradas antes da reconstrução, como tuplas
+        (ano, mes, categoria, tipo, total_resumo, total_correto), com os totais em reais."""
+        conn = self.get_connection()
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS temp.resumo_recalculado")
+            conn.execute(f"CREATE TEMP TABLE resumo_recalculado AS {SQL_RESUMO_RECALCULADO}")
+            divergencias = conn.execute('''
+                SELECT n.ano, n.mes, n.categoria, n.tipo, a.total_centavos / 100.0, n.total_centavos / 100.0
+                FROM resumo_recalculado n
+                LEFT JOIN resumo_mensal a USING (ano, mes, categoria, tipo)
+                WHERE a.total_centavos IS NULL OR a.total_centavos != n.total_centavos OR a.quantidade != n.quantidade
+                UNION ALL
+                SELECT a.ano, a.mes, a.categoria, a.tipo, a.total_centavos / 100.0, NULL
+                FROM resumo_mensal a
+                LEFT JOIN resumo_recalculado n USING (ano, mes, categoria, tipo)
+                WHERE n.ano IS NULL
+                ORDER BY 1, 2, 3, 4
+            ''').fetchall()
+            conn.execute("DELETE FROM resumo_mensal")
+            conn.execute("INSERT INTO resumo_mensal SELECT * FROM resumo_recalculado")
+            conn.execute("DROP TABLE resumo_recalculado")
+            conn.execute(SQL_GASTO_ORCAMENTOS)
+        return divergencias
+
+    @contextmanager
+    def carga_em_lote(self):
+        """Transação de escrita para cargas grandes. Os gatilhos de 'resumo_mensal', da
+        busca textual e dos orçamentos ficam desligados durante o bloco e as tabelas derivadas
+        são recalculadas uma única vez no final; se algo falhar, tudo (inclusive os gatilhos) volta ao estado anterior."""
+        conn = self.get_connection()
+        gatilhos = _gatilhos()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for nome in gatilhos:
+                conn.execute(f"DROP TRIGGER IF EXISTS {nome}")
+            yield conn
+            conn.execute("DELETE FROM resumo_mensal")
+            conn.execute(f"INSERT INTO resumo_mensal {SQL_RESUMO_RECALCULADO}")
+            conn.execute("DELETE FROM busca_despesas")
+            conn.execute(SQL_BUSCA_RECALCULADA)
+            conn.execute(SQL_GASTO_ORCAMENTOS)
+            for sql in gatilhos.values():
+                conn.execute(sql)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
 
     def get_connection(self):
-        """Retorna uma conexão com o SQLite."""
-        return sqlite3.connect(self.DB_NAME)
+        """Retorna a conexão persistente da thread atual (aberta na primeira chamada)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.SOMENTE_LEITURA:
+                uri = f"file:{pathname2url(os.path.abspath(self.DB_NAME))}?mode=ro"
+                conn = sqlite3.connect(uri, uri=True, factory=Conexao, check_same_thread=False)
+            else:
+                conn = sqlite3.connect(self.DB_NAME, factory=Conexao, check_same_thread=False)
+            self._aplicar_perfil(conn, self.PERFIL)
+            if instrumentacao.ATIVO:
+                conn.set_trace_callback(instrumentacao.trace_sql)
+            self._local.conn = conn
+            with self._lock_conexoes:
+                self._conexoes.add(conn)
+        return conn
+
+    @contextmanager
+    def transacao_leitura(self):
+        """Abre uma transação de leitura na conexão da thread: todas as consultas
+        feitas dentro do bloco enxergam o mesmo estado do banco."""
+        conn = self.get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.commit()
+
+    def _aplicar_perfil(self, conn, nome_perfil: str):
+        """Executa os PRAGMAs do perfil na conexão."""
+        for pragma, valor in PERFIS_CONEXAO[nome_perfil].items():
+            # journal_mode é gravado no arquivo: conexões somente leitura usam o do banco
+            if pragma == "journal_mode" and self.SOMENTE_LEITURA:
+                continue
+            conn.execute(f"PRAGMA {pragma} = {valor}")
+
+    def usar_perfil(self, nome_perfil: str):
+        """Troca o perfil ativo. As conexões são reabertas já com os novos PRAGMAs."""
+        if nome_perfil not in PERFIS_CONEXAO:
+            raise ValueError(f"Perfil de conexão desconhecido: {nome_perfil}")
+        self.PERFIL = nome_perfil
+        self.fechar()
+
+    def aplicar_trace(self):
+        """Liga ou desliga o trace de SQL (instrumentacao.trace_sql) em todas as
+        conexões abertas, conforme instrumentacao.ATIVO."""
+        callback = instrumentacao.trace_sql if instrumentacao.ATIVO else None
+        with self._lock_conexoes:
+            for conn in self._conexoes:
+                conn.set_trace_callback(callback)
+
+    def pragmas_ativos(self) -> dict:
+        """Lê de volta, na conexão da thread atual, os valores dos PRAGMAs do perfil."""
+        conn = self.get_connection()
+        return {
+            pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+            for pragma in PERFIS_CONEXAO[self.PERFIL]
+        }
+
+    def fechar(self):
+        """Fecha todas as conexões abertas (de todas as threads)."""
+        with self._lock_conexoes:
+            conexoes = list(self._conexoes)
+            self._conexoes.clear()
+        for conn in conexoes:
+            conn.close()
+        self._local = local()
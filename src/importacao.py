@@ -0,0 +1,201 @@
+import csv
+import hashlib
+import os
+import re
+import unicodedata
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+
+# Formatos de data aceitos nas colunas de extratos CSV
+FORMATOS_DATA_EXTRATO = ["%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d", "%d-%m-%Y", "%d.%m.%Y"]
+
+# Caracteres lidos por vez dos arquivos OFX
+TAMANHO_BLOCO_LEITURA = 65536
+
+# Nomes de coluna (sem acentos, minúsculos) reconhecidos nos extratos CSV, por campo
+COLUNAS_EXTRATO = {
+    "data": ("data", "date", "dt"),
+    "descricao": ("descricao", "historico", "lancamento", "memo", "description", "estabelecimento"),
+    "valor": ("valor", "amount", "value", "quantia"),
+}
+
+# Token SGML/XML do OFX: <TAG>valor ou </TAG>
+_RE_TOKEN_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+class TransacaoBancaria(NamedTuple):
+    """Lançamento lido de um extrato. 'valor' é negativo para débitos; 'hash_conteudo'
+    identifica o lançamento de forma estável entre importações do mesmo extrato."""
+    data: date
+    descricao: str
+    valor: float
+    hash_conteudo: str
+
+
+def formato_extrato(caminho: str) -> str:
+    """Deduz o formato ('csv' ou 'ofx') pela extensão do arquivo."""
+    return "ofx" if os.path.splitext(caminho)[1].lower() in (".ofx", ".qfx") else "csv"
+
+
+def ler_extrato(caminho: str, formato: Optional[str] = None, colunas: Optional[dict] = None):
+    """Gera as transações do extrato sob demanda, sem carregar o arquivo inteiro."""
+    formato = formato or formato_extrato(caminho)
+    if formato == "ofx":
+        return ler_ofx(caminho)
+    if formato == "csv":
+        return ler_csv(caminho, colunas)
+    raise ValueError(f"Formato de extrato desconhecido: {formato}")
+
+
+def ler_csv(caminho: str, colunas: Optional[dict] = None):
+    """Gera as transações de um extrato CSV. O separador é detectado pelo cabeçalho e as
+    colunas de data, descrição e valor pelos nomes (ou informadas em 'colunas', como
+    {'data': 'Data', 'descricao': 'Histórico', 'valor': 'Valor'})."""
+    with open(caminho, newline="", encoding=_codificacao(caminho)) as arquivo:
+        amostra = arquivo.readline()
+        arquivo.seek(0)
+        separador = max(";,\t", key=amostra.count)
+        leitor = csv.reader(arquivo, delimiter=separador)
+
+        cabecalho = [_normalizar(nome) for nome in next(leitor, [])]
+        indices = _indices_colunas(cabecalho, colunas)
+        minimo_colunas = max(indices.values()) + 1
+        repeticoes = {}
+        for linha in leitor:
+            if not any(campo.strip() for campo in linha):
+                continue
+            if len(linha) < minimo_colunas:
+                raise ValueError(
+                    f"Linha {leitor.line_num} do extrato tem {len(linha)} coluna(s); "
+                    f"esperadas ao menos {minimo_colunas}."
+                )
+            data = _interpretar_data(linha[indices["data"]])
+            descricao = " ".join(linha[indices["descricao"]].split())
+            valor = _interpretar_valor(linha[indices["valor"]])
+            chave = f"csv|{data.isoformat()}|{valor:.2f}|{descricao.casefold()}"
+            # Lançamentos idênticos no mesmo extrato (ex.: duas compras iguais no dia)
+            # recebem hashes diferentes pela ordem em que aparecem
+            repeticoes[chave] = repeticoes.get(chave, 0) + 1
+            yield TransacaoBancaria(data, descricao, valor, _hash(f"{chave}|{repeticoes[chave]}"))
+
+
+def ler_ofx(caminho: str):
+    """Gera as transações (<STMTTRN>) de um arquivo OFX 1.x (SGML) ou 2.x (XML), lido em
+    blocos. Quando o banco informa FITID, o hash usa a conta e o FITID."""
+    with open(caminho, encoding=_codificacao(caminho), errors="replace") as arquivo:
+        conta = ""
+        transacao = None
+        repeticoes = {}
+        for fechamento, tag, valor in _tokens_ofx(arquivo):
+            tag = tag.upper()
+            valor = valor.strip()
+            if tag == "STMTTRN":
+                if not fechamento:
+                    transacao = {}
+                elif transacao is not None:
+                    yield _transacao_ofx(transacao, conta, repeticoes)
+                    transacao = None
+            elif fechamento:
+                continue
+            elif tag == "ACCTID":
+                conta = valor
+            elif transacao is not None:
+                transacao[tag] = valor
+
+
+def _tokens_ofx(arquivo):
+    """Gera (fechamento, tag, valor) lendo o arquivo em blocos; o trecho após o último '<'
+    de cada bloco fica para o próximo, para não partir um token ao meio."""
+    resto = ""
+    for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO_LEITURA), ""):
+        texto = resto + bloco
+        corte = texto.rfind("<")
+        if corte <= 0:
+            resto = texto
+            continue
+        yield from _RE_TOKEN_OFX.findall(texto, 0, corte)
+        resto = texto[corte:]
+    yield from _RE_TOKEN_OFX.findall(resto)
+
+
+def _transacao_ofx(campos: dict, conta: str, repeticoes: dict) -> TransacaoBancaria:
+    data = datetime.strptime(campos.get("DTPOSTED", "")[:8], "%Y%m%d").date()
+    valor = _interpretar_valor(campos.get("TRNAMT", ""))
+    descricao = " ".join((campos.get("MEMO") or campos.get("NAME") or "").split())
+    fitid = campos.get("FITID")
+    if fitid:
+        chave = f"ofx|{conta}|{fitid}"
+    else:
+        chave = f"ofx|{conta}|{data.isoformat()}|{valor:.2f}|{descricao.casefold()}"
+        repeticoes[chave] = repeticoes.get(chave, 0) + 1
+        chave = f"{chave}|{repeticoes[chave]}"
+    return TransacaoBancaria(data, descricao, valor, _hash(chave))
+
+
+def _hash(conteudo: str) -> str:
+    return hashlib.blake2b(conteudo.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _codificacao(caminho: str) -> str:
+    """UTF-8 se o início do arquivo for UTF-8 válido; senão cp1252, comum em extratos de bancos."""
+    with open(caminho, "rb") as arquivo:
+        inicio = arquivo.read(TAMANHO_BLOCO_LEITURA)
+    try:
+        # Um caractere multibyte cortado no fim da amostra não conta como erro
+        inicio.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(inicio) - 3:
+            return "cp1252"
+    return "utf-8-sig"
+
+
+def _normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos e sem espaços nas pontas (para comparar nomes de coluna)."""
+    sem_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return sem_acentos.strip().lower()
+
+
+def _indices_colunas(cabecalho: list, colunas: Optional[dict]) -> dict:
+    indices = {}
+    for campo, nomes in COLUNAS_EXTRATO.items():
+        if colunas and campo in colunas:
+            nome = _normalizar(colunas[campo])
+            if nome not in cabecalho:
+                raise ValueError(f"Coluna '{colunas[campo]}' não encontrada no extrato.")
+            indices[campo] = cabecalho.index(nome)
+            continue
+        encontrada = next(
+            (i for i, nome in enumerate(cabecalho) if i not in indices.values() and nome.startswith(nomes)),
+            None
+        )
+        if encontrada is None:
+            raise ValueError(f"Não foi possível identificar a coluna de {campo} no extrato.")
+        indices[campo] = encontrada
+    return indices
+
+
+def _interpretar_data(texto: str) -> date:
+    texto = texto.strip()
+    for fmt in FORMATOS_DATA_EXTRATO:
+        try:
+            return datetime.strptime(texto, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida no extrato: {texto}")
+
+
+def _interpretar_valor(texto: str) -> float:
+    """Converte '-1.234,56', 'R$ 1.234,56', '(50,00)' ou '-1234.56' em float."""
+    texto = texto.replace("R$", "").replace(" ", "").strip()
+    negativo = texto.startswith("-") or (texto.startswith("(") and texto.endswith(")"))
+    texto = texto.strip("-+()")
+    # O último separador (',' ou '.') é o decimal; os anteriores são de milhar
+    if "," in texto and texto.rfind(",") > texto.rfind("."):
+        texto = texto.replace(".", "").replace(",", ".")
+    else:
+        texto = texto.replace(",", "")
+    try:
+        valor = float(texto)
+    except ValueError:
+        raise ValueError(f"Valor inválido no extrato: {texto}")
+    return -valor if negativo else valor
@@ -0,0 +1,280 @@
+import bisect
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from threading import Lock
+
+# Coleta ligada por '--perfil' na linha de comando ou FINANCAS_PERFIL=1 (ou por ativar())
+ATIVO = "--perfil" in sys.argv or bool(os.environ.get("FINANCAS_PERFIL"))
+
+# Limites superiores (ms) das faixas dos histogramas de latência; a última faixa é aberta
+FAIXAS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# Amostras recentes guardadas por medida, para os percentis
+AMOSTRAS_RECENTES = 1000
+
+# Tamanho máximo do texto de SQL usado como chave do trace
+TAMANHO_SQL = 160
+
+
+class Histograma:
+    """Latências de uma medida: contagem por faixa (FAIXAS_MS), total, máximo e as
+    amostras mais recentes, das quais saem os percentis."""
+
+    def __init__(self):
+        self.faixas = [0] * (len(FAIXAS_MS) + 1)
+        self.chamadas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.recentes = deque(maxlen=AMOSTRAS_RECENTES)
+
+    def registrar(self, segundos: float):
+        ms = segundos * 1000
+        self.faixas[bisect.bisect_left(FAIXAS_MS, ms)] += 1
+        self.chamadas += 1
+        self.total += ms
+        self.maximo = max(self.maximo, ms)
+        self.recentes.append(ms)
+
+    def resumo(self) -> dict:
+        recentes = sorted(self.recentes)
+
+        def percentil(fracao):
+            return recentes[min(len(recentes) - 1, int(fracao * len(recentes)))] if recentes else 0.0
+
+        return {
+            "chamadas": self.chamadas,
+            "total_ms": self.total,
+            "media_ms": self.total / self.chamadas if self.chamadas else 0.0,
+            "p50_ms": percentil(0.50),
+            "p95_ms": percentil(0.95),
+            "max_ms": self.maximo,
+            "faixas": {
+                (f"<= {limite} ms" if limite is not None else f"> {FAIXAS_MS[-1]} ms"): quantidade
+                for limite, quantidade in zip(FAIXAS_MS + [None], self.faixas)
+                if quantidade
+            },
+        }
+
+
+_lock = Lock()
+_metodos = {}        # "Classe.metodo": Histograma
+_sql = {}            # sql normalizado: Histograma (execute/executemany + leitura das linhas)
+_execucoes_sql = {}  # sql com os parâmetros já expandidos (como o trace entrega): execuções
+_gui = {}            # fase da interface: Histograma
+# Comandos concluídos por cursores descartados (__del__), ainda não registrados em _sql.
+# Finalizadores podem rodar numa thread que já está com _lock, então não o usam:
+# deque.append é atômico; a fila é esvaziada (com _lock) por _registrar e resumo()
+_sql_pendentes = deque()
+_inicio_coleta = datetime.now()
+
+
+def ativar():
+    """Liga a coleta. As conexões abertas passam a ser rastreadas (ver Database)."""
+    global ATIVO
+    ATIVO = True
+    from src.database import Database
+    Database().aplicar_trace()
+
+
+def desativar():
+    global ATIVO
+    ATIVO = False
+    from src.database import Database
+    Database().aplicar_trace()
+
+
+def limpar():
+    """Descarta tudo o que foi coletado até agora."""
+    global _inicio_coleta
+    with _lock:
+        _sql_pendentes.clear()
+        _metodos.clear()
+        _sql.clear()
+        _execucoes_sql.clear()
+        _gui.clear()
+        _inicio_coleta = datetime.now()
+
+
+def _registrar(tabela: dict, nome: str, segundos: float):
+    with _lock:
+        _registrar_pendentes()
+        _registrar_sem_lock(tabela, nome, segundos)
+
+
+def _registrar_sem_lock(tabela: dict, nome: str, segundos: float):
+    histograma = tabela.get(nome)
+    if histograma is None:
+        histograma = tabela[nome] = Histograma()
+    histograma.registrar(segundos)
+
+
+def _registrar_pendentes():
+    """Move _sql_pendentes para _sql. Deve ser chamada com _lock obtido."""
+    while True:
+        try:
+            chave, segundos = _sql_pendentes.popleft()
+        except IndexError:
+            return
+        _registrar_sem_lock(_sql, chave, segundos)
+
+
+def normalizar_sql(sql: str) -> str:
+    """Texto do comando em uma linha só (espaços colapsados), truncado em TAMANHO_SQL."""
+    texto = " ".join(sql.split())
+    return texto if len(texto) <= TAMANHO_SQL else texto[:TAMANHO_SQL - 3] + "..."
+
+
+# --- Métodos ---
+
+def instrumentar(cls):
+    """Decorador de classe: mede a latência de cada método público (chamadas com a
+    coleta desligada custam só uma verificação a mais)."""
+    for nome, atributo in list(vars(cls).items()):
+        if nome.startswith("_") or not inspect.isfunction(atributo):
+            continue
+        setattr(cls, nome, _medir_metodo(f"{cls.__name__}.{nome}", atributo))
+    return cls
+
+
+def _medir_metodo(nome: str, funcao):
+    @wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if not ATIVO:
+            return funcao(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            _registrar(_metodos, nome, time.perf_counter() - inicio)
+    return envoltorio
+
+
+# --- Interface ---
+
+class fase:
+    """Mede um trecho da interface: `with fase("refresh.listas"): ...`."""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        if ATIVO:
+            _registrar(_gui, self.nome, time.perf_counter() - self._inicio)
+
+
+def registrar_fase(nome: str, segundos: float):
+    """Registra a duração de uma fase medida por quem chama (ex.: entre duas callbacks)."""
+    if ATIVO:
+        _registrar(_gui, nome, segundos)
+
+
+# --- SQL ---
+
+def trace_sql(sql: str):
+    """Callback de Connection.set_trace_callback: conta cada comando executado pelo SQLite,
+    inclusive BEGIN/COMMIT implícitos e os passos de gatilhos."""
+    chave = normalizar_sql(sql)
+    with _lock:
+        _execucoes_sql[chave] = _execucoes_sql.get(chave, 0) + 1
+
+
+class CursorMedido(sqlite3.Cursor):
+    """Cursor usado com a coleta ligada. No SQLite as linhas são produzidas sob demanda,
+    então o tempo de um comando soma o execute e a leitura das linhas (fetch*/iteração),
+    e é registrado quando o comando termina: linhas esgotadas, novo execute no mesmo
+    cursor, close() ou o cursor sendo descartado."""
+    _chave = None
+    _tempo = 0.0
+
+    def execute(self, sql, parametros=()):
+        self._iniciar(sql)
+        return self._medir(super().execute, sql, parametros)
+
+    def executemany(self, sql, parametros):
+        self._iniciar(sql)
+        return self._medir(super().executemany, sql, parametros)
+
+    def fetchone(self):
+        linha = self._medir(super().fetchone)
+        if linha is None:
+            self._concluir()
+        return linha
+
+    def fetchmany(self, *args, **kwargs):
+        linhas = self._medir(super().fetchmany, *args, **kwargs)
+        if not linhas:
+            self._concluir()
+        return linhas
+
+    def fetchall(self):
+        linhas = self._medir(super().fetchall)
+        self._concluir()
+        return linhas
+
+    def __next__(self):
+        try:
+            return self._medir(super().__next__)
+        except StopIteration:
+            self._concluir()
+            raise
+
+    def close(self):
+        self._concluir()
+        super().close()
+
+    def __del__(self):
+        # Sem _lock aqui (ver _sql_pendentes)
+        if self._chave is not None:
+            _sql_pendentes.append((self._chave, self._tempo))
+            self._chave = None
+
+    def _iniciar(self, sql: str):
+        self._concluir()
+        self._chave = normalizar_sql(sql)
+        self._tempo = 0.0
+
+    def _medir(self, funcao, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            self._tempo += time.perf_counter() - inicio
+
+    def _concluir(self):
+        if self._chave is not None:
+            _registrar(_sql, self._chave, self._tempo)
+            self._chave = None
+
+
+# --- Relatório ---
+
+def resumo() -> dict:
+    """Tudo o que foi coletado, pronto para exibir ou gravar em JSON."""
+    with _lock:
+        _registrar_pendentes()
+        return {
+            "ativo": ATIVO,
+            "inicio_coleta": _inicio_coleta.isoformat(timespec="seconds"),
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "metodos": {nome: histograma.resumo() for nome, histograma in _metodos.items()},
+            "sql": {chave: histograma.resumo() for chave, histograma in _sql.items()},
+            "trace_sqlite": dict(sorted(_execucoes_sql.items(), key=lambda item: -item[1])),
+            "gui": {nome: histograma.resumo() for nome, histograma in _gui.items()},
+        }
+
+
+def salvar(caminho: str):
+    """Grava o resumo em JSON."""
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(resumo(), arquivo, indent=2, ensure_ascii=False)
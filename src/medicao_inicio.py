@@ -0,0 +1,80 @@
+import builtins
+import os
+import sys
+import threading
+import time
+
+# Referência de tempo: o momento em que este módulo é importado (primeira linha de main.py)
+INICIO = time.perf_counter()
+
+# A medição é ligada por '--medir-inicio' na linha de comando ou FINANCAS_MEDIR_INICIO=1
+ATIVA = "--medir-inicio" in sys.argv or bool(os.environ.get("FINANCAS_MEDIR_INICIO"))
+
+# Quantas importações aparecem no relatório
+LIMITE_IMPORTACOES = 15
+
+_etapas = []          # (etapa, segundos desde INICIO)
+_importacoes = {}     # módulo: (segundos próprios, segundos acumulados)
+_pilha = threading.local()
+_import_original = None
+_relatorio_impresso = False
+
+
+def instalar():
+    """Passa a medir cada importação que carrega módulos novos, como o '-X importtime'
+    do Python (tempo próprio e acumulado, incluindo os módulos importados por ele)."""
+    global _import_original
+    if not ATIVA or _import_original is not None:
+        return
+    _import_original = builtins.__import__
+    builtins.__import__ = _importar_medindo
+
+
+def _importar_medindo(nome, globals=None, locals=None, fromlist=(), level=0):
+    tempos_filhos = _pilha.__dict__.setdefault("tempos", [])
+    modulos_antes = len(sys.modules)
+    tempos_filhos.append(0.0)
+    inicio = time.perf_counter()
+    try:
+        return _import_original(nome, globals, locals, fromlist, level)
+    finally:
+        acumulado = time.perf_counter() - inicio
+        filhos = tempos_filhos.pop()
+        if tempos_filhos:
+            tempos_filhos[-1] += acumulado
+        # Só interessa a primeira importação, a que de fato carregou o módulo
+        if len(sys.modules) > modulos_antes:
+            if level:
+                pacote = (globals or {}).get("__package__") or ""
+                nome = f"{pacote}.{nome}" if nome else pacote
+            _importacoes.setdefault(nome, (acumulado - filhos, acumulado))
+
+
+def marcar(etapa: str):
+    """Registra o tempo decorrido até 'etapa' (ex.: 'janela exibida')."""
+    if ATIVA:
+        _etapas.append((etapa, time.perf_counter() - INICIO))
+
+
+def relatorio(limite: int = LIMITE_IMPORTACOES) -> str:
+    """Texto com as etapas da inicialização e as importações mais demoradas."""
+    linhas = ["Tempo de inicialização (desde o início de main.py):"]
+    for etapa, segundos in _etapas:
+        linhas.append(f"  {segundos * 1000:9.1f} ms  {etapa}")
+
+    if _importacoes:
+        linhas.append("")
+        linhas.append(f"Importações mais demoradas ({len(_importacoes)} módulos carregados):")
+        linhas.append(f"  {'acumulado':>12} {'próprio':>10}  módulo")
+        mais_lentas = sorted(_importacoes.items(), key=lambda item: item[1][1], reverse=True)[:limite]
+        for nome, (proprio, acumulado) in mais_lentas:
+            linhas.append(f"  {acumulado * 1000:9.1f} ms {proprio * 1000:7.1f} ms  {nome}")
+    return "\n".join(linhas)
+
+
+def imprimir_relatorio():
+    """Imprime o relatório uma única vez (se a medição estiver ativa)."""
+    global _relatorio_impresso
+    if ATIVA and not _relatorio_impresso:
+        _relatorio_impresso = True
+        print(relatorio())
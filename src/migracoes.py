@@ -0,0 +1,320 @@
+import sqlite3
+import time
+
+# Linhas copiadas por comando ao reescrever uma tabela
+TAMANHO_LOTE_MIGRACAO = 50000
+
+# (versão, descrição, função) em ordem de versão; registradas por @migracao.
+# A versão do banco fica em PRAGMA user_version (0 = banco novo ou anterior às migrações).
+MIGRACOES = []
+
+
+def migracao(versao: int, descricao: str):
+    """Registra uma migração. Uma vez publicada, a função não deve mudar: o SQL dela
+    descreve o banco naquela versão, não o esquema atual."""
+    def registrar(funcao):
+        MIGRACOES.append((versao, descricao, funcao))
+        MIGRACOES.sort(key=lambda item: item[0])
+        return funcao
+    return registrar
+
+
+def versao_banco(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def versao_esquema() -> int:
+    """Versão do esquema esperada por este código (a última migração)."""
+    return MIGRACOES[-1][0]
+
+
+def migrar(conn) -> list:
+    """Aplica, em ordem, as migrações mais novas que a versão do banco. Cada uma roda
+    numa transação própria junto com a atualização de user_version: se falhar, o banco
+    fica na versão anterior, intacto. Retorna as versões aplicadas."""
+    atual = versao_banco(conn)
+    if atual > versao_esquema():
+        raise Exception(
+            f"O banco está na versão {atual} do esquema, mais nova que a suportada "
+            f"({versao_esquema()}). Atualize a aplicação."
+        )
+
+    banco_novo = conn.execute("SELECT count(*) FROM sqlite_master").fetchone()[0] == 0
+    aplicadas = []
+    for versao, descricao, funcao in MIGRACOES:
+        if versao <= atual:
+            continue
+        inicio = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            funcao(conn)
+            conn.execute(f"PRAGMA user_version = {versao}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        aplicadas.append(versao)
+        # Bancos novos passam por todas as migrações sem dados; só as reais são avisadas
+        if not banco_novo:
+            print(f"Banco migrado para a versão {versao} ({descricao}) em {time.perf_counter() - inicio:.1f} s")
+    return aplicadas
+
+
+def _colunas(conn, tabela: str) -> set:
+    return {coluna[1] for coluna in conn.execute(f"PRAGMA table_info({tabela})")}
+
+
+def _reescrever_tabela(conn, tabela: str, criar: str, colunas: list, expressoes: list):
+    """Recria 'tabela' com o comando 'criar' ({tabela} no lugar do nome) e copia as linhas
+    convertidas por 'expressoes' (uma por coluna de destino), em lotes de
+    TAMANHO_LOTE_MIGRACAO por ordem de rowid, para não montar uma única instrução gigante.
+    Índices da tabela antiga são descartados; o contador AUTOINCREMENT é preservado."""
+    nova = f"{tabela}_migracao"
+    conn.execute(f"DROP TABLE IF EXISTS {nova}")
+    conn.execute(criar.format(tabela=nova))
+    inserir = f"INSERT INTO {nova} ({', '.join(colunas)}) SELECT {', '.join(expressoes)} FROM {tabela}"
+
+    sem_rowid = "WITHOUT ROWID" in conn.execute(
+        "SELECT upper(sql) FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+    ).fetchone()[0]
+    if sem_rowid:
+        conn.execute(inserir)
+    else:
+        # As tabelas com rowid têm 'id' INTEGER PRIMARY KEY, copiado como está:
+        # o maior rowid da tabela nova marca onde o próximo lote começa
+        ultimo = conn.execute(f"SELECT min(rowid) - 1 FROM {tabela}").fetchone()[0]
+        while ultimo is not None:
+            copiadas = conn.execute(
+                f"{inserir} WHERE rowid > ? ORDER BY rowid LIMIT ?", (ultimo, TAMANHO_LOTE_MIGRACAO)
+            ).rowcount
+            if copiadas < TAMANHO_LOTE_MIGRACAO:
+                break
+            ultimo = conn.execute(f"SELECT max(rowid) FROM {nova}").fetchone()[0]
+
+    sequencia = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (tabela,)).fetchone()
+    conn.execute(f"DROP TABLE {tabela}")
+    conn.execute(f"ALTER TABLE {nova} RENAME TO {tabela}")
+    if sequencia is not None:
+        if not conn.execute(
+            "UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = ?", (sequencia[0], tabela)
+        ).rowcount:
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (tabela, sequencia[0]))
+
+
+@migracao(1, "esquema original")
+def _esquema_original(conn):
+    """Tabelas como eram criadas antes das migrações, incluindo as colunas que bancos
+    antigos ainda não tinham ('data_iso' e 'hash_importacao' em despesas)."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS despesas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            descricao TEXT,
+            valor REAL NOT NULL,
+            recorrencia_meses INTEGER DEFAULT 0,
+            data_iso TEXT,
+            hash_importacao TEXT
+        )
+    ''')
+    colunas = _colunas(conn, "despesas")
+    if 'data_iso' not in colunas:
+        conn.execute("ALTER TABLE despesas ADD COLUMN data_iso TEXT")
+        conn.execute('''
+            UPDATE despesas
+            SET data_iso = substr(data, 7, 4) || '-' || substr(data, 4, 2) || '-' || substr(data, 1, 2)
+        ''')
+    if 'hash_importacao' not in colunas:
+        conn.execute("ALTER TABLE despesas ADD COLUMN hash_importacao TEXT")
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS recorrencias (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            descricao TEXT,
+            valor REAL NOT NULL,
+            dia INTEGER NOT NULL,
+            periodo_inicio INTEGER NOT NULL,
+            meses INTEGER
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS recorrencias_excecoes (
+            recorrencia_id INTEGER NOT NULL,
+            periodo INTEGER NOT NULL,
+            valor REAL,
+            removida INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (recorrencia_id, periodo)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS configuracoes (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            salario_1 REAL DEFAULT 0.0,
+            salario_2 REAL DEFAULT 0.0
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS receitas_extras (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mes INTEGER NOT NULL,
+            ano INTEGER NOT NULL,
+            descricao TEXT,
+            valor REAL NOT NULL,
+            UNIQUE(mes, ano, descricao)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS categorias (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL UNIQUE,
+            icone TEXT NOT NULL
+        )
+    ''')
+
+
+@migracao(2, "valores em centavos e datas ISO")
+def _centavos_e_datas_iso(conn):
+    """Valores passam a ser centavos inteiros (colunas *_centavos) e a data das despesas
+    fica só em 'data_iso' (YYYY-MM-DD, validada); a coluna 'data' (DD/MM/YYYY) sai.
+    'resumo_mensal' é recriada com totais em centavos. Os gatilhos antigos são removidos
+    aqui e recriados pelo Database com as colunas novas."""
+    for tabela in ("despesas", "receitas_extras"):
+        for operacao in ("insert", "delete", "update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_resumo_{tabela}_{operacao}")
+
+    _reescrever_tabela(conn, "despesas", '''
+        CREATE TABLE {tabela} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data_iso TEXT NOT NULL CHECK (data_iso GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'),
+            tipo TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            descricao TEXT,
+            valor_centavos INTEGER NOT NULL,
+            recorrencia_meses INTEGER DEFAULT 0,
+            hash_importacao TEXT
+        )''',
+        ["id", "data_iso", "tipo", "categoria", "descricao", "valor_centavos", "recorrencia_meses", "hash_importacao"],
+        ["id", "COALESCE(data_iso, substr(data, 7, 4) || '-' || substr(data, 4, 2) || '-' || substr(data, 1, 2))",
+         "tipo", "categoria", "descricao", "CAST(round(valor * 100) AS INTEGER)", "recorrencia_meses", "hash_importacao"],
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_despesas_data_iso ON despesas (data_iso)")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_despesas_hash_importacao ON despesas (hash_importacao)")
+
+    _reescrever_tabela(conn, "recorrencias", '''
+        CREATE TABLE {tabela} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            descricao TEXT,
+            valor_centavos INTEGER NOT NULL,
+            dia INTEGER NOT NULL,
+            periodo_inicio INTEGER NOT NULL,
+            meses INTEGER
+        )''',
+        ["id", "tipo", "categoria", "descricao", "valor_centavos", "dia", "periodo_inicio", "meses"],
+        ["id", "tipo", "categoria", "descricao", "CAST(round(valor * 100) AS INTEGER)", "dia", "periodo_inicio", "meses"],
+    )
+    _reescrever_tabela(conn, "recorrencias_excecoes", '''
+        CREATE TABLE {tabela} (
+            recorrencia_id INTEGER NOT NULL,
+            periodo INTEGER NOT NULL,
+            valor_centavos INTEGER,
+            removida INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (recorrencia_id, periodo)
+        ) WITHOUT ROWID''',
+        ["recorrencia_id", "periodo", "valor_centavos", "removida"],
+        ["recorrencia_id", "periodo", "CAST(round(valor * 100) AS INTEGER)", "removida"],
+    )
+    _reescrever_tabela(conn, "configuracoes", '''
+        CREATE TABLE {tabela} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            salario_1_centavos INTEGER NOT NULL DEFAULT 0,
+            salario_2_centavos INTEGER NOT NULL DEFAULT 0
+        )''',
+        ["id", "salario_1_centavos", "salario_2_centavos"],
+        ["id", "CAST(round(COALESCE(salario_1, 0) * 100) AS INTEGER)", "CAST(round(COALESCE(salario_2, 0) * 100) AS INTEGER)"],
+    )
+    _reescrever_tabela(conn, "receitas_extras", '''
+        CREATE TABLE {tabela} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mes INTEGER NOT NULL,
+            ano INTEGER NOT NULL,
+            descricao TEXT,
+            valor_centavos INTEGER NOT NULL,
+            UNIQUE(mes, ano, descricao)
+        )''',
+        ["id", "mes", "ano", "descricao", "valor_centavos"],
+        ["id", "mes", "ano", "descricao", "CAST(round(valor * 100) AS INTEGER)"],
+    )
+
+    conn.execute("DROP TABLE IF EXISTS resumo_mensal")
+    conn.execute('''
+        CREATE TABLE resumo_mensal (
+            ano INTEGER NOT NULL,
+            mes INTEGER NOT NULL,
+            categoria TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            total_centavos INTEGER NOT NULL DEFAULT 0,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (ano, mes, categoria, tipo)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        INSERT INTO resumo_mensal
+        SELECT CAST(substr(data_iso, 1, 4) AS INTEGER), CAST(substr(data_iso, 6, 2) AS INTEGER),
+               categoria, tipo, SUM(valor_centavos), COUNT(*)
+        FROM despesas
+        GROUP BY 1, 2, 3, 4
+        UNION ALL
+        SELECT ano, mes, '', 'Receita Extra', SUM(valor_centavos), COUNT(*)
+        FROM receitas_extras
+        GROUP BY ano, mes
+    ''')
+
+
+@migracao(3, "busca textual")
+def _busca_textual(conn):
+    """Índice FTS5 de descrição e categoria das despesas e das regras de recorrência
+    (rowid negativo). Acentos e maiúsculas são ignorados na busca. Os gatilhos que o
+    mantêm em dia são criados pelo Database."""
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE busca_despesas USING fts5(
+                descricao, categoria, tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        raise Exception(f"O SQLite desta instalação não tem suporte a FTS5 ({e}).")
+    conn.execute("""
+        INSERT INTO busca_despesas (rowid, descricao, categoria)
+        SELECT id, descricao, categoria FROM despesas
+        UNION ALL
+        SELECT -id, descricao, categoria FROM recorrencias
+    """)
+
+
+@migracao(4, "índice por categoria")
+def _indice_categoria(conn):
+    """Índice (categoria, data_iso) para a listagem paginada filtrada por categoria: como
+    o id (rowid) é a última coluna implícita do índice, as linhas já saem na ordem
+    (data_iso, id) da paginação por chave, sem varrer o histórico inteiro."""
+    conn.execute("CREATE INDEX idx_despesas_categoria_data ON despesas (categoria, data_iso)")
+
+
+@migracao(5, "orçamentos por categoria")
+def _orcamentos(conn):
+    """Limite de gasto por categoria (o mesmo texto de despesas.categoria) e mês. O gasto
+    acumulado do mês é mantido pelos gatilhos do Database e calculado aqui só uma vez."""
+    conn.execute('''
+        CREATE TABLE orcamentos (
+            ano INTEGER NOT NULL,
+            mes INTEGER NOT NULL,
+            categoria TEXT NOT NULL,
+            limite_centavos INTEGER NOT NULL CHECK (limite_centavos > 0),
+            gasto_centavos INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (ano, mes, categoria)
+        ) WITHOUT ROWID
+    ''')
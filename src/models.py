@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from heapq import merge
+from typing import NamedTuple, Optional, Tuple
+
+
+class Despesa(NamedTuple):
+    """Linha de despesa do mês. Ocorrências de recorrências têm id None e recorrencia_id preenchido."""
+    id: Optional[int]
+    data: str
+    tipo: str
+    categoria: str
+    descricao: str
+    valor: float
+    recorrencia_meses: Optional[int]
+    data_iso: str
+    recorrencia_id: Optional[int] = None
+
+    @property
+    def chave(self) -> str:
+        """Identificador estável da linha, válido também para ocorrências de recorrências."""
+        if self.recorrencia_id is not None:
+            return f"r{self.recorrencia_id}:{self.data_iso[:7]}"
+        return f"d{self.id}"
+
+
+class ReceitaExtra(NamedTuple):
+    id: int
+    descricao: str
+    valor: float
+
+
+class Categoria(NamedTuple):
+    nome: str
+    icone: str
+
+
+class TotalCategoria(NamedTuple):
+    categoria: str
+    total: float
+
+
+class TotalGrupo(NamedTuple):
+    """Total de despesas de um grupo (categoria ou tipo) num mês."""
+    grupo: str
+    total: float
+
+
+class TotalMes(NamedTuple):
+    """Receita, despesas e saldo de um mês; 'grupos' traz as despesas agrupadas
+    (por categoria ou tipo), em ordem decrescente de total, quando pedido."""
+    mes: int
+    ano: int
+    receita: float
+    despesas: float
+    saldo: float
+    grupos: Tuple[TotalGrupo, ...] = ()
+
+
+# Percentuais do limite a partir dos quais um orçamento entra em alerta
+LIMIARES_ALERTA_ORCAMENTO = (80, 100)
+
+
+class Orcamento(NamedTuple):
+    """Limite de gasto de uma categoria num mês e o quanto já foi gasto (despesas gravadas
+    e ocorrências de recorrências), em reais."""
+    categoria: str
+    mes: int
+    ano: int
+    limite: float
+    gasto: float
+
+    @property
+    def percentual(self) -> float:
+        return 100 * self.gasto / self.limite
+
+    @property
+    def alerta(self) -> int:
+        """Maior limiar de LIMIARES_ALERTA_ORCAMENTO atingido (0 = sem alerta)."""
+        return max((limiar for limiar in LIMIARES_ALERTA_ORCAMENTO if self.percentual >= limiar), default=0)
+
+
+@dataclass(frozen=True)
+class SnapshotMes:
+    """Fotografia imutável de um mês: tudo o que a tela precisa para se atualizar."""
+    mes: int
+    ano: int
+    salarios: Tuple[float, float]
+    receitas_extras: Tuple[ReceitaExtra, ...]
+    receita_total: float
+    despesas_total: float
+    saldo: float
+    despesas_fixas: Tuple[Despesa, ...]
+    despesas_variaveis: Tuple[Despesa, ...]
+    por_categoria: Tuple[TotalCategoria, ...]
+    # As listas trazem só a primeira página de cada tipo; o restante vem de
+    # FinanceiroController.paginar_despesas a partir destes tokens (None = lista completa)
+    continuacao_fixas: Optional[str] = None
+    continuacao_variaveis: Optional[str] = None
+    # Orçamentos do mês, do mais consumido para o menos
+    orcamentos: Tuple[Orcamento, ...] = ()
+
+    @property
+    def despesas(self) -> Tuple[Despesa, ...]:
+        """Despesas carregadas no snapshot (fixas e variáveis), em ordem de data."""
+        return tuple(merge(self.despesas_fixas, self.despesas_variaveis, key=lambda d: d.data_iso))
+
+    @property
+    def alertas_orcamento(self) -> Tuple[Orcamento, ...]:
+        """Orçamentos que atingiram algum limiar de alerta."""
+        return tuple(orcamento for orcamento in self.orcamentos if orcamento.alerta)
+
+
+class PaginaDespesas(NamedTuple):
+    """Uma página da listagem paginada por chave (FinanceiroController.paginar_despesas).
+    'continuacao' é o token que busca a página seguinte; None na última página."""
+    despesas: Tuple[Despesa, ...]
+    continuacao: Optional[str]
+
+
+class ResultadoBusca(NamedTuple):
+    """Uma página de resultados da busca textual, do mais relevante para o menos.
+    Regras de recorrência aparecem uma vez, com a data da primeira ocorrência."""
+    despesas: Tuple[Despesa, ...]
+    total: int
+    pagina: int
+    por_pagina: int
+
+    @property
+    def paginas(self) -> int:
+        return max(1, -(-self.total // self.por_pagina))
+
+
+class ResultadoImportacao(NamedTuple):
+    """Resumo de uma importação de extrato bancário."""
+    lidas: int
+    importadas: int
+    duplicadas: int
+    ignoradas: int
+    segundos: float
+
+    @property
+    def por_segundo(self) -> float:
+        """Transações lidas por segundo."""
+        return self.lidas / self.segundos if self.segundos else 0.0
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+# Horizonte máximo da projeção, em meses
+MAX_MESES_PROJECAO = 120
+
+COLUNAS_PROJECAO = [
+    "mes", "ano", "receita", "despesas_recorrentes", "despesas_lancadas", "despesas", "saldo", "saldo_acumulado",
+]
+
+
+def projetar(periodo_inicio: int, meses: int, salarios: int, lancamentos: list, recorrencias: list,
+             excecoes: list, saldo_inicial: int = 0) -> pd.DataFrame:
+    """
+    Fluxo de caixa dos 'meses' meses a partir de periodo_inicio (ano * 12 + mes - 1),
+    calculado de uma vez sobre vetores e sobre a matriz regras x meses das recorrências,
+    sem laço por mês. Entradas em centavos:
+
+    - salarios: soma mensal dos salários, igual em todos os meses
+    - lancamentos: (periodo, receitas_extras, despesas) já gravados em cada mês
+    - recorrencias: (id, valor, periodo_inicio, meses), ordenadas por id; meses < 0 = sem fim
+    - excecoes: (recorrencia_id, periodo, valor efetivo), com 0 nas ocorrências removidas
+
+    Retorna um DataFrame com COLUNAS_PROJECAO, um mês por linha, valores em reais.
+    """
+    periodos = periodo_inicio + np.arange(meses)
+    extras = np.zeros(meses, dtype=np.int64)
+    lancadas = np.zeros(meses, dtype=np.int64)
+    recorrentes = np.zeros(meses, dtype=np.int64)
+
+    if lancamentos:
+        periodo, receitas_extras, despesas = np.asarray(lancamentos, dtype=np.int64).T
+        dentro = (periodo >= periodo_inicio) & (periodo < periodo_inicio + meses)
+        np.add.at(extras, periodo[dentro] - periodo_inicio, receitas_extras[dentro])
+        np.add.at(lancadas, periodo[dentro] - periodo_inicio, despesas[dentro])
+
+    if recorrencias:
+        ids, valores, inicios, duracoes = np.asarray(recorrencias, dtype=np.int64).T
+        fins = np.where(duracoes < 0, np.iinfo(np.int64).max, inicios + duracoes)
+        # ativas[r, m]: a regra r tem ocorrência no m-ésimo mês do horizonte
+        ativas = (periodos >= inicios[:, None]) & (periodos < fins[:, None])
+        matriz = np.where(ativas, valores[:, None], 0)
+
+        if excecoes:
+            recorrencia_id, periodo, valor = np.asarray(excecoes, dtype=np.int64).T
+            linha = np.searchsorted(ids, recorrencia_id)
+            coluna = periodo - periodo_inicio
+            # Exceções de regras ou meses fora do horizonte (ou inativos) não têm efeito
+            validas = (linha < len(ids)) & (coluna >= 0) & (coluna < meses)
+            validas[validas] &= ids[linha[validas]] == recorrencia_id[validas]
+            validas[validas] &= ativas[linha[validas], coluna[validas]]
+            matriz[linha[validas], coluna[validas]] = valor[validas]
+
+        recorrentes = matriz.sum(axis=0)
+
+    receita = salarios + extras
+    despesas = recorrentes + lancadas
+    saldo = receita - despesas
+    acumulado = saldo_inicial + np.cumsum(saldo)
+
+    return pd.DataFrame({
+        "mes": periodos % 12 + 1,
+        "ano": periodos // 12,
+        "receita": receita / 100,
+        "despesas_recorrentes": recorrentes / 100,
+        "despesas_lancadas": lancadas / 100,
+        "despesas": despesas / 100,
+        "saldo": saldo / 100,
+        "saldo_acumulado": acumulado / 100,
+    }, columns=COLUNAS_PROJECAO)
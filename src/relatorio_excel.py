@@ -0,0 +1,123 @@
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
+
+# Colunas das planilhas mensais do relatório Excel
+COLUNAS_RELATORIO = ["ID", "Data", "Tipo", "Categoria", "Descrição", "Valor (R$)"]
+COLUNAS_RESUMO = ["Mês", "Receita (R$)", "Despesas (R$)", "Saldo (R$)"]
+FORMATO_MOEDA = 'R$ #,##0.00'
+
+
+def _estilos_relatorio() -> list:
+    """Estilos nomeados do relatório. Registrados uma vez por Workbook, são
+    compartilhados por todas as células em vez de copiados célula a célula."""
+    return [
+        NamedStyle("cabecalho", font=Font(bold=True, color="FFFFFF"),
+                   fill=PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid"),
+                   alignment=Alignment(horizontal="center")),
+        NamedStyle("moeda", number_format=FORMATO_MOEDA),
+        NamedStyle("rotulo", font=Font(bold=True)),
+        NamedStyle("rotulo_despesa", font=Font(bold=True, color="FF0000")),
+        NamedStyle("saldo_positivo", font=Font(color="006100", bold=True), number_format=FORMATO_MOEDA),
+        NamedStyle("saldo_negativo", font=Font(color="9C0006", bold=True), number_format=FORMATO_MOEDA),
+    ]
+
+
+def _celula(ws, valor, estilo: str):
+    """Célula de planilha write-only com um dos estilos nomeados do relatório."""
+    celula = WriteOnlyCell(ws, value=valor)
+    celula.style = estilo
+    return celula
+
+
+def _larguras(linhas) -> list:
+    """Largura de cada coluna (maior texto + 2), calculada antes de a planilha ser escrita."""
+    larguras = []
+    for linha in linhas:
+        for indice, valor in enumerate(linha):
+            tamanho = len(str(valor)) if valor is not None else 0
+            if indice == len(larguras):
+                larguras.append(tamanho)
+            elif tamanho > larguras[indice]:
+                larguras[indice] = tamanho
+    return [largura + 2 for largura in larguras]
+
+
+def _definir_larguras(ws, larguras: list):
+    # Em modo write-only as larguras precisam ser definidas antes da primeira linha
+    for indice, largura in enumerate(larguras):
+        ws.column_dimensions[get_column_letter(indice + 1)].width = largura
+
+
+def novo_workbook():
+    """Workbook write-only com os estilos nomeados do relatório já registrados."""
+    wb = Workbook(write_only=True)
+    for estilo in _estilos_relatorio():
+        wb.add_named_style(estilo)
+    return wb
+
+
+def escrever_planilha_mes(wb, titulo: str, despesas: list, receita_total: float, total_despesas: float):
+    """Escreve a planilha de um mês: despesas, seguidas de receita, despesas e saldo."""
+    ws = wb.create_sheet(titulo)
+    saldo = receita_total - total_despesas
+    rodape = [
+        ("RECEITA TOTAL:", receita_total, "rotulo", "moeda"),
+        ("TOTAL DESPESAS:", total_despesas, "rotulo_despesa", "moeda"),
+        ("SALDO FINAL:", saldo, "rotulo", "saldo_positivo" if saldo >= 0 else "saldo_negativo"),
+    ]
+
+    _definir_larguras(ws, _larguras(
+        [COLUNAS_RELATORIO] + despesas + [(None,) * 4 + (rotulo, valor) for rotulo, valor, _, _ in rodape]
+    ))
+
+    ws.append([_celula(ws, titulo_coluna, "cabecalho") for titulo_coluna in COLUNAS_RELATORIO])
+    for despesa_id, data, tipo, categoria, descricao, valor in despesas:
+        # Ocorrências de recorrência não têm id
+        ws.append([despesa_id, data, tipo, categoria, descricao, _celula(ws, valor, "moeda")])
+
+    ws.append([])
+    for rotulo, valor, estilo_rotulo, estilo_valor in rodape:
+        ws.append([None] * 4 + [_celula(ws, rotulo, estilo_rotulo), _celula(ws, valor, estilo_valor)])
+
+
+def escrever_planilha_resumo(ws, resumo: list):
+    """Escreve a planilha de resumo: receita, despesas e saldo de cada mês, mais o total."""
+    receita = sum(linha[1] for linha in resumo)
+    despesas = sum(linha[2] for linha in resumo)
+    total = ("TOTAL", receita, despesas, receita - despesas)
+
+    _definir_larguras(ws, _larguras([COLUNAS_RESUMO] + resumo + [total]))
+
+    ws.append([_celula(ws, titulo_coluna, "cabecalho") for titulo_coluna in COLUNAS_RESUMO])
+    for mes, receita_mes, despesas_mes, saldo_mes in resumo + [total]:
+        ws.append([
+            _celula(ws, mes, "rotulo") if mes == "TOTAL" else mes,
+            _celula(ws, receita_mes, "moeda"),
+            _celula(ws, despesas_mes, "moeda"),
+            _celula(ws, saldo_mes, "saldo_positivo" if saldo_mes >= 0 else "saldo_negativo"),
+        ])
+
+
+def escrever_planilha_categorias(ws, totais: list):
+    """Escreve a planilha de despesas por categoria: uma linha por categoria, uma coluna
+    por mês (TotalMes com grupos por categoria) e o total, da maior para a menor."""
+    meses = [f"{total.mes:02d}/{total.ano}" for total in totais]
+    por_categoria = {}
+    for indice, total in enumerate(totais):
+        for grupo in total.grupos:
+            por_categoria.setdefault(grupo.grupo, [0.0] * len(totais))[indice] += grupo.total
+    linhas = sorted(
+        ((categoria, *valores, round(sum(valores), 2)) for categoria, valores in por_categoria.items()),
+        key=lambda linha: linha[-1], reverse=True
+    )
+    cabecalho = ["Categoria"] + meses + ["Total (R$)"]
+
+    _definir_larguras(ws, _larguras(
+        [cabecalho] + [(categoria,) + tuple(f"R$ {valor:,.2f}" for valor in valores) for categoria, *valores in linhas]
+    ))
+
+    ws.append([_celula(ws, titulo_coluna, "cabecalho") for titulo_coluna in cabecalho])
+    for categoria, *valores in linhas:
+        ws.append([categoria] + [_celula(ws, valor, "moeda") for valor in valores])
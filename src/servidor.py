@@ -0,0 +1,351 @@
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Lock
+from urllib.parse import parse_qs, urlsplit
+
+from src.controllers import FinanceiroController
+from src.database import Database
+
+# Threads que atendem as requisições; cada uma mantém a sua conexão SQLite, então este é
+# também o tamanho do pool de conexões de leitura (as escritas usam mais uma, só delas)
+LEITORES_PADRAO = 4
+
+# Maior corpo aceito num POST/PUT, em bytes
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+
+
+def _para_json(valor):
+    """Converte os retornos do controller (NamedTuples, SnapshotMes, DataFrames, escalares
+    NumPy) em estruturas serializáveis por json."""
+    if hasattr(valor, "_asdict"):
+        return {chave: _para_json(item) for chave, item in valor._asdict().items()}
+    if dataclasses.is_dataclass(valor):
+        return {campo.name: _para_json(getattr(valor, campo.name)) for campo in dataclasses.fields(valor)}
+    if isinstance(valor, (list, tuple)):
+        return [_para_json(item) for item in valor]
+    if isinstance(valor, dict):
+        return {chave: _para_json(item) for chave, item in valor.items()}
+    if hasattr(valor, "columns") and hasattr(valor, "to_dict"):
+        return _para_json(valor.to_dict("records"))
+    if hasattr(valor, "item"):
+        return valor.item()
+    return valor
+
+
+def _mes_ano(texto: str) -> tuple:
+    """'MM/AAAA' (ou 'MM-AAAA') -> (mes, ano)."""
+    try:
+        mes, ano = (int(parte) for parte in re.split(r"[/-]", texto))
+    except (ValueError, TypeError):
+        raise ValueError(f"Mês inválido: {texto}. Use MM/AAAA.")
+    if not 1 <= mes <= 12:
+        raise ValueError(f"Mês inválido: {texto}. Use MM/AAAA.")
+    return mes, ano
+
+
+class Requisicao:
+    """Dados de uma requisição já interpretados, entregues às funções de ROTAS: grupos da
+    URL, parâmetros da query string (último valor de cada um) e corpo JSON."""
+
+    def __init__(self, grupos: dict, parametros: dict, corpo: dict):
+        self.grupos = grupos
+        self.parametros = parametros
+        self.corpo = corpo
+
+    def inteiro(self, nome: str) -> int:
+        return int(self.grupos[nome])
+
+    def parametro(self, nome: str, padrao=None, tipo=str):
+        valor = self.parametros.get(nome)
+        if valor in (None, ""):
+            return padrao
+        try:
+            return tipo(valor)
+        except ValueError:
+            raise ValueError(f"Parâmetro inválido: {nome}={valor}")
+
+    def campo(self, nome: str, padrao=...):
+        if nome in self.corpo:
+            return self.corpo[nome]
+        if padrao is ...:
+            raise ValueError(f"Campo obrigatório ausente: {nome}")
+        return padrao
+
+
+def _configuracoes(c, r):
+    salario_1, salario_2 = c.get_configuracoes()
+    return {"salario_1": salario_1, "salario_2": salario_2}
+
+
+def _paginar(c, r, mes=None, ano=None):
+    return c.paginar_despesas(
+        r.parametro("continuacao"), r.parametro("tamanho", 100, int), mes=mes, ano=ano,
+        categoria=r.parametro("categoria"), tipo=r.parametro("tipo"),
+        decrescente=r.parametro("ordem") == "desc",
+    )
+
+
+def _buscar(c, r):
+    return c.buscar(
+        r.parametro("texto", ""), r.parametro("pagina", 1, int),
+        data_inicio=r.parametro("de"), data_fim=r.parametro("ate"), tipo=r.parametro("tipo"),
+        valor_min=r.parametro("valor_min", tipo=float), valor_max=r.parametro("valor_max", tipo=float),
+    )
+
+
+def _adicionar_despesa(c, r):
+    c.adicionar_despesa(
+        r.campo("data"), r.campo("tipo", "Variável"), r.campo("categoria"), r.campo("descricao"),
+        float(r.campo("valor")), int(r.campo("recorrencia_meses", 0)), bool(r.campo("sem_fim", False)),
+    )
+
+
+# (método, caminho, função(controller, Requisicao), escrita). Caminhos são expressões
+# regulares; grupos nomeados viram Requisicao.grupos.
+ROTAS = [
+    ("GET", r"/api/configuracoes", _configuracoes, False),
+    ("GET", r"/api/categorias", lambda c, r: c.buscar_categorias(), False),
+    ("GET", r"/api/meses/(?P<ano>\d{4})/(?P<mes>0?[1-9]|1[0-2])",
+     lambda c, r: c.snapshot_mes(r.inteiro("mes"), r.inteiro("ano")), False),
+    ("GET", r"/api/meses/(?P<ano>\d{4})/(?P<mes>0?[1-9]|1[0-2])/despesas",
+     lambda c, r: _paginar(c, r, r.inteiro("mes"), r.inteiro("ano")), False),
+    ("GET", r"/api/meses/(?P<ano>\d{4})/(?P<mes>0?[1-9]|1[0-2])/orcamentos",
+     lambda c, r: c.buscar_orcamentos(r.inteiro("mes"), r.inteiro("ano")), False),
+    ("GET", r"/api/despesas", _paginar, False),
+    ("GET", r"/api/totais", lambda c, r: c.totais_periodo(
+        _mes_ano(r.parametro("inicio")), _mes_ano(r.parametro("fim", r.parametro("inicio"))),
+        r.parametro("agrupar")), False),
+    ("GET", r"/api/projecao", lambda c, r: c.projetar_fluxo(
+        _mes_ano(r.parametro("inicio")), r.parametro("meses", 12, int), r.parametro("saldo_inicial", 0.0, float)),
+     False),
+    ("GET", r"/api/busca", _buscar, False),
+
+    ("POST", r"/api/despesas", _adicionar_despesa, True),
+    ("DELETE", r"/api/despesas/(?P<id>\d+)", lambda c, r: c.excluir_despesa(r.inteiro("id")), True),
+    ("DELETE", r"/api/recorrencias/(?P<id>\d+)", lambda c, r: c.excluir_recorrencia(r.inteiro("id")), True),
+    ("POST", r"/api/receitas-extras", lambda c, r: c.adicionar_receita_extra(
+        int(r.campo("mes")), int(r.campo("ano")), r.campo("descricao"), float(r.campo("valor"))), True),
+    ("DELETE", r"/api/receitas-extras/(?P<id>\d+)", lambda c, r: c.excluir_receita_extra(r.inteiro("id")), True),
+    ("PUT", r"/api/configuracoes", lambda c, r: c.salvar_configuracoes(
+        float(r.campo("salario_1")), float(r.campo("salario_2"))), True),
+    ("POST", r"/api/categorias", lambda c, r: c.adicionar_categoria(r.campo("nome"), r.campo("icone")), True),
+    ("PUT", r"/api/orcamentos", lambda c, r: c.definir_orcamento(
+        r.campo("categoria"), int(r.campo("mes")), int(r.campo("ano")), float(r.campo("limite")),
+        int(r.campo("meses", 1))), True),
+    ("DELETE", r"/api/orcamentos", lambda c, r: c.excluir_orcamento(
+        r.campo("categoria"), int(r.campo("mes")), int(r.campo("ano")), int(r.campo("meses", 1))), True),
+]
+
+_ROTAS_COMPILADAS = [(metodo, re.compile(caminho + "/?"), funcao, escrita) for metodo, caminho, funcao, escrita in ROTAS]
+
+
+class ServidorApi(HTTPServer):
+    """
+    Servidor HTTP/JSON local sobre o FinanceiroController.
+
+    As requisições são atendidas por um pool fixo de 'leitores' threads, cada uma com a sua
+    conexão persistente do Database: as leituras rodam em paralelo (WAL) e o número de
+    conexões fica limitado. As escritas são encaminhadas a uma thread única, então nunca
+    disputam o lock de escrita do SQLite entre si. Alterações feitas no banco por outro
+    processo (ex.: a interface gráfica) são detectadas pelo arquivo do banco e invalidam o
+    cache do controller.
+    """
+
+    def __init__(self, endereco: tuple, controller: FinanceiroController, leitores: int = LEITORES_PADRAO):
+        super().__init__(endereco, ManipuladorApi)
+        self.controller = controller
+        self._leitores = ThreadPoolExecutor(max_workers=leitores, thread_name_prefix="api")
+        self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-escrita")
+        self._lock_assinatura = Lock()
+        self._assinatura = self._assinatura_arquivos()
+
+    def process_request(self, request, client_address):
+        self._leitores.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def escrever(self, funcao, *args):
+        """Executa funcao(*args) na thread de escrita e devolve o resultado."""
+        return self._escritor.submit(self._escrever, funcao, *args).result()
+
+    def _escrever(self, funcao, *args):
+        try:
+            return funcao(*args)
+        finally:
+            # A própria escrita alterou os arquivos: não é uma alteração externa
+            with self._lock_assinatura:
+                self._assinatura = self._assinatura_arquivos()
+
+    def sincronizar(self):
+        """Invalida o cache do controller se o banco mudou desde a última verificação."""
+        assinatura = self._assinatura_arquivos()
+        with self._lock_assinatura:
+            if assinatura == self._assinatura:
+                return
+            self._assinatura = assinatura
+        self.controller.invalidar_cache()
+
+    @staticmethod
+    def _assinatura_arquivos() -> tuple:
+        # Em WAL, cada commit grava no arquivo -wal; o principal muda nos checkpoints
+        assinatura = []
+        for caminho in (Database.DB_NAME, Database.DB_NAME + "-wal"):
+            try:
+                estado = os.stat(caminho)
+                assinatura.append((estado.st_mtime_ns, estado.st_size))
+            except OSError:
+                assinatura.append(None)
+        return tuple(assinatura)
+
+    def server_close(self):
+        super().server_close()
+        self._leitores.shutdown(wait=True)
+        self._escritor.shutdown(wait=True)
+
+
+class ManipuladorApi(BaseHTTPRequestHandler):
+    """Despacha cada requisição para a rota correspondente em ROTAS. Respostas de GET levam
+    um ETag (hash do corpo): com If-None-Match igual, a resposta é 304 sem corpo, então um
+    cliente pode revalidar um mês sem baixá-lo de novo."""
+
+    server_version = "DavydsonFinancas"
+
+    def do_GET(self):
+        self._despachar("GET")
+
+    def do_POST(self):
+        self._despachar("POST")
+
+    def do_PUT(self):
+        self._despachar("PUT")
+
+    def do_DELETE(self):
+        self._despachar("DELETE")
+
+    def _despachar(self, metodo: str):
+        url = urlsplit(self.path)
+        rota, metodos = None, set()
+        for metodo_rota, padrao, funcao, escrita in _ROTAS_COMPILADAS:
+            correspondencia = padrao.fullmatch(url.path)
+            if correspondencia:
+                metodos.add(metodo_rota)
+                if metodo_rota == metodo:
+                    rota = (funcao, escrita, correspondencia.groupdict())
+        if rota is None:
+            if metodos:
+                self._responder(HTTPStatus.METHOD_NOT_ALLOWED, {"erro": f"Método {metodo} não permitido."},
+                                {"Allow": ", ".join(sorted(metodos))})
+            else:
+                self._responder(HTTPStatus.NOT_FOUND, {"erro": f"Rota não encontrada: {url.path}"})
+            return
+
+        funcao, escrita, grupos = rota
+        try:
+            parametros = {nome: valores[-1] for nome, valores in parse_qs(url.query).items()}
+            requisicao = Requisicao(grupos, parametros, self._ler_corpo() if escrita else {})
+            if escrita:
+                resultado = self.server.escrever(funcao, self.server.controller, requisicao)
+            else:
+                self.server.sincronizar()
+                resultado = funcao(self.server.controller, requisicao)
+        except sqlite3.Error as e:
+            self._responder(HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"Erro no banco de dados: {e}"})
+            return
+        except Exception as e:
+            # O controller sinaliza dados inválidos com Exception/ValueError
+            self._responder(HTTPStatus.BAD_REQUEST, {"erro": str(e)})
+            return
+
+        if escrita and resultado is False:
+            # Exclusões retornam False quando o registro não existia
+            self._responder(HTTPStatus.NOT_FOUND, {"erro": "Registro não encontrado."})
+        elif escrita:
+            self._responder(HTTPStatus.CREATED if metodo == "POST" else HTTPStatus.OK, {"ok": True})
+        else:
+            self._responder(HTTPStatus.OK, _para_json(resultado), etag=True)
+
+    def _ler_corpo(self) -> dict:
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            tamanho = -1
+        # Um tamanho negativo faria rfile.read esperar até o cliente fechar a conexão
+        if tamanho < 0:
+            raise ValueError("Content-Length inválido.")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ValueError("Corpo da requisição grande demais.")
+        if not tamanho:
+            return {}
+        try:
+            corpo = json.loads(self.rfile.read(tamanho))
+        except ValueError:
+            raise ValueError("Corpo da requisição não é um JSON válido.")
+        if not isinstance(corpo, dict):
+            raise ValueError("O corpo da requisição deve ser um objeto JSON.")
+        return corpo
+
+    def _responder(self, status: HTTPStatus, dados, cabecalhos: dict = None, etag: bool = False):
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        cabecalhos = dict(cabecalhos or {})
+        if etag:
+            cabecalhos["ETag"] = f'"{hashlib.sha1(corpo).hexdigest()[:20]}"'
+            # O cliente pode guardar a resposta, mas deve revalidá-la a cada uso
+            cabecalhos["Cache-Control"] = "no-cache"
+            pedidos = [valor.strip() for valor in self.headers.get("If-None-Match", "").split(",")]
+            if cabecalhos["ETag"] in pedidos or "*" in pedidos:
+                status, corpo = HTTPStatus.NOT_MODIFIED, b""
+        self.send_response(status)
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, format, *args):
+        # Sem log de cada requisição no terminal; erros continuam em handle_error
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.servidor", description="Servidor HTTP/JSON local do Davydson Finanças."
+    )
+    parser.add_argument("--banco", default=Database.DB_NAME, help="arquivo do banco (padrão: %(default)s)")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="endereço de escuta (padrão: %(default)s, só esta máquina; 0.0.0.0 abre para a rede)")
+    parser.add_argument("--porta", type=int, default=8765, help="porta (padrão: %(default)s)")
+    parser.add_argument("--leitores", type=int, default=LEITORES_PADRAO,
+                        help="threads/conexões de leitura (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    Database.usar_arquivo(args.banco)
+    servidor = ServidorApi((args.host, args.porta), FinanceiroController(), args.leitores)
+    print(f"Servidor em http://{args.host}:{servidor.server_port}/api (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TarefaDescartada(Exception):
+    """Indica que a tarefa ficou obsoleta antes de começar e não foi executada."""
+
+
+class ExecutorTk:
+    """
+    Executa chamadas (banco, pandas, exportações) numa thread de trabalho e entrega
+    os resultados na thread do Tk, via uma fila verificada com after().
+
+    Cada tarefa pertence a um canal (ex.: "refresh"). Ao submeter uma nova tarefa
+    num canal, as anteriores do mesmo canal ficam obsoletas: se ainda não
+    começaram, nem rodam; se já terminaram, o resultado é descartado.
+    """
+
+    def __init__(self, widget, intervalo_ms: int = 30, ao_mudar_ocupado=None):
+        self._widget = widget
+        self._intervalo_ms = intervalo_ms
+        self._ao_mudar_ocupado = ao_mudar_ocupado
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="financas")
+        self._resultados = queue.SimpleQueue()
+        self._geracoes = {}
+        self._pendentes = 0
+        self._verificacao_agendada = None
+        self._encerrado = False
+
+    @property
+    def ocupado(self) -> bool:
+        return self._pendentes > 0
+
+    def submeter(self, canal: str, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """Agenda funcao(*args, **kwargs) na thread de trabalho. ao_concluir(resultado) ou
+        ao_falhar(excecao) são chamados depois, na thread do Tk, se a tarefa ainda for a
+        mais recente do canal."""
+        if self._encerrado:
+            return
+        geracao = self._geracoes.get(canal, 0) + 1
+        self._geracoes[canal] = geracao
+
+        def executar():
+            if self._geracoes.get(canal) != geracao:
+                raise TarefaDescartada()
+            return funcao(*args, **kwargs)
+
+        futuro = self._executor.submit(executar)
+        futuro.add_done_callback(
+            lambda f: self._resultados.put((canal, geracao, f, ao_concluir, ao_falhar))
+        )
+        self._pendentes += 1
+        self._notificar_ocupado()
+        self._agendar_verificacao()
+
+    def encerrar(self):
+        """Cancela as tarefas ainda não iniciadas e para de entregar resultados."""
+        self._encerrado = True
+        if self._verificacao_agendada is not None:
+            self._widget.after_cancel(self._verificacao_agendada)
+            self._verificacao_agendada = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- Internos (thread do Tk) ---
+
+    def _agendar_verificacao(self):
+        if self._verificacao_agendada is None and not self._encerrado:
+            self._verificacao_agendada = self._widget.after(self._intervalo_ms, self._verificar)
+
+    def _verificar(self):
+        self._verificacao_agendada = None
+        while True:
+            try:
+                canal, geracao, futuro, ao_concluir, ao_falhar = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._pendentes -= 1
+
+            # Resultado de uma tarefa que já foi substituída por outra mais nova
+            if self._geracoes.get(canal) != geracao or futuro.cancelled():
+                continue
+
+            erro = futuro.exception()
+            if erro is None:
+                if ao_concluir is not None:
+                    ao_concluir(futuro.result())
+            elif not isinstance(erro, TarefaDescartada):
+                if ao_falhar is not None:
+                    ao_falhar(erro)
+                else:
+                    print(f"Erro em tarefa de segundo plano ({canal}): {erro}")
+
+        self._notificar_ocupado()
+        if self._pendentes > 0:
+            self._agendar_verificacao()
+
+    def _notificar_ocupado(self):
+        if self._ao_mudar_ocupado is not None:
+            self._ao_mudar_ocupado(self.ocupado)
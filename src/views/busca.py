@@ -0,0 +1,140 @@
+import customtkinter as ctk
+from tkinter import messagebox, ttk
+
+# Espera (ms) depois da última tecla antes de buscar
+ATRASO_BUSCA = 250
+
+TIPOS = {"Todos": None, "Fixa": "Fixa", "Variável": "Variável"}
+
+COLUNAS = [
+    ("data", "Data", 90), ("descricao", "Descrição", 260), ("categoria", "Categoria", 160),
+    ("tipo", "Tipo", 80), ("valor", "Valor (R$)", 100),
+]
+
+
+class JanelaBusca(ctk.CTkToplevel):
+    """Busca textual no histórico inteiro (FinanceiroController.buscar), com filtros e
+    paginação. A busca roda enquanto se digita; duplo clique num resultado abre o mês dele."""
+
+    def __init__(self, master, controller, executor, texto: str = "", ao_abrir_mes=None):
+        super().__init__(master)
+        self.title("🔍 Buscar Despesas")
+        self.geometry("820x600")
+        self.controller = controller
+        self.executor = executor
+        self.ao_abrir_mes = ao_abrir_mes
+        self.pagina = 1
+        self._agendada = None
+        self._resultado = None
+
+        topo = ctk.CTkFrame(self, fg_color="transparent")
+        topo.pack(fill="x", padx=15, pady=(15, 5))
+        self.ent_texto = ctk.CTkEntry(topo, placeholder_text="Descrição ou categoria (ex.: farmácia)", height=36)
+        self.ent_texto.pack(fill="x")
+        self.ent_texto.insert(0, texto)
+        self.ent_texto.bind("<KeyRelease>", lambda _: self.agendar())
+
+        filtros = ctk.CTkFrame(self, fg_color="transparent")
+        filtros.pack(fill="x", padx=15, pady=5)
+        self.cmb_tipo = ctk.CTkComboBox(filtros, values=list(TIPOS), width=110, state="readonly",
+                                        command=lambda _: self.agendar())
+        self.cmb_tipo.set("Todos")
+        self.cmb_tipo.pack(side="left", padx=(0, 10))
+        self.ent_de = self._campo_filtro(filtros, "De (DD/MM/AAAA)")
+        self.ent_ate = self._campo_filtro(filtros, "Até (DD/MM/AAAA)")
+        self.ent_min = self._campo_filtro(filtros, "Valor mín.")
+        self.ent_max = self._campo_filtro(filtros, "Valor máx.")
+
+        self.tabela = ttk.Treeview(self, columns=[chave for chave, _, _ in COLUNAS], show="headings")
+        for chave, titulo, largura in COLUNAS:
+            self.tabela.heading(chave, text=titulo)
+            self.tabela.column(chave, width=largura, anchor="e" if chave == "valor" else "w")
+        self.tabela.pack(fill="both", expand=True, padx=15, pady=5)
+        self.tabela.bind("<Double-1>", self._abrir_mes)
+
+        rodape = ctk.CTkFrame(self, fg_color="transparent")
+        rodape.pack(fill="x", padx=15, pady=(5, 15))
+        self.btn_anterior = ctk.CTkButton(rodape, text="◀ Anterior", width=100, command=lambda: self._mudar_pagina(-1))
+        self.btn_anterior.pack(side="left")
+        self.btn_proxima = ctk.CTkButton(rodape, text="Próxima ▶", width=100, command=lambda: self._mudar_pagina(1))
+        self.btn_proxima.pack(side="left", padx=10)
+        self.lbl_status = ctk.CTkLabel(rodape, text="")
+        self.lbl_status.pack(side="right")
+
+        self.ent_texto.focus()
+        self.buscar()
+
+    def _campo_filtro(self, pai, dica: str):
+        campo = ctk.CTkEntry(pai, placeholder_text=dica, width=130)
+        campo.pack(side="left", padx=(0, 10))
+        campo.bind("<KeyRelease>", lambda _: self.agendar())
+        return campo
+
+    def definir_texto(self, texto: str):
+        self.ent_texto.delete(0, "end")
+        self.ent_texto.insert(0, texto)
+        self.agendar()
+
+    def agendar(self):
+        """Busca de novo (da primeira página) quando a digitação para por ATRASO_BUSCA ms."""
+        if self._agendada is not None:
+            self.after_cancel(self._agendada)
+        self.pagina = 1
+        self._agendada = self.after(ATRASO_BUSCA, self.buscar)
+
+    def buscar(self):
+        self._agendada = None
+        try:
+            valor_min = self._valor(self.ent_min.get())
+            valor_max = self._valor(self.ent_max.get())
+        except ValueError:
+            self.lbl_status.configure(text="Valor inválido nos filtros.")
+            return
+        # Buscas antigas ainda na fila são descartadas pelo executor (mesmo canal)
+        self.executor.submeter(
+            "busca", self.controller.buscar, self.ent_texto.get(), self.pagina,
+            data_inicio=self.ent_de.get().strip() or None,
+            data_fim=self.ent_ate.get().strip() or None,
+            tipo=TIPOS[self.cmb_tipo.get()],
+            valor_min=valor_min,
+            valor_max=valor_max,
+            ao_concluir=self._exibir,
+            ao_falhar=lambda e: self.lbl_status.configure(text=str(e)) if self.winfo_exists() else None
+        )
+
+    @staticmethod
+    def _valor(texto: str):
+        texto = texto.strip().replace(",", ".")
+        return float(texto) if texto else None
+
+    def _exibir(self, resultado):
+        if not self.winfo_exists():
+            return
+        self._resultado = resultado
+        self.tabela.delete(*self.tabela.get_children())
+        for indice, despesa in enumerate(resultado.despesas):
+            data = despesa.data if despesa.recorrencia_id is None else f"{despesa.data} 🔁"
+            self.tabela.insert("", "end", iid=str(indice), values=(
+                data, despesa.descricao, despesa.categoria, despesa.tipo, f"{despesa.valor:,.2f}"
+            ))
+        self.btn_anterior.configure(state="normal" if resultado.pagina > 1 else "disabled")
+        self.btn_proxima.configure(state="normal" if resultado.pagina < resultado.paginas else "disabled")
+        self.lbl_status.configure(
+            text=f"{resultado.total} resultado(s) — página {resultado.pagina} de {resultado.paginas}"
+            if resultado.total else "Nenhum resultado."
+        )
+
+    def _mudar_pagina(self, delta: int):
+        self.pagina = max(1, self.pagina + delta)
+        self.buscar()
+
+    def _abrir_mes(self, _):
+        selecao = self.tabela.selection()
+        if not selecao or self._resultado is None or self.ao_abrir_mes is None:
+            return
+        despesa = self._resultado.despesas[int(selecao[0])]
+        ano, mes = int(despesa.data_iso[:4]), int(despesa.data_iso[5:7])
+        try:
+            self.ao_abrir_mes(mes, ano)
+        except Exception as e:
+            messagebox.showerror("Erro", str(e), parent=self)
@@ -1,6 +1,5 @@
 import customtkinter as ctk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from src.views.grafico import GraficoRosca
 
 class DashboardView(ctk.CTkFrame):
     def __init__(self, master, controller, **kwargs):
@@ -20,7 +19,9 @@ class DashboardView(ctk.CTkFrame):
         # Área do Gráfico
         self.frame_grafico = ctk.CTkFrame(self, fg_color="transparent")
         self.frame_grafico.grid(row=1, column=0, columnspan=3, sticky="nsew", padx=10, pady=10)
-        self.canvas = None
+        # Tema Escuro (cor de fundo do CustomTkinter padrão); criado uma única vez
+        self.grafico = GraficoRosca(self.frame_grafico, cor_fundo='#2b2b2b', cor_texto='white',
+                                    titulo="Despesas por Categoria")
 
     def _criar_card(self, col, titulo, tipo_cor):
         frame = ctk.CTkFrame(self)
@@ -36,13 +37,13 @@ class DashboardView(ctk.CTkFrame):
         frame.lbl_valor = lbl_valor
         return frame
 
-    def atualizar_dashboard(self, mes, ano):
-        # 1. Buscar Dados
-        df = self.controller.buscar_despesas_mes(mes, ano)
-        salarios = self.controller.get_configuracoes()
-        receita = sum(salarios)
-        despesas = df['valor'].sum() if not df.empty else 0.0
-        saldo = receita - despesas
+    def atualizar_dashboard(self, mes, ano, snapshot=None):
+        # 1. Buscar Dados (ou reaproveitar o snapshot já lido por quem chamou)
+        if snapshot is None:
+            snapshot = self.controller.snapshot_mes(mes, ano)
+        receita = snapshot.receita_total
+        despesas = snapshot.despesas_total
+        saldo = snapshot.saldo
 
         # 2. Atualizar KPIs
         self.card_receita.lbl_valor.configure(text=f"R$ {receita:,.2f}", text_color="#2CC985")
@@ -52,35 +53,13 @@ class DashboardView(ctk.CTkFrame):
         self.card_saldo.lbl_valor.configure(text=f"R$ {saldo:,.2f}", text_color=cor_saldo)
 
         # 3. Atualizar Gráfico
-        self._plotar_grafico(df)
+        self._plotar_grafico(snapshot.por_categoria)
 
-    def _plotar_grafico(self, df):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-            plt.close('all')
-
-        if df.empty:
+    def _plotar_grafico(self, por_categoria):
+        if not por_categoria:
+            self.grafico.pack_forget()
             return
 
-        fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
-        # Tema Escuro para Matplotlib
-        fig.patch.set_facecolor('#2b2b2b') # Cor de fundo do CustomTkinter padrão
-        ax.set_facecolor('#2b2b2b')
-        
-        dados_cat = df.groupby('categoria')['valor'].sum()
-        
-        wedges, texts, autotexts = ax.pie(
-            dados_cat, 
-            labels=dados_cat.index, 
-            autopct='%1.1f%%',
-            startangle=90,
-            textprops=dict(color="white"),
-            wedgeprops=dict(width=0.4) # Donut
-        )
-        
-        plt.setp(autotexts, size=10, weight="bold")
-        ax.set_title("Despesas por Categoria", color="white")
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self.frame_grafico)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.grafico.pack(fill="both", expand=True)
+        self.grafico.atualizar([item.categoria for item in por_categoria],
+                               [item.total for item in por_categoria])
@@ -0,0 +1,118 @@
+import customtkinter as ctk
+from tkinter import messagebox, ttk
+
+MESES = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun", "Jul", "Ago", "Set", "Out", "Nov", "Dez"]
+
+# Rótulo do seletor -> meses projetados
+HORIZONTES = {"12 meses": 12, "24 meses": 24, "5 anos": 60, "10 anos": 120}
+
+COR_RECEITA = "#10B981"
+COR_DESPESA = "#EF4444"
+COR_SALDO = "#5B7FFF"
+
+
+class FluxoCaixa(ctk.CTkToplevel):
+    """Projeção do fluxo de caixa dos próximos meses (FinanceiroController.projetar_fluxo):
+    receita e despesas previstas em barras e o saldo acumulado em linha, com a tabela mês
+    a mês abaixo."""
+
+    def __init__(self, master, controller, executor, inicio: tuple):
+        super().__init__(master)
+        self.title("📈 Projeção de Fluxo de Caixa")
+        self.geometry("960x680")
+        self.controller = controller
+        self.executor = executor
+        self.inicio = inicio
+        self._canvas_grafico = None
+
+        barra = ctk.CTkFrame(self, fg_color="transparent")
+        barra.pack(fill="x", padx=15, pady=(15, 5))
+        ctk.CTkLabel(barra, text=f"A partir de {MESES[inicio[0] - 1]}/{inicio[1]}",
+                     font=("Segoe UI", 16, "bold")).pack(side="left")
+        self.cmb_horizonte = ctk.CTkComboBox(barra, values=list(HORIZONTES), width=120, state="readonly",
+                                             command=lambda _: self.carregar())
+        self.cmb_horizonte.set("12 meses")
+        self.cmb_horizonte.pack(side="right")
+        self.ent_saldo = ctk.CTkEntry(barra, placeholder_text="Saldo inicial (R$)", width=140)
+        self.ent_saldo.pack(side="right", padx=10)
+        self.ent_saldo.bind("<Return>", lambda _: self.carregar())
+        self.lbl_totais = ctk.CTkLabel(barra, text="", font=("Segoe UI", 12))
+        self.lbl_totais.pack(side="right", padx=15)
+
+        self.frm_grafico = ctk.CTkFrame(self, fg_color="white", height=300)
+        self.frm_grafico.pack(fill="x", padx=15, pady=5)
+        self.frm_grafico.pack_propagate(False)
+
+        colunas = (("receita", "Receita (R$)"), ("despesas", "Despesas (R$)"),
+                   ("recorrentes", "Recorrentes (R$)"), ("saldo", "Saldo (R$)"), ("acumulado", "Acumulado (R$)"))
+        self.tabela = ttk.Treeview(self, columns=[chave for chave, _ in colunas])
+        self.tabela.heading("#0", text="Mês")
+        self.tabela.column("#0", width=90)
+        for chave, titulo in colunas:
+            self.tabela.heading(chave, text=titulo)
+            self.tabela.column(chave, anchor="e", width=140)
+        self.tabela.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+
+        self.carregar()
+
+    def carregar(self):
+        texto = self.ent_saldo.get().strip().replace(",", ".")
+        try:
+            saldo_inicial = float(texto) if texto else 0.0
+        except ValueError:
+            messagebox.showerror("Erro", "Saldo inicial inválido.", parent=self)
+            return
+        self.executor.submeter(
+            "fluxo_caixa", self.controller.projetar_fluxo, self.inicio, HORIZONTES[self.cmb_horizonte.get()],
+            saldo_inicial,
+            ao_concluir=self._exibir,
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Falha ao projetar: {e}", parent=self)
+        )
+
+    def _exibir(self, projecao):
+        if not self.winfo_exists():
+            return
+        self.tabela.delete(*self.tabela.get_children())
+        for linha in projecao.itertuples(index=False):
+            self.tabela.insert("", "end", text=f"{MESES[linha.mes - 1]}/{linha.ano}", values=(
+                f"{linha.receita:,.2f}", f"{linha.despesas:,.2f}", f"{linha.despesas_recorrentes:,.2f}",
+                f"{linha.saldo:,.2f}", f"{linha.saldo_acumulado:,.2f}"
+            ))
+        self.lbl_totais.configure(
+            text=f"Receita R$ {projecao.receita.sum():,.2f}   Despesas R$ {projecao.despesas.sum():,.2f}   "
+                 f"Saldo final R$ {projecao.saldo_acumulado.iloc[-1]:,.2f}"
+        )
+        self._plotar(projecao)
+
+    def _plotar(self, projecao):
+        # matplotlib só é carregado ao abrir a projeção
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        if self._canvas_grafico is None:
+            figura = Figure(figsize=(9, 3), dpi=100, facecolor="white")
+            self._canvas_grafico = FigureCanvasTkAgg(figura, master=self.frm_grafico)
+            self._canvas_grafico.get_tk_widget().pack(fill="both", expand=True)
+        figura = self._canvas_grafico.figure
+        figura.clear()
+        ax = figura.add_subplot(111)
+
+        posicoes = range(len(projecao))
+        ax.bar([p - 0.2 for p in posicoes], projecao.receita, width=0.4, color=COR_RECEITA, label="Receita")
+        ax.bar([p + 0.2 for p in posicoes], projecao.despesas, width=0.4, color=COR_DESPESA, label="Despesas")
+        ax.plot(posicoes, projecao.saldo_acumulado, color=COR_SALDO, marker="o" if len(projecao) <= 24 else None,
+                label="Saldo acumulado")
+        ax.axhline(0, color="#9CA3AF", linewidth=0.8)
+
+        # Um rótulo por mês até 2 anos; depois, só janeiro de cada ano
+        rotulos = [
+            (p, f"{MESES[linha.mes - 1]}/{linha.ano % 100:02d}" if len(projecao) <= 24 else str(linha.ano))
+            for p, linha in zip(posicoes, projecao.itertuples(index=False))
+            if len(projecao) <= 24 or linha.mes == 1
+        ]
+        ax.set_xticks([p for p, _ in rotulos])
+        ax.set_xticklabels([texto for _, texto in rotulos], fontsize=8)
+        ax.tick_params(axis="y", labelsize=8)
+        ax.legend(fontsize=8, loc="upper left")
+        figura.tight_layout()
+        self._canvas_grafico.draw_idle()
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from datetime import datetime
 from tkinter import messagebox, ttk
+from src.views.lista_virtual import ListaVirtual
 
 class FormView(ctk.CTkFrame):
     def __init__(self, master, controller, refresh_callback, **kwargs):
@@ -35,8 +36,17 @@ class FormView(ctk.CTkFrame):
         self.lbl_lista = ctk.CTkLabel(self, text="Histórico do Mês", font=("Arial", 14, "bold"))
         self.lbl_lista.pack(pady=5)
         
-        self.scroll_frame = ctk.CTkScrollableFrame(self, height=200)
+        # Linhas mantidas por chave da despesa: só o que mudou é redesenhado
+        self.scroll_frame = ctk.CTkFrame(self, height=200)
         self.scroll_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.lista = ListaVirtual(self.scroll_frame, altura_linha=56,
+                                  criar_linha=self._criar_linha,
+                                  preencher_linha=self._preencher_linha,
+                                  espacamento=2,
+                                  carregar_mais=self._carregar_mais)
+        self.lista.pack(fill="both", expand=True)
+        self.mes, self.ano = None, None
+        self._continuacao = None
 
     def adicionar(self):
         try:
@@ -62,27 +72,37 @@ class FormView(ctk.CTkFrame):
             messagebox.showerror("Erro", str(e))
 
     def atualizar_lista(self, mes, ano):
-        # Limpar lista atual
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
+        # Primeira página do mês; as demais são lidas ao rolar (_carregar_mais)
+        self.mes, self.ano = mes, ano
+        pagina = self.controller.paginar_despesas(mes=mes, ano=ano)
+        self._continuacao = pagina.continuacao
+        self.lista.definir_itens(pagina.despesas, ha_mais=pagina.continuacao is not None)
 
-        df = self.controller.buscar_despesas_mes(mes, ano)
-        if df.empty:
-            return
+    def _carregar_mais(self):
+        pagina = self.controller.paginar_despesas(self._continuacao, mes=self.mes, ano=self.ano)
+        self._continuacao = pagina.continuacao
+        self.lista.acrescentar_itens(pagina.despesas, ha_mais=pagina.continuacao is not None)
 
-        for _, row in df.iterrows():
-            f = ctk.CTkFrame(self.scroll_frame, fg_color="#3a3a3a")
-            f.pack(fill="x", pady=2)
-            
-            txt = f"{row['data']} - {row['categoria']}\n{row['descricao']} - R$ {row['valor']:.2f}"
-            lbl = ctk.CTkLabel(f, text=txt, anchor="w", justify="left")
-            lbl.pack(side="left", padx=5)
-            
-            btn_del = ctk.CTkButton(f, text="X", width=30, fg_color="#c0392b", 
-                                    command=lambda pid=row['id']: self.deletar(pid))
-            btn_del.pack(side="right", padx=5)
+    def _criar_linha(self, parent):
+        f = ctk.CTkFrame(parent, fg_color="#3a3a3a", height=52)
+        f.pack_propagate(False)
+
+        f.lbl = ctk.CTkLabel(f, text="", anchor="w", justify="left")
+        f.lbl.pack(side="left", padx=5)
+
+        f.btn_del = ctk.CTkButton(f, text="X", width=30, fg_color="#c0392b")
+        f.btn_del.pack(side="right", padx=5)
+        return f
+
+    def _preencher_linha(self, f, row):
+        f.lbl.configure(text=f"{row.data} - {row.categoria}\n{row.descricao} - R$ {row.valor:.2f}")
+        f.btn_del.configure(command=lambda: self.deletar(row, self.mes, self.ano))
 
-    def deletar(self, id_despesa):
+    def deletar(self, row, mes, ano):
         if messagebox.askyesno("Confirmar", "Deletar despesa?"):
-            self.controller.excluir_despesa(id_despesa)
+            if row.recorrencia_id is None:
+                self.controller.excluir_despesa(row.id)
+            else:
+                # Ocorrência de recorrência: remove só a deste mês
+                self.controller.excluir_ocorrencia(row.recorrencia_id, mes, ano)
             self.refresh_callback()
@@ -0,0 +1,152 @@
+import math
+import tkinter as tk
+from collections import OrderedDict
+
+import customtkinter as ctk
+
+# Quantidade de gráficos renderizados mantidos em memória por GraficoRosca
+TAMANHO_CACHE_GRAFICOS = 24
+
+
+class GraficoRosca(ctk.CTkFrame):
+    """
+    Gráfico de rosca (donut) por categoria com uma única Figure persistente.
+
+    Cada combinação de (categorias, valores, tamanho) é rasterizada uma vez e
+    guardada como imagem: voltar a um mês já exibido apenas troca a imagem, sem
+    passar pelo layout e pela rasterização do matplotlib. Quando só os valores
+    mudam, as fatias existentes são ajustadas no lugar em vez de recriadas.
+
+    O matplotlib só é importado no primeiro desenho, não na criação do widget.
+    """
+
+    def __init__(self, master, cor_fundo="white", cor_texto="black", cores=None, cor_borda=None,
+                 titulo=None, tamanho_fonte=10, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.cor_fundo = cor_fundo
+        self.cor_texto = cor_texto
+        self.cores = cores
+        self.cor_borda = cor_borda
+        self.titulo = titulo
+        self.tamanho_fonte = tamanho_fonte
+
+        self.figura = None
+        self._canvas_agg = None
+        self.ax = None
+        self._fatias = []
+        self._rotulos_plotados = None
+
+        self._cache = OrderedDict()
+        self._dados = None
+        self._redimensionamento = None
+
+        # O tamanho da imagem segue o do frame, e não o contrário
+        self.pack_propagate(False)
+        self._lbl_imagem = tk.Label(self, bd=0, bg=cor_fundo)
+        self._lbl_imagem.pack(fill="both", expand=True)
+        self.bind("<Configure>", self._ao_redimensionar)
+
+    def atualizar(self, rotulos, valores):
+        """Exibe o gráfico das categorias 'rotulos' com os totais 'valores'."""
+        self._dados = (tuple(rotulos), tuple(round(float(valor), 2) for valor in valores))
+        self._exibir()
+
+    # --- Internos ---
+
+    def _exibir(self):
+        if self._dados is None:
+            return
+        largura = max(self.winfo_width(), 50)
+        altura = max(self.winfo_height(), 50)
+        chave = self._dados + (largura, altura)
+
+        imagem = self._cache.get(chave)
+        if imagem is None:
+            imagem = self._renderizar(largura, altura)
+            self._cache[chave] = imagem
+            while len(self._cache) > TAMANHO_CACHE_GRAFICOS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(chave)
+        self._lbl_imagem.configure(image=imagem)
+
+    def _criar_figura(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # Figure fora do pyplot: não entra no registro global de figuras
+        self.figura = Figure(figsize=(5, 5), dpi=100, facecolor=self.cor_fundo)
+        self._canvas_agg = FigureCanvasAgg(self.figura)
+        self.ax = self.figura.add_subplot(111)
+
+    def _renderizar(self, largura, altura):
+        from PIL import Image, ImageTk
+
+        if self.figura is None:
+            self._criar_figura()
+        rotulos, valores = self._dados
+        dpi = self.figura.get_dpi()
+        self.figura.set_size_inches(largura / dpi, altura / dpi)
+
+        if rotulos == self._rotulos_plotados:
+            self._ajustar_fatias(valores)
+        else:
+            self._plotar(rotulos, valores)
+            self.figura.tight_layout()
+
+        self._canvas_agg.draw()
+        buffer = self._canvas_agg.buffer_rgba()
+        largura_px, altura_px = self._canvas_agg.get_width_height()
+        pil = Image.frombuffer("RGBA", (largura_px, altura_px), buffer, "raw", "RGBA", 0, 1)
+        return ImageTk.PhotoImage(pil.copy(), master=self)
+
+    def _plotar(self, rotulos, valores):
+        self.ax.clear()
+        self.ax.set_facecolor(self.cor_fundo)
+        wedgeprops = dict(width=0.4)
+        if self.cor_borda:
+            wedgeprops.update(edgecolor=self.cor_borda, linewidth=2)
+        wedges, texts, autotexts = self.ax.pie(
+            valores,
+            labels=rotulos,
+            autopct='%1.1f%%',
+            startangle=90,
+            colors=self.cores[:len(valores)] if self.cores else None,
+            wedgeprops=wedgeprops,
+            textprops=dict(color=self.cor_texto, fontsize=self.tamanho_fonte, weight='bold')
+        )
+        for autotext in autotexts:
+            autotext.set_color(self.cor_texto)
+            autotext.set_weight('bold')
+            autotext.set_fontsize(self.tamanho_fonte + 1)
+        if self.titulo:
+            self.ax.set_title(self.titulo, color=self.cor_texto)
+        self._fatias = list(zip(wedges, texts, autotexts))
+        self._rotulos_plotados = rotulos
+
+    def _ajustar_fatias(self, valores):
+        """Atualiza ângulos, rótulos e percentuais das fatias já existentes
+        (mesma geometria usada por Axes.pie com startangle=90)."""
+        total = sum(valores) or 1.0
+        inicio = 90.0
+        for (fatia, texto, percentual), valor in zip(self._fatias, valores):
+            fim = inicio + 360.0 * valor / total
+            fatia.set_theta1(inicio)
+            fatia.set_theta2(fim)
+            meio = math.radians((inicio + fim) / 2)
+            x, y = math.cos(meio), math.sin(meio)
+            texto.set_position((1.1 * x, 1.1 * y))
+            texto.set_horizontalalignment('left' if x > 0 else 'right')
+            percentual.set_position((0.6 * x, 0.6 * y))
+            percentual.set_text(f"{100.0 * valor / total:1.1f}%")
+            inicio = fim
+
+    def _ao_redimensionar(self, _=None):
+        # Agrupa rajadas de <Configure> num único redesenho
+        if self._redimensionamento is not None:
+            self.after_cancel(self._redimensionamento)
+        self._redimensionamento = self.after(150, self._fim_redimensionamento)
+
+    def _fim_redimensionamento(self):
+        self._redimensionamento = None
+        self._exibir()
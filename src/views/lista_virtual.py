@@ -0,0 +1,181 @@
+import tkinter as tk
+import customtkinter as ctk
+
+
+class ListaVirtual(ctk.CTkFrame):
+    """
+    Lista rolável que só cria widgets para as linhas visíveis (mais uma pequena
+    margem acima e abaixo). Ao rolar, as linhas que saem da área visível são
+    recicladas para os itens que entram, então o custo não depende do tamanho da lista.
+
+    Cada linha exibida fica associada à chave do seu item (chave_item(item)). Ao
+    receber novos itens, linhas de chaves que continuam visíveis são apenas
+    reposicionadas; só itens novos ou alterados são preenchidos de novo.
+
+    criar_linha(parent) constrói o widget de uma linha (uma única vez por linha do pool);
+    preencher_linha(widget, item) atualiza esse widget para exibir o item.
+
+    Carregamento incremental: com carregar_mais, a lista pode receber só parte dos itens
+    (definir_itens(itens, ha_mais=True)). Quando a rolagem chega a 'antecipacao' linhas
+    do fim, carregar_mais() é chamado uma vez; quem o atende entrega o próximo bloco com
+    acrescentar_itens.
+    """
+
+    def __init__(self, master, altura_linha, criar_linha, preencher_linha, chave_item=None,
+                 overscan=3, cor_fundo=None, texto_vazio="", espacamento=5, carregar_mais=None,
+                 antecipacao=10, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.altura_linha = altura_linha
+        self.criar_linha = criar_linha
+        self.preencher_linha = preencher_linha
+        self.chave_item = chave_item or (lambda item: item.chave)
+        self.overscan = overscan
+        self.espacamento = espacamento
+        self.carregar_mais = carregar_mais
+        self.antecipacao = antecipacao
+
+        self._itens = []
+        # Há itens ainda não carregados / carregar_mais já chamado e ainda não atendido
+        self._ha_mais = False
+        self._carregando = False
+        # Linhas exibidas, por chave do item: [widget, id_janela_no_canvas, item, y]
+        self._linhas = {}
+        # Linhas ocultas prontas para reuso: [widget, id_janela_no_canvas]
+        self._livres = []
+        # Contagem de operações da última renderização (útil para depuração)
+        self.ultima_renderizacao = {"inseridas": 0, "removidas": 0, "atualizadas": 0, "movidas": 0}
+
+        if cor_fundo is None:
+            cor_fundo = self._apply_appearance_mode(self._bg_color)
+        self._canvas = tk.Canvas(self, bg=cor_fundo, highlightthickness=0, bd=0, yscrollincrement=20)
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._canvas.yview)
+        self._canvas.configure(yscrollcommand=self._ao_rolar)
+        self._scrollbar.pack(side="right", fill="y")
+        self._canvas.pack(side="left", fill="both", expand=True)
+
+        self._lbl_vazio = ctk.CTkLabel(self._canvas, text=texto_vazio, text_color="#6B7280")
+
+        self._canvas.bind("<Configure>", self._ao_redimensionar)
+        self._canvas.bind("<Enter>", self._ativar_roda)
+        self._canvas.bind("<Leave>", self._desativar_roda)
+
+    # --- API ---
+
+    def definir_itens(self, itens, ha_mais=False):
+        """Substitui os itens exibidos. Apenas as diferenças em relação à renderização
+        anterior (inserções, remoções e alterações visíveis) tocam widgets. ha_mais=True
+        indica que há mais itens a carregar com carregar_mais."""
+        self._itens = list(itens)
+        self._ha_mais = ha_mais
+        self._carregando = False
+        self._atualizar_area()
+        self._renderizar()
+
+    def acrescentar_itens(self, itens, ha_mais=False):
+        """Acrescenta ao fim o bloco pedido por carregar_mais (vazio, se a carga falhou)."""
+        self._itens.extend(itens)
+        self._ha_mais = ha_mais
+        self._carregando = False
+        self._atualizar_area()
+        self._renderizar()
+
+    # --- Internos ---
+
+    def _atualizar_area(self):
+        altura_total = len(self._itens) * self.altura_linha + self.espacamento
+        self._canvas.configure(scrollregion=(0, 0, self._canvas.winfo_width(), altura_total))
+        if self._itens:
+            self._lbl_vazio.place_forget()
+        else:
+            self._canvas.yview_moveto(0)
+            self._lbl_vazio.place(relx=0.5, y=40, anchor="n")
+
+    def _renderizar(self):
+        altura_visivel = max(self._canvas.winfo_height(), self.altura_linha)
+        topo = self._canvas.canvasy(0)
+        primeiro = max(0, int(topo // self.altura_linha) - self.overscan)
+        ultimo = min(len(self._itens), int((topo + altura_visivel) // self.altura_linha) + 1 + self.overscan)
+
+        visiveis = {}
+        for indice in range(primeiro, ultimo):
+            item = self._itens[indice]
+            visiveis[self.chave_item(item)] = (indice, item)
+
+        contagem = {"inseridas": 0, "removidas": 0, "atualizadas": 0, "movidas": 0}
+
+        # Remoções: chaves que saíram da lista ou da área visível liberam sua linha
+        for chave in [chave for chave in self._linhas if chave not in visiveis]:
+            widget, janela, _, _ = self._linhas.pop(chave)
+            self._canvas.itemconfigure(janela, state="hidden")
+            self._livres.append([widget, janela])
+            contagem["removidas"] += 1
+
+        for chave, (indice, item) in visiveis.items():
+            y = indice * self.altura_linha + self.espacamento
+            linha = self._linhas.get(chave)
+            if linha is None:
+                # Inserção: reaproveita uma linha livre (ou cria uma nova, se o pool acabou)
+                widget, janela = self._livres.pop() if self._livres else self._nova_linha()
+                self.preencher_linha(widget, item)
+                self._canvas.coords(janela, self.espacamento, y)
+                self._canvas.itemconfigure(janela, state="normal")
+                self._linhas[chave] = [widget, janela, item, y]
+                contagem["inseridas"] += 1
+                continue
+
+            widget, janela, exibido, y_atual = linha
+            if exibido != item:
+                self.preencher_linha(widget, item)
+                linha[2] = item
+                contagem["atualizadas"] += 1
+            if y_atual != y:
+                self._canvas.coords(janela, self.espacamento, y)
+                linha[3] = y
+                contagem["movidas"] += 1
+
+        self.ultima_renderizacao = contagem
+
+        if (self._ha_mais and not self._carregando and self.carregar_mais is not None
+                and ultimo >= len(self._itens) - self.antecipacao):
+            self._carregando = True
+            self.carregar_mais()
+
+    def _nova_linha(self):
+        widget = self.criar_linha(self._canvas)
+        janela = self._canvas.create_window(
+            self.espacamento, 0, window=widget, anchor="nw",
+            width=max(self._canvas.winfo_width() - 2 * self.espacamento, 1)
+        )
+        return [widget, janela]
+
+    def _ao_rolar(self, inicio, fim):
+        self._scrollbar.set(inicio, fim)
+        self._renderizar()
+
+    def _ao_redimensionar(self, event):
+        largura = max(event.width - 2 * self.espacamento, 1)
+        for linha in list(self._linhas.values()) + self._livres:
+            self._canvas.itemconfigure(linha[1], width=largura)
+        self._atualizar_area()
+        self._renderizar()
+
+    def _ativar_roda(self, _=None):
+        self._canvas.bind_all("<MouseWheel>", self._roda_mouse)
+        self._canvas.bind_all("<Button-4>", self._roda_mouse)
+        self._canvas.bind_all("<Button-5>", self._roda_mouse)
+
+    def _desativar_roda(self, event=None):
+        # Passar do canvas para uma linha também gera <Leave>: só desativa ao sair da lista
+        if event is not None:
+            widget = self.winfo_containing(event.x_root, event.y_root)
+            if widget is not None and str(widget).startswith(str(self)):
+                return
+        self._canvas.unbind_all("<MouseWheel>")
+        self._canvas.unbind_all("<Button-4>")
+        self._canvas.unbind_all("<Button-5>")
+
+    def _roda_mouse(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._canvas.yview_scroll(-1, "units")
+        else:
+            self._canvas.yview_scroll(1, "units")
@@ -0,0 +1,135 @@
+import customtkinter as ctk
+from tkinter import filedialog, messagebox, ttk
+from datetime import datetime
+
+from src import instrumentacao
+
+# Intervalo (ms) da atualização automática das tabelas
+INTERVALO_ATUALIZACAO = 1000
+
+COLUNAS = [
+    ("chamadas", "Chamadas", 80), ("total_ms", "Total (ms)", 90), ("media_ms", "Média (ms)", 90),
+    ("p50_ms", "p50 (ms)", 80), ("p95_ms", "p95 (ms)", 80), ("max_ms", "Máx (ms)", 80),
+]
+
+
+class PainelDepuracao(ctk.CTkToplevel):
+    """Tempos coletados pela instrumentação: métodos do controller, comandos SQL
+    e fases de atualização da tela. Abre com F12."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Depuração - Desempenho")
+        self.geometry("1000x560")
+        self._resumo = {}
+
+        barra = ctk.CTkFrame(self, fg_color="transparent")
+        barra.pack(fill="x", padx=10, pady=(10, 0))
+        self.var_coletar = ctk.BooleanVar(value=instrumentacao.ATIVO)
+        ctk.CTkCheckBox(barra, text="Coletar", variable=self.var_coletar, command=self._alternar_coleta).pack(side="left")
+        ctk.CTkButton(barra, text="Atualizar", width=90, command=self.atualizar).pack(side="left", padx=5)
+        ctk.CTkButton(barra, text="Limpar", width=90, command=self.limpar).pack(side="left", padx=5)
+        ctk.CTkButton(barra, text="Salvar JSON", width=110, command=self.salvar).pack(side="left", padx=5)
+        self.lbl_estado = ctk.CTkLabel(barra, text="")
+        self.lbl_estado.pack(side="right")
+
+        abas = ctk.CTkTabview(self)
+        abas.pack(fill="both", expand=True, padx=10, pady=5)
+        self.tabelas = {
+            "metodos": self._criar_tabela(abas.add("Métodos"), "Método", 260),
+            "sql": self._criar_tabela(abas.add("SQL"), "Comando", 420),
+            "gui": self._criar_tabela(abas.add("Interface"), "Fase", 260),
+        }
+        self.tabela_trace = self._criar_tabela(abas.add("Trace SQLite"), "Comando executado", 760, [("execucoes", "Execuções", 100)])
+
+        # Distribuição por faixa de latência da linha selecionada
+        self.lbl_faixas = ctk.CTkLabel(self, text="Selecione uma linha para ver a distribuição das latências.",
+                                       anchor="w", justify="left")
+        self.lbl_faixas.pack(fill="x", padx=15, pady=(0, 10))
+
+        self.atualizar()
+        self._agendar()
+
+    def _criar_tabela(self, aba, titulo, largura, colunas=COLUNAS):
+        tabela = ttk.Treeview(aba, columns=[chave for chave, _, _ in colunas])
+        tabela.heading("#0", text=titulo)
+        tabela.column("#0", width=largura, stretch=True)
+        for chave, texto, largura_coluna in colunas:
+            tabela.heading(chave, text=texto)
+            tabela.column(chave, width=largura_coluna, anchor="e", stretch=False)
+        barra = ttk.Scrollbar(aba, orient="vertical", command=tabela.yview)
+        tabela.configure(yscrollcommand=barra.set)
+        barra.pack(side="right", fill="y")
+        tabela.pack(fill="both", expand=True)
+        tabela.bind("<<TreeviewSelect>>", lambda _: self._mostrar_faixas(tabela))
+        return tabela
+
+    def _agendar(self):
+        self.after(INTERVALO_ATUALIZACAO, self._atualizacao_automatica)
+
+    def _atualizacao_automatica(self):
+        if not self.winfo_exists():
+            return
+        if instrumentacao.ATIVO:
+            self.atualizar()
+        self._agendar()
+
+    def atualizar(self):
+        self._resumo = instrumentacao.resumo()
+        for secao, tabela in self.tabelas.items():
+            # Mais custosos primeiro
+            linhas = sorted(self._resumo[secao].items(), key=lambda item: -item[1]["total_ms"])
+            self._preencher(tabela, [
+                (nome, [dados["chamadas"]] + [f"{dados[chave]:.2f}" for chave, _, _ in COLUNAS[1:]])
+                for nome, dados in linhas
+            ])
+        self._preencher(self.tabela_trace, [(sql, [vezes]) for sql, vezes in self._resumo["trace_sqlite"].items()])
+        self.lbl_estado.configure(
+            text=f"{'Coletando' if instrumentacao.ATIVO else 'Parado'} desde {self._resumo['inicio_coleta']}"
+        )
+
+    def _preencher(self, tabela, linhas):
+        # Mantém a seleção entre atualizações (o iid é o próprio nome)
+        selecao = tabela.selection()
+        tabela.delete(*tabela.get_children())
+        for nome, valores in linhas:
+            tabela.insert("", "end", iid=nome, text=nome, values=valores)
+        existentes = [iid for iid in selecao if tabela.exists(iid)]
+        if existentes:
+            tabela.selection_set(existentes)
+
+    def _mostrar_faixas(self, tabela):
+        secao = next((secao for secao, t in self.tabelas.items() if t is tabela), None)
+        selecao = tabela.selection()
+        if secao is None or not selecao:
+            return
+        dados = self._resumo.get(secao, {}).get(selecao[0])
+        if dados is None:
+            return
+        faixas = "   ".join(f"{faixa}: {quantidade}" for faixa, quantidade in dados["faixas"].items())
+        self.lbl_faixas.configure(text=f"{selecao[0][:80]}\n{faixas or 'sem amostras'}")
+
+    def _alternar_coleta(self):
+        if self.var_coletar.get():
+            instrumentacao.ativar()
+        else:
+            instrumentacao.desativar()
+        self.atualizar()
+
+    def limpar(self):
+        instrumentacao.limpar()
+        self.lbl_faixas.configure(text="")
+        self.atualizar()
+
+    def salvar(self):
+        caminho = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".json", filetypes=[("JSON", "*.json")],
+            initialfile=f"perfil_{datetime.now():%Y%m%d_%H%M%S}.json"
+        )
+        if not caminho:
+            return
+        try:
+            instrumentacao.salvar(caminho)
+            messagebox.showinfo("Sucesso", f"Perfil salvo em:\n{caminho}", parent=self)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao salvar perfil: {e}", parent=self)
@@ -0,0 +1,100 @@
+import customtkinter as ctk
+from tkinter import messagebox, ttk
+
+MESES = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun", "Jul", "Ago", "Set", "Out", "Nov", "Dez"]
+
+# Rótulo do seletor -> agrupar_por de totais_periodo
+AGRUPAMENTOS = {"Por mês": None, "Por categoria": "categoria", "Por tipo": "tipo"}
+
+COR_RECEITA = "#10B981"
+COR_DESPESA = "#EF4444"
+
+
+class VisaoAnual(ctk.CTkToplevel):
+    """Receita, despesas e saldo dos 12 meses de um ano (uma consulta agrupada via
+    totais_periodo), com gráfico de barras e, opcionalmente, as despesas por categoria
+    ou tipo em cada mês."""
+
+    def __init__(self, master, controller, executor, ano: int):
+        super().__init__(master)
+        self.title("📅 Visão Anual")
+        self.geometry("900x640")
+        self.controller = controller
+        self.executor = executor
+        self.ano = ano
+        self._totais = []
+
+        barra = ctk.CTkFrame(self, fg_color="transparent")
+        barra.pack(fill="x", padx=15, pady=(15, 5))
+        ctk.CTkButton(barra, text="◀", width=35, command=lambda: self._mudar_ano(-1)).pack(side="left")
+        self.lbl_ano = ctk.CTkLabel(barra, text=str(ano), font=("Segoe UI", 18, "bold"), width=80)
+        self.lbl_ano.pack(side="left", padx=5)
+        ctk.CTkButton(barra, text="▶", width=35, command=lambda: self._mudar_ano(1)).pack(side="left")
+        self.cmb_agrupamento = ctk.CTkComboBox(barra, values=list(AGRUPAMENTOS), width=150, state="readonly",
+                                               command=lambda _: self.carregar())
+        self.cmb_agrupamento.set("Por mês")
+        self.cmb_agrupamento.pack(side="right")
+        self.lbl_totais = ctk.CTkLabel(barra, text="", font=("Segoe UI", 12))
+        self.lbl_totais.pack(side="right", padx=15)
+
+        self.canvas = ctk.CTkCanvas(self, height=220, highlightthickness=0, bg="white")
+        self.canvas.pack(fill="x", padx=15, pady=5)
+        self.canvas.bind("<Configure>", lambda _: self._desenhar_barras())
+
+        self.tabela = ttk.Treeview(self, columns=("receita", "despesas", "saldo"))
+        self.tabela.heading("#0", text="Mês")
+        for coluna, titulo in (("receita", "Receita (R$)"), ("despesas", "Despesas (R$)"), ("saldo", "Saldo (R$)")):
+            self.tabela.heading(coluna, text=titulo)
+            self.tabela.column(coluna, anchor="e", width=140)
+        self.tabela.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+
+        self.carregar()
+
+    def _mudar_ano(self, delta: int):
+        self.ano += delta
+        self.lbl_ano.configure(text=str(self.ano))
+        self.carregar()
+
+    def carregar(self):
+        self.executor.submeter(
+            "visao_anual", self.controller.totais_periodo, (1, self.ano), (12, self.ano),
+            AGRUPAMENTOS[self.cmb_agrupamento.get()],
+            ao_concluir=self._exibir,
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Falha ao carregar o ano: {e}", parent=self)
+        )
+
+    def _exibir(self, totais):
+        if not self.winfo_exists():
+            return
+        self._totais = totais
+        self.tabela.delete(*self.tabela.get_children())
+        for total in totais:
+            mes = self.tabela.insert("", "end", text=f"{MESES[total.mes - 1]}/{total.ano}", open=False, values=(
+                f"{total.receita:,.2f}", f"{total.despesas:,.2f}", f"{total.saldo:,.2f}"
+            ))
+            for grupo in total.grupos:
+                self.tabela.insert(mes, "end", text=f"    {grupo.grupo}", values=("", f"{grupo.total:,.2f}", ""))
+
+        receita = sum(total.receita for total in totais)
+        despesas = sum(total.despesas for total in totais)
+        self.lbl_totais.configure(
+            text=f"Receita R$ {receita:,.2f}   Despesas R$ {despesas:,.2f}   Saldo R$ {receita - despesas:,.2f}"
+        )
+        self._desenhar_barras()
+
+    def _desenhar_barras(self):
+        """Receita x despesas de cada mês, lado a lado, na escala do maior valor do ano."""
+        self.canvas.delete("all")
+        if not self._totais:
+            return
+        largura, altura = self.canvas.winfo_width(), self.canvas.winfo_height()
+        maximo = max(max(total.receita, total.despesas) for total in self._totais) or 1
+        margem, base = 10, altura - 20
+        coluna = (largura - 2 * margem) / len(self._totais)
+        barra = coluna * 0.35
+        for indice, total in enumerate(self._totais):
+            x = margem + indice * coluna + coluna * 0.15
+            for deslocamento, valor, cor in ((0, total.receita, COR_RECEITA), (barra, total.despesas, COR_DESPESA)):
+                topo = base - (base - margem) * valor / maximo
+                self.canvas.create_rectangle(x + deslocamento, topo, x + deslocamento + barra, base, fill=cor, width=0)
+            self.canvas.create_text(x + barra, base + 10, text=MESES[total.mes - 1], font=("Segoe UI", 9))